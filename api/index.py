@@ -4,14 +4,16 @@ Vercel-compatible FastAPI application for AI Research Platform
 This version is adapted for serverless deployment on Vercel
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
-import json
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Dict, Any, List, Literal
 import os
 import uuid
+import hashlib
+import time
 from datetime import datetime
 import asyncio
 
@@ -31,7 +33,7 @@ except ImportError as e:
     ResearchWorkflow = None
     VercelStorageService = None
 
-app = FastAPI(title="AI Research Platform", version="1.0.0")
+app = FastAPI(title="AI Research Platform", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -42,6 +44,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Research JSON and the inline page are highly compressible
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
 # Global storage for research tasks (using environment/external storage for serverless)
 storage_service = None
 
@@ -61,10 +66,16 @@ except Exception as e:
     research_client = None
     research_workflow = None
 
+ResearchType = Literal["custom", "validation", "market", "financial", "comprehensive"]
+# Upper bound for request strings, checked by pydantic-core before any handler code runs
+MAX_QUERY_CHARS = 20000
+
 class ResearchRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", str_max_length=MAX_QUERY_CHARS)
+    
     query: str
     model: str = "gpt-4"  # Default to more reliable model for serverless
-    research_type: str = "custom"
+    research_type: ResearchType = "custom"
     enrich_prompt: bool = True
 
 class ResearchStatus(BaseModel):
@@ -88,10 +99,8 @@ class ResearchResult(BaseModel):
     completed_at: Optional[str] = None
     error: Optional[str] = None
 
-@app.get("/", response_class=HTMLResponse)
-async def home():
-    """Serve the main web interface"""
-    return """
+# Web interface page, encoded once at import
+HOME_BODY = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -228,7 +237,16 @@ async def home():
         </script>
     </body>
     </html>
-    """
+    """.encode("utf-8")
+HOME_ETAG = f'"{hashlib.md5(HOME_BODY, usedforsecurity=False).hexdigest()}"'
+
+@app.get("/", response_class=HTMLResponse)
+async def home(request: Request):
+    """Serve the main web interface"""
+    headers = {"ETag": HOME_ETAG, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == HOME_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(content=HOME_BODY, media_type="text/html", headers=headers)
 
 @app.get("/api/health")
 async def health_check():
@@ -270,20 +288,23 @@ async def start_research(request: ResearchRequest):
     if not research_client or not research_workflow:
         raise HTTPException(status_code=500, detail="Research client not initialized. Please check OPENAI_API_KEY.")
     
-    task_id = str(uuid.uuid4())
+    task_id = uuid.uuid4().hex
+    # Wall-clock time for the record; the monotonic clock for the duration
+    created_at = datetime.now().isoformat()
+    started = time.monotonic()
     
     try:
         # For serverless, we need to handle research synchronously
         # or use external queue system for background processing
         
         if request.research_type == "validation":
-            result = research_workflow.validate_idea(request.query, request.model)
+            result = await research_workflow.validate_idea(request.query, request.model)
         elif request.research_type == "market":
-            result = research_workflow.market_research(request.query, request.model)
+            result = await research_workflow.market_research(request.query, request.model)
         elif request.research_type == "financial":
-            result = research_workflow.financial_analysis(request.query, request.model)
+            result = await research_workflow.financial_analysis(request.query, request.model)
         else:  # custom research
-            result = research_workflow.custom_research(
+            result = await research_workflow.custom_research(
                 request.query, 
                 request.model, 
                 "general", 
@@ -298,8 +319,9 @@ async def start_research(request: ResearchRequest):
             "model": request.model,
             "research_type": request.research_type,
             "result": result,
-            "created_at": datetime.now().isoformat(),
-            "completed_at": datetime.now().isoformat()
+            "created_at": created_at,
+            "completed_at": datetime.now().isoformat(),
+            "processing_time": round(time.monotonic() - started, 1)
         }
         
         # Store in external storage if available
@@ -322,7 +344,7 @@ async def start_research(request: ResearchRequest):
             "query": request.query,
             "model": request.model,
             "research_type": request.research_type,
-            "created_at": datetime.now().isoformat(),
+            "created_at": created_at,
             "error": str(e)
         }
         return error_result
@@ -4,44 +4,83 @@ Vercel-compatible FastAPI Web Interface for OpenAI Research Client
 Full-featured version matching the original app.py
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
-import json
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Dict, Any, List, Literal
 import asyncio
+import logging
 import uuid
+import hashlib
+import time
 from datetime import datetime
 import os
 import sys
 import re
+import importlib.util
+from string import Template
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from services.task_store import TaskStore
+from services.research_cache import ResearchCache, SingleFlight, EMBEDDING_MODEL, normalize_query, is_time_sensitive
+from services.request_batcher import MicroBatcher
+
+logger = logging.getLogger("research_app.api")
+
+# Markdown link citations: [text](url)
+_CITATION_RE = re.compile(r'\[[^\]]+\]\([^)]+\)')
+
 # Global variables for client and storage
-openai_client = None
-session_storage = {}
-
-def get_openai_client():
-    """Lazy initialization of OpenAI client to avoid startup crashes"""
-    global openai_client
-    if openai_client is None:
-        try:
-            from openai import OpenAI
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                # Initialize with minimal configuration for Vercel compatibility
-                openai_client = OpenAI(
-                    api_key=api_key,
-                    timeout=30.0,
-                    max_retries=2
-                )
-        except Exception as e:
-            print(f"Failed to initialize OpenAI client: {e}")
-            openai_client = False  # Mark as failed to avoid retrying
-    return openai_client if openai_client is not False else None
+session_storage = TaskStore(maxsize=1000, ttl=86400)
+# Completions for repeated queries (Redis-backed when REDIS_URL is set)
+research_cache = ResearchCache.from_env()
+# Concurrent identical requests share one completion
+inflight_research = SingleFlight()
+# Paraphrase matching costs an embedding call per cache miss, so it is opt-in
+SEMANTIC_CACHE_ENABLED = os.getenv("RESEARCH_CACHE_SEMANTIC", "").lower() in ("1", "true", "yes")
+# Short custom queries arriving within this window share one completion (0 disables batching)
+RESEARCH_BATCH_WINDOW_MS = int(os.getenv("RESEARCH_BATCH_WINDOW_MS", "0"))
+# Completion budget for one research answer; a batch gets this much per query
+RESEARCH_MAX_TOKENS = 3000
+# Output ceiling of a single chat completion, which bounds how many answers fit in one batch
+BATCH_MAX_TOKENS = 16384
+RESEARCH_BATCH_MAX = BATCH_MAX_TOKENS // RESEARCH_MAX_TOKENS
+BATCH_MAX_PROMPT_CHARS = 2000
+
+def create_openai_client():
+    """Create the shared AsyncOpenAI client with a bounded connection pool"""
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        return None
+    try:
+        import httpx
+        from openai import AsyncOpenAI
+        # Short timeouts for Vercel; connections are reused across invocations of a warm instance
+        return AsyncOpenAI(
+            api_key=api_key,
+            max_retries=2,
+            http_client=httpx.AsyncClient(
+                # Connection failures are retried by the transport; HTTP errors by the SDK
+                transport=httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+                    http2=importlib.util.find_spec("h2") is not None,
+                    retries=2
+                ),
+                timeout=httpx.Timeout(30.0, connect=10.0)
+            )
+        )
+    except Exception as e:
+        print(f"Failed to initialize OpenAI client: {e}")
+        return None
+
+openai_client = create_openai_client()
+# Bounds in-flight completion calls per instance so bursts queue here instead of hitting rate limits
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "20"))
+openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
 
 # Try to import services, fallback to simplified versions
 try:
@@ -50,7 +89,7 @@ except ImportError:
     OpenAIResearchClient = None
     ResearchWorkflow = None
 
-app = FastAPI(title="OpenAI Research Interface", version="1.0.0")
+app = FastAPI(title="OpenAI Research Interface", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -61,9 +100,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Research JSON and the inline page are highly compressible
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
 # Global storage for research tasks
-research_tasks = {}
-completed_results = {}
+research_tasks = TaskStore(maxsize=1000, ttl=86400)
+completed_results = TaskStore(maxsize=1000, ttl=86400)
 
 # Initialize research client
 try:
@@ -73,10 +115,8 @@ try:
         print("✓ Research client initialized successfully")
     else:
         # Fallback OpenAI client
-        import openai
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            research_client = openai.OpenAI(api_key=api_key)
+        if openai_client:
+            research_client = openai_client
             research_workflow = None
             print("✓ Fallback OpenAI client initialized")
         else:
@@ -88,10 +128,16 @@ except Exception as e:
     research_client = None
     research_workflow = None
 
+ResearchType = Literal["custom", "validation", "market", "financial", "comprehensive"]
+# Upper bound for request strings, checked by pydantic-core before any handler code runs
+MAX_QUERY_CHARS = 20000
+
 class ResearchRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", str_max_length=MAX_QUERY_CHARS)
+    
     query: str
     model: str = "o3-deep-research"
-    research_type: str = "custom"  # custom, validation, market, financial, comprehensive
+    research_type: ResearchType = "custom"
     enrich_prompt: bool = True
 
 class ResearchStatus(BaseModel):
@@ -117,11 +163,15 @@ class ResearchResult(BaseModel):
 
 def extract_citations(text: str) -> int:
     """Extract citation count from research text"""
-    if not text:
+    # Substring search is far cheaper than the regex on link-free text
+    if not text or '](' not in text:
         return 0
-    # Count markdown links and various citation formats
-    citations = re.findall(r'\[([^\]]+)\]\(([^)]+)\)', text)
-    return len(citations)
+    # Count markdown links without materializing the matches
+    return sum(1 for _ in _CITATION_RE.finditer(text))
+
+def count_words(text: str) -> int:
+    """Count whitespace-separated words"""
+    return len(text.split()) if text else 0
 
 def format_research_output(result: Dict[str, Any], research_type: str) -> Dict[str, Any]:
     """Format research result for better display"""
@@ -130,51 +180,45 @@ def format_research_output(result: Dict[str, Any], research_type: str) -> Dict[s
     
     output_text = result["output"]
     
-    # Extract metadata
-    citation_count = extract_citations(output_text)
-    word_count = len(output_text.split()) if output_text else 0
-    
     # For comprehensive research, format each section
     if research_type == "comprehensive" and isinstance(result, dict):
         formatted_sections = {}
         total_citations = 0
+        total_words = 0
         
         for section_name, section_data in result.items():
             if isinstance(section_data, dict) and section_data.get("output"):
                 section_output = section_data["output"]
                 section_citations = extract_citations(section_output)
+                section_words = count_words(section_output)
                 total_citations += section_citations
+                total_words += section_words
                 
                 formatted_sections[section_name] = {
                     **section_data,
                     "formatted_output": section_output,
                     "citations": section_citations,
-                    "word_count": len(section_output.split())
+                    "word_count": section_words
                 }
         
         return {
             "type": "comprehensive",
             "sections": formatted_sections,
             "total_citations": total_citations,
-            "total_words": sum(s.get("word_count", 0) for s in formatted_sections.values())
+            "total_words": total_words
         }
     
     # For single research types
     return {
         **result,
         "formatted_output": output_text,
-        "citations": citation_count,
-        "word_count": word_count
+        "citations": extract_citations(output_text),
+        "word_count": count_words(output_text)
     }
 
-async def conduct_fallback_research(query: str, model: str, research_type: str) -> Dict[str, Any]:
-    """Fallback research function using direct OpenAI API"""
-    if not research_client or not hasattr(research_client, 'chat'):
-        raise Exception("OpenAI client not available")
-    
-    # Create research prompt based on type
-    if research_type == "validation":
-        prompt = f"""Conduct a comprehensive business idea validation analysis for: {query}
+# Fallback research prompts keyed by research type (unknown types use "general")
+_PROMPT_TEMPLATES = {
+    "validation": Template("""Conduct a comprehensive business idea validation analysis for: $query
 
 Please provide a detailed analysis covering:
 1. Market Opportunity Assessment
@@ -184,9 +228,8 @@ Please provide a detailed analysis covering:
 5. Risk Assessment
 6. Implementation Roadmap
 
-Format the response with clear sections and actionable insights."""
-    elif research_type == "market":
-        prompt = f"""Perform detailed market research analysis for: {query}
+Format the response with clear sections and actionable insights."""),
+    "market": Template("""Perform detailed market research analysis for: $query
 
 Please provide comprehensive analysis covering:
 1. Market Size and Growth Trends
@@ -196,9 +239,8 @@ Please provide comprehensive analysis covering:
 5. Pricing Strategy Recommendations
 6. Market Opportunities and Threats
 
-Format with clear sections and data-driven insights."""
-    elif research_type == "financial":
-        prompt = f"""Conduct financial feasibility analysis for: {query}
+Format with clear sections and data-driven insights."""),
+    "financial": Template("""Conduct financial feasibility analysis for: $query
 
 Please provide detailed financial analysis covering:
 1. Revenue Projections and Models
@@ -208,9 +250,8 @@ Please provide detailed financial analysis covering:
 5. ROI Calculations
 6. Financial Risk Assessment
 
-Format with clear sections and numerical projections where applicable."""
-    else:
-        prompt = f"""Conduct comprehensive research on: {query}
+Format with clear sections and numerical projections where applicable."""),
+    "general": Template("""Conduct comprehensive research on: $query
 
 Please provide detailed analysis with:
 1. Overview and Context
@@ -220,18 +261,81 @@ Please provide detailed analysis with:
 5. Recommendations and Next Steps
 6. Sources and References
 
-Format with clear sections and actionable recommendations."""
+Format with clear sections and actionable recommendations."""),
+}
+
+# Research instructions keyed by research type (unknown types use "general"). They carry no
+# query text, so the system prompt plus instructions form a stable prefix per type.
+_RESEARCH_INSTRUCTIONS = {
+    "validation": "Conduct a comprehensive business idea validation analysis for the idea in the next message. Include market opportunity, target audience, competition, feasibility, and risks.",
+    "market": "Perform detailed market research analysis for the idea in the next message. Include market size, growth trends, customer segments, competitive landscape, and market entry barriers.",
+    "financial": "Conduct financial feasibility analysis for the idea in the next message. Include revenue projections, cost analysis, break-even analysis, funding requirements, and ROI calculations.",
+    "general": "Conduct comprehensive research on the topic in the next message. Provide detailed analysis with insights, data, and actionable recommendations.",
+}
+
+# Map custom model names to actual OpenAI models
+_MODEL_MAPPING = {
+    "o3-deep-research": "gpt-4-turbo-preview",  # Map to most capable model
+    "o4-mini-deep-research": "gpt-3.5-turbo"   # Map to faster model
+}
+
+# Fixed system prompts, shared by every request so each completion starts with an identical prefix
+_FALLBACK_SYSTEM_PROMPT = "You are an expert research analyst. Provide comprehensive, well-structured analysis with actionable insights, data, and clear formatting using markdown headers and bullet points."
+_RESEARCH_SYSTEM_PROMPT = """You are an advanced AI research analyst with expertise across multiple domains. 
+Provide comprehensive, well-structured research with:
+- Executive summary with key findings
+- Detailed analysis with data and statistics
+- Market insights and trends
+- Actionable recommendations
+- Risk assessment and mitigation strategies
+Use markdown formatting with clear headings, bullet points, and structured sections."""
+
+def research_messages(research_type: str, query: str) -> List[Dict[str, str]]:
+    """Chat messages for a research request, invariant parts first and the query last"""
+    instructions = _RESEARCH_INSTRUCTIONS.get(research_type, _RESEARCH_INSTRUCTIONS["general"])
+    return [
+        {"role": "system", "content": _RESEARCH_SYSTEM_PROMPT},
+        {"role": "user", "content": instructions},
+        {"role": "user", "content": query}
+    ]
+
+# Prompt tokens sent upstream and how many of them the provider served from its prompt cache
+prompt_cache_stats = {"prompt_tokens": 0, "cached_tokens": 0}
+
+def usage_counts(usage, count: int = 1) -> Dict[str, int]:
+    """Token usage reported by the provider, split evenly when one completion served count queries"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens // count if usage else 0,
+        "completion_tokens": usage.completion_tokens // count if usage else 0,
+        "total_tokens": usage.total_tokens // count if usage else 0,
+        "cached_tokens": (getattr(details, "cached_tokens", None) or 0) // count
+    }
+
+def record_prompt_cache(usage):
+    """Add one upstream completion's prompt and cached tokens to prompt_cache_stats"""
+    counts = usage_counts(usage)
+    prompt_cache_stats["prompt_tokens"] += counts["prompt_tokens"]
+    prompt_cache_stats["cached_tokens"] += counts["cached_tokens"]
+
+async def conduct_fallback_research(query: str, model: str, research_type: str) -> Dict[str, Any]:
+    """Fallback research function using direct OpenAI API"""
+    if not research_client or not hasattr(research_client, 'chat'):
+        raise Exception("OpenAI client not available")
+    
+    prompt = _PROMPT_TEMPLATES.get(research_type, _PROMPT_TEMPLATES["general"]).substitute(query=query)
 
     try:
-        response = research_client.chat.completions.create(
-            model="gpt-4" if model in ["o3-deep-research", "gpt-4"] else "gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert research analyst. Provide comprehensive, well-structured analysis with actionable insights, data, and clear formatting using markdown headers and bullet points."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=3000,
-            temperature=0.7
-        )
+        async with openai_semaphore:
+            response = await research_client.chat.completions.create(
+                model="gpt-4" if model in ["o3-deep-research", "gpt-4"] else "gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": _FALLBACK_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=3000,
+                temperature=0.7
+            )
         
         return {
             "status": "completed",
@@ -248,10 +352,8 @@ Format with clear sections and actionable recommendations."""
             "error": str(e)
         }
 
-@app.get("/", response_class=HTMLResponse)
-async def home():
-    """Serve the main web interface - exact replica of original app.py"""
-    return """
+# Web interface page, encoded once at import
+HOME_BODY = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -667,16 +769,27 @@ async def home():
         </script>
     </body>
     </html>
-    """
+    """.encode("utf-8")
+HOME_ETAG = f'"{hashlib.md5(HOME_BODY, usedforsecurity=False).hexdigest()}"'
+
+@app.get("/", response_class=HTMLResponse)
+async def home(request: Request):
+    """Serve the main web interface - exact replica of original app.py"""
+    headers = {"ETag": HOME_ETAG, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == HOME_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(content=HOME_BODY, media_type="text/html", headers=headers)
 
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    client = get_openai_client()
     return {
         "status": "healthy",
         "platform": "vercel-serverless",
-        "openai_available": client is not None,
+        "openai_available": openai_client is not None,
+        "prompt_cache_hit_rate": round(
+            prompt_cache_stats["cached_tokens"] / max(prompt_cache_stats["prompt_tokens"], 1), 3
+        ),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -700,13 +813,116 @@ async def get_models():
         }
     }
 
+async def stream_completion(**create_kwargs):
+    """Stream a chat completion, timing its tokens; returns (content, usage, timings)"""
+    started = time.monotonic()
+    first_token_at = None
+    parts = []
+    usage = None
+    
+    async with openai_semaphore:
+        stream = await openai_client.chat.completions.create(
+            stream=True, stream_options={"include_usage": True}, **create_kwargs
+        )
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+            parts.append(delta)
+    
+    finished = time.monotonic()
+    content = "".join(parts)
+    
+    record_prompt_cache(usage)
+    usage = usage_counts(usage)
+    timings = {}
+    if first_token_at is not None:
+        # Time to first token, then mean time per output token after it
+        timings["ttft_ms"] = round((first_token_at - started) * 1000)
+        if usage["completion_tokens"] > 1:
+            timings["tpot_ms"] = round((finished - first_token_at) * 1000 / (usage["completion_tokens"] - 1), 1)
+    return content, usage, timings
+
+_BATCH_ANSWER_RE = re.compile(r'^=== Answer (\d+) ===[ \t]*$', re.MULTILINE)
+# One batcher per upstream model, created on first use
+research_batchers: Dict[str, MicroBatcher] = {}
+
+def build_batch_prompt(prompts: List[str]) -> str:
+    """Combine several research prompts into one request with numbered answer markers"""
+    sections = "\n\n".join(f"=== Query {i} ===\n{prompt}" for i, prompt in enumerate(prompts, 1))
+    return (
+        "Answer each numbered query independently. Start each answer with a line of the form "
+        "'=== Answer N ===' matching its query number.\n\n" + sections
+    )
+
+def split_batch_response(content: str, count: int) -> Optional[List[str]]:
+    """Split a batched completion into its numbered answers; None if any answer is missing"""
+    markers = list(_BATCH_ANSWER_RE.finditer(content))
+    answers = {}
+    for marker, following in zip(markers, markers[1:] + [None]):
+        end = following.start() if following else len(content)
+        answers[int(marker.group(1))] = content[marker.end():end].strip()
+    if sorted(answers) != list(range(1, count + 1)) or not all(answers.values()):
+        return None
+    return [answers[i] for i in range(1, count + 1)]
+
+async def complete_research_batch(model: str, items: List[tuple]) -> List[tuple]:
+    """Answer (research_type, messages) items with one completion, falling back to one call each"""
+    async def complete(research_type: str, messages: List[Dict[str, str]], max_tokens: int = RESEARCH_MAX_TOKENS):
+        async with openai_semaphore:
+            response = await openai_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.7,
+                extra_body={"prompt_cache_key": f"research-{research_type}"}
+            )
+        record_prompt_cache(response.usage)
+        return response.choices[0].message.content or "", response.usage
+    
+    if len(items) > 1:
+        research_type, messages = items[0]
+        prompts = ["\n\n".join(message["content"] for message in item_messages[1:]) for _, item_messages in items]
+        batch_messages = [messages[0], {"role": "user", "content": build_batch_prompt(prompts)}]
+        content, usage = await complete(research_type, batch_messages, RESEARCH_MAX_TOKENS * len(items))
+        answers = split_batch_response(content, len(items))
+        if answers:
+            return [(answer, usage_counts(usage, len(items)), {"batch_size": len(items)}) for answer in answers]
+        logger.warning("Batched completion for %d queries could not be split; answering individually", len(items))
+    
+    results = await asyncio.gather(*(complete(research_type, messages) for research_type, messages in items))
+    return [(content, usage_counts(usage), {}) for content, usage in results]
+
+def get_research_batcher(model: str) -> MicroBatcher:
+    """Batcher that sends research requests for model in shared completions"""
+    batcher = research_batchers.get(model)
+    if batcher is None:
+        batcher = research_batchers[model] = MicroBatcher(
+            lambda items: complete_research_batch(model, items),
+            max_batch=RESEARCH_BATCH_MAX,
+            max_wait=RESEARCH_BATCH_WINDOW_MS / 1000
+        )
+    return batcher
+
+async def embed_query(query: str) -> Optional[List[float]]:
+    """Embed a query for semantic cache lookups"""
+    try:
+        response = await openai_client.embeddings.create(model=EMBEDDING_MODEL, input=normalize_query(query))
+        return response.data[0].embedding
+    except Exception as e:
+        logger.warning("Error creating embedding: %s", e)
+        return None
+
 @app.post("/api/research")
 async def conduct_research(request: ResearchRequest):
     """Conduct research using OpenAI"""
-    client = get_openai_client()
-    if not client:
+    if not openai_client:
         return {
-            "task_id": str(uuid.uuid4()),
+            "task_id": uuid.uuid4().hex,
             "status": "error",
             "query": request.query,
             "model": request.model,
@@ -714,52 +930,57 @@ async def conduct_research(request: ResearchRequest):
             "timestamp": datetime.now().isoformat()
         }
     
-    task_id = str(uuid.uuid4())
+    task_id = uuid.uuid4().hex
     
     try:
-        # Create research prompt based on type
-        if request.research_type == "validation":
-            prompt = f"Conduct a comprehensive business idea validation analysis for: {request.query}. Include market opportunity, target audience, competition, feasibility, and risks."
-        elif request.research_type == "market":
-            prompt = f"Perform detailed market research analysis for: {request.query}. Include market size, growth trends, customer segments, competitive landscape, and market entry barriers."
-        elif request.research_type == "financial":
-            prompt = f"Conduct financial feasibility analysis for: {request.query}. Include revenue projections, cost analysis, break-even analysis, funding requirements, and ROI calculations."
-        else:
-            prompt = f"Conduct comprehensive research on: {request.query}. Provide detailed analysis with insights, data, and actionable recommendations."
+        # Create research messages based on type
+        messages = research_messages(request.research_type, request.query)
 
-        # Map custom model names to actual OpenAI models
-        model_mapping = {
-            "o3-deep-research": "gpt-4-turbo-preview",  # Map to most capable model
-            "o4-mini-deep-research": "gpt-3.5-turbo"   # Map to faster model
-        }
-        
-        actual_model = model_mapping.get(request.model, "gpt-4")
-        
-        # Enhanced system prompt for better research quality
-        system_prompt = """You are an advanced AI research analyst with expertise across multiple domains. 
-        Provide comprehensive, well-structured research with:
-        - Executive summary with key findings
-        - Detailed analysis with data and statistics
-        - Market insights and trends
-        - Actionable recommendations
-        - Risk assessment and mitigation strategies
-        Use markdown formatting with clear headings, bullet points, and structured sections."""
-
-        # Call OpenAI API with mapped model
-        response = client.chat.completions.create(
-            model=actual_model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=3000,  # Increased for more comprehensive output
-            temperature=0.7
-        )
+        actual_model = _MODEL_MAPPING.get(request.model, "gpt-4")
+
+        # Serve repeated (or, when enabled, paraphrased) queries from the cache
+        cache_key = research_cache.make_key(actual_model, request.research_type, request.query)
+        cacheable = not is_time_sensitive(request.query)
+        cached = await research_cache.aget(cache_key) if cacheable else None
+        embedding = None
+        if cacheable and not cached and SEMANTIC_CACHE_ENABLED:
+            embedding = await embed_query(request.query)
+            if embedding:
+                cached = await research_cache.afind_similar(embedding, actual_model, request.research_type)
         
-        content = response.choices[0].message.content
+        timings = {}
+        if cached:
+            content, usage = cached["content"], cached["usage"]
+        else:
+            # Call OpenAI API with mapped model, streaming to time the first and later tokens
+            session_storage[task_id] = {
+                "task_id": task_id,
+                "status": "running",
+                "query": request.query,
+                "model": request.model,
+                "research_type": request.research_type
+            }
+            if RESEARCH_BATCH_WINDOW_MS > 0 and request.research_type == "custom" and len(request.query) <= BATCH_MAX_PROMPT_CHARS:
+                # Bursts of short queries are answered together in one round trip
+                compute = lambda: get_research_batcher(actual_model).submit((request.research_type, messages))
+            else:
+                compute = lambda: stream_completion(
+                    model=actual_model,
+                    messages=messages,
+                    max_tokens=3000,  # Increased for more comprehensive output
+                    temperature=0.7,
+                    # Routes requests sharing this prefix to the same provider prompt cache
+                    extra_body={"prompt_cache_key": f"research-{request.research_type}"}
+                )
+            content, usage, timings = await inflight_research.run(cache_key, compute)
+            if cacheable and content:
+                await research_cache.aset(
+                    cache_key, {"content": content, "usage": usage},
+                    actual_model, request.research_type, embedding
+                )
         
         # Enhanced result structure matching original app.py
-        word_count = len(content.split()) if content else 0
+        word_count = count_words(content)
         citations = content.count('[') if content else 0  # Simple citation count
         
         result = {
@@ -775,13 +996,11 @@ async def conduct_research(request: ResearchRequest):
                 "formatted_output": content,
                 "word_count": word_count,
                 "citations": citations,
-                "processing_time_formatted": "< 1 minute"
+                "processing_time_formatted": "< 1 minute",
+                "cache_hit": cached is not None,
+                **timings
             },
-            "usage": {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens
-            }
+            "usage": usage
         }
         
         # Store in session
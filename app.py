@@ -4,21 +4,56 @@ FastAPI Web Interface for OpenAI Research Client
 Provides a modern web interface for conducting research with model selection
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
-import json
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Dict, Any, List, Literal, Tuple
+import re
+import hashlib
+import time
+import orjson
 import asyncio
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 import os
-from services.research_client import OpenAIResearchClient, ResearchWorkflow
+import atexit
+import multiprocessing
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from dataclasses import dataclass, field, replace
+from collections import Counter
+from services.research_client import OpenAIResearchClient, ResearchWorkflow, close_openai_clients
 from services.storage_service import storage_service
+from services import task_queue
+from services.task_store import RedisTaskStore, TaskStore, create_task_store
+from services.result_files import ResultFileStore
+from services.result_index import create_result_index
+from services.research_formatting import count_words, extract_citations, format_research_output, render_markdown
 
-app = FastAPI(title="OpenAI Research Interface", version="1.0.0")
+# Runtime errors are logged through a queue so the event loop never blocks on stderr or file writes;
+# a listener thread does the actual I/O (set LOG_FILE to also keep a rotating log file)
+logger = logging.getLogger("research_app")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_handlers = [logging.StreamHandler()]
+if os.getenv("LOG_FILE"):
+    _log_handlers.append(RotatingFileHandler(os.getenv("LOG_FILE"), maxBytes=10_000_000, backupCount=3))
+for _handler in _log_handlers:
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+app = FastAPI(title="OpenAI Research Interface", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -27,11 +62,119 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Global storage for research tasks (in production, use a proper database)
-research_tasks = {}
-completed_results = {}
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    """GZip responses except Server-Sent Event streams, which must not be buffered"""
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Level 5 gets most of level 9's ratio on JSON/markdown at a fraction of the CPU
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=500, compresslevel=5)
+
+class VersionedStaticFiles(StaticFiles):
+    """Static files cached for a year when requested with a ?v= content hash"""
+    
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if scope.get("query_string", b"").startswith(b"v="):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+# Static frontend assets (served from disk so Starlette handles ETag/304s)
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+app.mount("/static", VersionedStaticFiles(directory=STATIC_DIR), name="static")
+
+def build_index_page():
+    """Load the web interface with asset URLs pinned to their content hash"""
+    html = (STATIC_DIR / "index.html").read_text(encoding="utf-8")
+    app_js = (STATIC_DIR / "app.js").read_bytes()
+    version = hashlib.md5(app_js).hexdigest()[:12]
+    body = html.replace('src="/static/app.js"', f'src="/static/app.js?v={version}"').encode("utf-8")
+    return f'"{hashlib.md5(body).hexdigest()}"', body
+
+INDEX_ETAG, INDEX_BODY = build_index_page()
+
+# With RESULT_STORE_DIR set, result bodies are written there and memory keeps only handles
+RESULT_STORE_DIR = os.getenv("RESULT_STORE_DIR")
+result_files = ResultFileStore(RESULT_STORE_DIR) if RESULT_STORE_DIR else None
+# Behind nginx, set to an internal location aliased to RESULT_STORE_DIR (e.g. /internal/results/)
+# so the proxy sends result files itself via X-Accel-Redirect
+RESULT_ACCEL_PREFIX = os.getenv("RESULT_ACCEL_PREFIX")
+
+class LargeChunkFileResponse(FileResponse):
+    """FileResponse reading 128 KiB per chunk (Starlette's default is 64 KiB)"""
+    chunk_size = 128 * 1024
+
+def drop_result_body(task_id: str):
+    """Forget a result's encoded body, in memory and on disk"""
+    result_bodies.pop(task_id, None)
+    if result_files:
+        result_files.delete(task_id)
+
+def forget_evicted_result(task_id: str, result: "ResearchResult"):
+    """Drop the cached body and idea of a result aged out of memory (the database still has it)"""
+    result_index.discard(task_id)
+    drop_result_body(task_id)
+    dashboard_ideas.pop(task_id, None)
+    bump_ideas_version()
+
+def forget_evicted_body(task_id: str, cached: tuple):
+    """Delete the file of a body aged out of result_bodies, along with the slimmed result pointing at it"""
+    if not isinstance(cached[1], str):
+        # An encoded body; completed_results still has the full result
+        return
+    if result_files:
+        result_files.delete(task_id)
+    if completed_results.pop(task_id, None) is not None:
+        result_index.discard(task_id)
+        dashboard_ideas.pop(task_id, None)
+        bump_ideas_version()
+
+# Global storage for research tasks, bounded by count and age (the database keeps the full history).
+# Shared through Redis across worker processes when REDIS_URL is set.
+research_tasks = create_task_store("research_tasks", maxsize=1000, ttl=86400)
+completed_results = create_task_store("completed_results", maxsize=1000, ttl=86400, on_evict=forget_evicted_result)
+# Completion order of stored results, for cursor pagination
+result_index = create_result_index(completed_results)
+# Pre-encoded (etag, body) for each completed result, served as-is by the result endpoint;
+# body is the file path instead when bodies live in RESULT_STORE_DIR
+result_bodies = create_task_store("result_bodies", maxsize=1000, ttl=86400, on_evict=forget_evicted_body)
+# Every store operation is a network round trip when the stores live in Redis
+STORES_IN_REDIS = any(isinstance(store, RedisTaskStore) for store in (research_tasks, completed_results, result_bodies))
+
+async def run_store_io(func, *args):
+    """Run a store operation inline in memory, or in the threadpool when it goes to Redis"""
+    if STORES_IN_REDIS:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+# Strong references to running research coroutines so they aren't garbage collected
+running_tasks = set()
+# In-process research runs through a bounded queue drained by a fixed number of workers,
+# so bursts wait their turn instead of all hitting the OpenAI rate limit at once
+RESEARCH_WORKERS = int(os.getenv("RESEARCH_WORKERS", "8"))
+RESEARCH_QUEUE_SIZE = int(os.getenv("RESEARCH_QUEUE_SIZE", "1000"))
+research_queue: Optional[asyncio.Queue] = None
+_research_queue_loop = None
+# Progress messages are written to the database in batches, at most once per interval
+PROGRESS_FLUSH_INTERVAL = 0.1
+_progress_pending: Optional[asyncio.Event] = None
+_progress_flush_loop = None
+# IDs of pending/running tasks, maintained on status changes so /health doesn't scan the store
+active_task_ids = set()
+# Subset of active_task_ids that has started running; the rest are pending
+running_task_ids = set()
+# Per-task callbacks used by queue workers to publish progress (see services/task_queue.py)
+progress_reporters = {}
+# Per-task change notifications for SSE streams; each update sets and replaces the event
+task_events: Dict[str, asyncio.Event] = {}
 
 # Initialize research client
 try:
@@ -43,10 +186,16 @@ except Exception as e:
     research_client = None
     research_workflow = None
 
+ResearchType = Literal["custom", "validation", "market", "financial", "comprehensive"]
+# Upper bound for request strings, checked by pydantic-core before any handler code runs
+MAX_QUERY_CHARS = 20000
+
 class ResearchRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", str_max_length=MAX_QUERY_CHARS)
+    
     query: str
     model: str = "o3-deep-research"
-    research_type: str = "custom"  # custom, validation, market, financial, comprehensive
+    research_type: ResearchType = "custom"
     enrich_prompt: bool = True
 
 class ResearchStatus(BaseModel):
@@ -59,7 +208,9 @@ class ResearchStatus(BaseModel):
     progress: Optional[str] = None
     error: Optional[str] = None
 
-class ResearchResult(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ResearchResult:
+    """Finished task result (built internally, so no validation; orjson encodes it natively)"""
     task_id: str
     status: str
     query: str
@@ -70,821 +221,648 @@ class ResearchResult(BaseModel):
     completed_at: Optional[str] = None
     error: Optional[str] = None
 
-def extract_citations(text: str) -> int:
-    """Extract citation count from research text"""
-    import re
-    if not text:
+@dataclass(slots=True)
+class DashboardAggregates:
+    """Running dashboard totals, updated as results are stored instead of recomputed per request"""
+    total_ideas: int = 0
+    successful: int = 0
+    failed: int = 0
+    citations_sum: int = 0
+    # Ideas per creation month ("YYYY-MM")
+    month_counts: Counter = field(default_factory=Counter)
+
+# Dashboard totals over every stored result, mirrored to a Redis hash when the stores live there
+dashboard_aggregates = DashboardAggregates()
+DASHBOARD_AGGREGATES_KEY = "dashboard_aggregates"
+# Per-result idea dicts for /api/dashboard/ideas, rebuilt only when a result changes
+dashboard_ideas = TaskStore(maxsize=1000, ttl=86400)
+# Bumped whenever the ideas list may have changed; /api/dashboard/ideas derives its ETag from it
+IDEAS_VERSION_KEY = "dashboard_ideas_version"
+_ideas_version = 0
+# (version, encoded body) of the last ideas response
+_ideas_body_cache = None
+
+def bump_ideas_version():
+    """Invalidate the cached ideas list, in every worker when the stores are shared"""
+    global _ideas_version
+    _ideas_version += 1
+    if isinstance(completed_results, RedisTaskStore):
+        completed_results.client.incr(IDEAS_VERSION_KEY)
+
+def current_ideas_version() -> str:
+    """Version of the ideas list, comparable across workers only when it lives in Redis"""
+    if isinstance(completed_results, RedisTaskStore):
+        return f"shared-{int(completed_results.client.get(IDEAS_VERSION_KEY) or 0)}"
+    return f"{os.getpid()}-{_ideas_version}"
+
+# Outputs at least this long are formatted in a worker process instead of on the event loop
+FORMAT_OFFLOAD_MIN_CHARS = 20000
+_cpu_pool = None
+
+def available_cpu_count() -> int:
+    """CPUs this process may run on, honouring affinity masks such as container cpusets"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _output_size(result: Dict[str, Any]) -> int:
+    """Total characters of markdown output in a (possibly comprehensive) result"""
+    if not isinstance(result, dict):
         return 0
-    # Count markdown links and various citation formats
-    citations = re.findall(r'\[([^\]]+)\]\(([^)]+)\)', text)
-    return len(citations)
+    size = len(result.get("output") or "")
+    for section in result.values():
+        if isinstance(section, dict):
+            size += len(section.get("output") or "")
+    return size
 
-def format_research_output(result: Dict[str, Any], research_type: str) -> Dict[str, Any]:
-    """Format research result for better display"""
-    if not result or not result.get("output"):
+async def format_research_output_async(result: Dict[str, Any], research_type: str) -> Dict[str, Any]:
+    """Format research output, offloading large outputs to the CPU process pool"""
+    # Progressive comprehensive results arrive with every section already formatted
+    if isinstance(result, dict) and result.get("type") == "comprehensive":
         return result
-    
-    output_text = result["output"]
-    
-    # Extract metadata
-    citation_count = extract_citations(output_text)
-    word_count = len(output_text.split()) if output_text else 0
-    
-    # For comprehensive research, format each section
-    if research_type == "comprehensive" and isinstance(result, dict):
-        formatted_sections = {}
-        total_citations = 0
-        
-        for section_name, section_data in result.items():
-            if isinstance(section_data, dict) and section_data.get("output"):
-                section_output = section_data["output"]
-                section_citations = extract_citations(section_output)
-                total_citations += section_citations
-                
-                formatted_sections[section_name] = {
-                    **section_data,
-                    "formatted_output": section_output,
-                    "citations": section_citations,
-                    "word_count": len(section_output.split())
-                }
-        
-        return {
-            "type": "comprehensive",
-            "sections": formatted_sections,
-            "total_citations": total_citations,
-            "total_words": sum(s.get("word_count", 0) for s in formatted_sections.values())
-        }
-    
-    # For single research types
+    if _output_size(result) < FORMAT_OFFLOAD_MIN_CHARS:
+        return format_research_output(result, research_type)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_pool(), format_research_output, result, research_type)
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """Formatting process pool, created on first use outside the web app (e.g. in queue workers)"""
+    global _cpu_pool
+    if _cpu_pool is None:
+        # This process already runs the log listener and I/O threads, and forking it could copy
+        # a lock some thread holds. Workers come from a clean forkserver (or spawn) process instead,
+        # importing only the formatting module.
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(["services.research_formatting"])
+        else:
+            context = multiprocessing.get_context("spawn")
+        _cpu_pool = ProcessPoolExecutor(max_workers=available_cpu_count(), mp_context=context)
+    return _cpu_pool
+
+@app.on_event("startup")
+def start_cpu_pool():
+    """Create the formatting pool at startup rather than on the first large result"""
+    get_cpu_pool()
+
+@app.on_event("shutdown")
+def shutdown_cpu_pool():
+    """Stop formatting worker processes"""
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(cancel_futures=True)
+        _cpu_pool = None
+
+# Threads shared by every asyncio.to_thread call (database, queue backend and file I/O)
+BLOCKING_IO_THREADS = int(os.getenv("BLOCKING_IO_THREADS", "16"))
+_io_pool = None
+
+@app.on_event("startup")
+async def start_io_pool():
+    """Install one named, bounded thread pool as the loop's default executor"""
+    global _io_pool
+    _io_pool = ThreadPoolExecutor(max_workers=BLOCKING_IO_THREADS, thread_name_prefix="research-io")
+    asyncio.get_running_loop().set_default_executor(_io_pool)
+
+@app.on_event("shutdown")
+def shutdown_io_pool():
+    """Let queued blocking calls finish without holding up shutdown"""
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=False)
+
+@app.on_event("shutdown")
+def flush_pending_progress():
+    """Write progress messages still waiting for the next batch"""
+    storage_service.flush_progress()
+
+@app.on_event("shutdown")
+async def close_openai_connections():
+    """Close pooled OpenAI connections"""
+    await close_openai_clients()
+
+def finish_active_task(task_id: str):
+    """Remove a task from the active-task indexes"""
+    active_task_ids.discard(task_id)
+    running_task_ids.discard(task_id)
+
+async def update_task(task_id: str, **fields):
+    """Update a task's in-memory state and notify its progress reporter, if any"""
+    status = fields.get("status")
+    if status in ("completed", "failed"):
+        finish_active_task(task_id)
+    elif status == "running" and task_id in active_task_ids:
+        running_task_ids.add(task_id)
+    task = await run_store_io(research_tasks.get, task_id)
+    if task is None:
+        # Evicted from the bounded store; the database still tracks it
+        return
+    task.update(fields)
+    # Write back so a Redis-backed store persists and publishes the change
+    await run_store_io(research_tasks.__setitem__, task_id, task)
+    reporter = progress_reporters.get(task_id)
+    if reporter:
+        reporter(task)
+    event = task_events.pop(task_id, None)
+    if event:
+        event.set()
+
+def result_citations(result: ResearchResult) -> int:
+    """Citation count recorded for a result (0 when it has no output)"""
+    if not result.result:
+        return 0
+    return result.result.get("total_citations", result.result.get("citations", 0))
+
+# Phrases in the research output that raise the simplified dashboard scores
+_SCORE_SIGNAL_RE = re.compile(r'market opportunity|feasible', re.IGNORECASE)
+
+def score_output(fields: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Simplified dashboard scores from one case-insensitive pass over the research output"""
+    signals = set()
+    if fields and isinstance(fields, dict):
+        output_text = str(fields.get("formatted_output", fields.get("output", "")))
+        for match in _SCORE_SIGNAL_RE.finditer(output_text):
+            signals.add(match.group(0).lower())
+            if len(signals) == 2:
+                break
+    return {
+        "market_opportunity": 80 if "market opportunity" in signals else 75,
+        "technical_feasibility": 75 if "feasible" in signals else 70
+    }
+
+def record_aggregates(result: ResearchResult, sign: int = 1):
+    """Add (or with sign=-1 remove) a result's contribution to the dashboard totals"""
+    successful = int(result.status == "completed")
+    deltas = {
+        "total_ideas": sign,
+        "successful": sign * successful,
+        "failed": sign * int(result.status == "failed"),
+        "citations_sum": sign * successful * result_citations(result),
+    }
+    month = (result.created_at or "")[:7]
+    for name, delta in deltas.items():
+        setattr(dashboard_aggregates, name, getattr(dashboard_aggregates, name) + delta)
+    dashboard_aggregates.month_counts[month] += sign
+    if isinstance(completed_results, RedisTaskStore):
+        with completed_results.client.pipeline() as pipe:
+            for name, delta in deltas.items():
+                pipe.hincrby(DASHBOARD_AGGREGATES_KEY, name, delta)
+            pipe.hincrby(DASHBOARD_AGGREGATES_KEY, f"month:{month}", sign)
+            pipe.execute()
+
+def load_aggregates() -> DashboardAggregates:
+    """Current dashboard totals, read from Redis when it is shared across workers"""
+    if isinstance(completed_results, RedisTaskStore):
+        stored = completed_results.client.hgetall(DASHBOARD_AGGREGATES_KEY)
+        aggregates = DashboardAggregates()
+        for name, value in stored.items():
+            name = name.decode()
+            if name.startswith("month:"):
+                aggregates.month_counts[name[len("month:"):]] = int(value)
+            else:
+                setattr(aggregates, name, int(value))
+        return aggregates
+    return dashboard_aggregates
+
+def encode_result(result: ResearchResult) -> Tuple[str, bytes]:
+    """Score a finished result and encode it once, returning (etag, body)"""
+    if result.result and isinstance(result.result, dict):
+        result.result["scores"] = score_output(result.result)
+    body = orjson.dumps(result)
+    return f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"', body
+
+def keep_result(task_id: str, result: ResearchResult, etag: str, body: bytes,
+                handle: Optional[Dict[str, Any]] = None):
+    """Record an encoded result in the stores; with a file handle, memory keeps only the slimmed fields"""
+    previous = completed_results.get(task_id)
+    if previous is not None:
+        record_aggregates(previous, -1)
+    record_aggregates(result)
+    dashboard_ideas.pop(task_id, None)
+    bump_ideas_version()
+    if handle:
+        # Project the dashboard idea while the full output is still at hand
+        dashboard_ideas[task_id] = idea_from_result(result)
+        result = replace(result, result=slim_result_fields(result.result, handle))
+        result_bodies[task_id] = (etag, handle["uri"])
+    else:
+        result_bodies[task_id] = (etag, body)
+    completed_results[task_id] = result
+    result_index.add(task_id)
+
+def store_result(task_id: str, result: ResearchResult):
+    """Keep a finished result along with its JSON body, encoded once"""
+    etag, body = encode_result(result)
+    handle = result_files.write(task_id, body) if result_files else None
+    keep_result(task_id, result, etag, body, handle)
+
+async def save_result(task_id: str, result: ResearchResult):
+    """store_result for the event loop: the body file is written and hashed in the threadpool"""
+    etag, body = encode_result(result)
+    handle = await asyncio.to_thread(result_files.write, task_id, body) if result_files else None
+    await run_store_io(keep_result, task_id, result, etag, body, handle)
+
+def slim_result_fields(fields: Optional[Dict[str, Any]], handle: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep a result's small scalar fields and a handle to its stored body"""
+    small = {
+        key: value for key, value in (fields or {}).items()
+        if value is None or isinstance(value, (bool, int, float)) or (isinstance(value, str) and len(value) <= 256)
+    }
+    if fields and "scores" in fields:
+        small["scores"] = fields["scores"]
+    return {**small, "body": handle}
+
+def load_result_body(task_id: str) -> Optional[bytes]:
+    """Encoded JSON of a stored result, read from disk when bodies are offloaded"""
+    cached = result_bodies.get(task_id)
+    if not cached:
+        return None
+    body = cached[1]
+    return body if isinstance(body, bytes) else result_files.read(task_id)
+
+async def load_task_state(task_id: str) -> Optional[Dict[str, Any]]:
+    """Look up task state in the queue backend, then memory, then the database"""
+    # Result backend and database lookups are blocking I/O, so they run in the threadpool
+    task_data = None
+    if task_queue.is_enabled():
+        task_data = await asyncio.to_thread(task_queue.get_task_state, task_id)
+        if task_data and task_data["status"] in ("completed", "failed"):
+            await adopt_queued_result(task_id)
+    task_data = task_data or await run_store_io(research_tasks.get, task_id)
+    if task_data:
+        if task_data["status"] in ("completed", "failed"):
+            # Queue workers finish tasks in another process
+            finish_active_task(task_id)
+        return task_data
+    return await load_stored_task_state(task_id)
+
+async def load_stored_task_state(task_id: str) -> Optional[Dict[str, Any]]:
+    """Task state from the database, which survives restarts and is shared by every worker"""
+    stored_task = await asyncio.to_thread(storage_service.get_research_task, task_id)
+    if stored_task:
+        stored_task.pop("result_data", None)
+    return stored_task
+
+async def load_task_states(task_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """load_task_state for several ids: one store read, then concurrent database lookups for the misses"""
+    if task_queue.is_enabled():
+        # Every id is checked against the result backend first
+        return list(await asyncio.gather(*(load_task_state(task_id) for task_id in task_ids)))
+    states = await run_store_io(research_tasks.get_many, task_ids)
+    missing = []
+    for i, (task_id, task_data) in enumerate(zip(task_ids, states)):
+        if not task_data:
+            missing.append(i)
+        elif task_data["status"] in ("completed", "failed"):
+            finish_active_task(task_id)
+    stored = await asyncio.gather(*(load_stored_task_state(task_ids[i]) for i in missing))
+    for i, stored_task in zip(missing, stored):
+        states[i] = stored_task
+    return states
+
+async def load_finished_result(task_id: str) -> Optional[ResearchResult]:
+    """Final result of a task that is no longer held in memory: queue backend, then database"""
+    if task_queue.is_enabled():
+        queued_result = await adopt_queued_result(task_id)
+        if queued_result:
+            return queued_result
+    return await load_stored_result(task_id)
+
+async def adopt_queued_result(task_id: str) -> Optional[ResearchResult]:
+    """Copy a queue worker's finished result into this process's stores, once
+
+    Workers run in another process and drop their copy when done, so without this
+    the results list, dashboard totals and /health would never see queued tasks.
+    """
+    result = await run_store_io(completed_results.get, task_id)
+    if result is not None:
+        return result
+    queued_result = await asyncio.to_thread(task_queue.get_task_result, task_id)
+    if not queued_result:
+        return None
+    result = ResearchResult(**queued_result)
+    await save_result(task_id, result)
+    return result
+
+async def load_stored_result(task_id: str) -> Optional[ResearchResult]:
+    """Rebuild a finished task's result from the database"""
+    stored_task = await asyncio.to_thread(storage_service.get_research_task, task_id)
+    if not stored_task or stored_task["status"] not in ("completed", "failed"):
+        return None
+    return ResearchResult(
+        task_id=task_id,
+        status=stored_task["status"],
+        query=stored_task["query"],
+        model=stored_task["model"],
+        research_type=stored_task["research_type"],
+        result=stored_task["result_data"],
+        created_at=stored_task["created_at"],
+        completed_at=stored_task["completed_at"],
+        error=stored_task["error"]
+    )
+
+def task_snapshot(task_id: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Client-facing view of a task's progress, decoding the partial result snapshot"""
+    partial_result = task_data.get("partial_result_bytes")
     return {
-        **result,
-        "formatted_output": output_text,
-        "citations": citation_count,
-        "word_count": word_count
+        "task_id": task_id,
+        "status": task_data["status"],
+        "progress": task_data["progress"],
+        "error": task_data.get("error"),
+        "partial_result": orjson.loads(partial_result) if partial_result else None,
+        "research_type": task_data.get("research_type", "comprehensive")
     }
 
-def run_progressive_comprehensive_research(task_id: str, request: ResearchRequest) -> Dict[str, Any]:
+async def run_progressive_comprehensive_research(task_id: str, request: ResearchRequest) -> Dict[str, Any]:
     """Run comprehensive research with progressive updates"""
     comprehensive_result = {
         "type": "comprehensive",
         "sections": {},
         "progress": {},
+        "errors": {},
         "total_citations": 0,
         "total_words": 0
     }
     
-    # Step 1: Validation
-    research_tasks[task_id]["progress"] = "Step 1/3: Running idea validation analysis..."
-    validation_result = research_workflow.validate_idea(request.query, request.model)
+    # The three analyses only depend on the query, so run them concurrently
+    await update_task(task_id, progress="Running validation, market and financial analysis in parallel...")
     
-    if validation_result.get("status") == "completed":
-        formatted_validation = format_research_output(validation_result, "validation")
-        comprehensive_result["sections"]["validation"] = formatted_validation
-        comprehensive_result["progress"]["validation"] = "completed"
-        
-        # Update live result for progressive display
-        research_tasks[task_id]["partial_result"] = comprehensive_result.copy()
-        research_tasks[task_id]["progress"] = "Validation completed! Starting market research..."
+    async def run_section(section: str, research):
+        # A failing section is reported like return_exceptions=True instead of aborting its siblings
+        try:
+            return section, await research(request.query, request.model)
+        except Exception as e:
+            logger.exception("%s analysis failed for task %s", section, task_id)
+            return section, {"status": "failed", "error": str(e)}
     
-    # Step 2: Market Research
-    research_tasks[task_id]["progress"] = "Step 2/3: Conducting market research analysis..."
-    market_result = research_workflow.market_research(request.query, request.model)
+    section_tasks = [
+        asyncio.create_task(run_section("validation", research_workflow.validate_idea)),
+        asyncio.create_task(run_section("market", research_workflow.market_research)),
+        asyncio.create_task(run_section("financial", research_workflow.financial_analysis))
+    ]
     
-    if market_result.get("status") == "completed":
-        formatted_market = format_research_output(market_result, "market")
-        comprehensive_result["sections"]["market"] = formatted_market
-        comprehensive_result["progress"]["market"] = "completed"
-        
-        # Update live result for progressive display
-        research_tasks[task_id]["partial_result"] = comprehensive_result.copy()
-        research_tasks[task_id]["progress"] = "Market research completed! Starting financial analysis..."
+    pending, finished = set(section_tasks), 0
+    try:
+        while pending:
+            # Sections that finish together are published in one snapshot
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            completed_sections, failed_sections = [], []
+            for section_task in (task for task in section_tasks if task in done):
+                section, section_result = section_task.result()
+                finished += 1
+                if section_result.get("status") != "completed":
+                    comprehensive_result["progress"][section] = "failed"
+                    comprehensive_result["errors"][section] = section_result.get("error") or "analysis failed"
+                    failed_sections.append(section)
+                    continue
+                
+                formatted_section = await format_research_output_async(section_result, section)
+                comprehensive_result["sections"][section] = formatted_section
+                comprehensive_result["progress"][section] = "completed"
+                comprehensive_result["total_citations"] += formatted_section.get("citations", 0)
+                comprehensive_result["total_words"] += formatted_section.get("word_count", 0)
+                completed_sections.append(section)
+            
+            if completed_sections or failed_sections:
+                notes = []
+                if completed_sections:
+                    notes.append(f"{' and '.join(completed_sections)} analysis finished")
+                if failed_sections:
+                    notes.append(f"{' and '.join(failed_sections)} analysis failed")
+                # Immutable snapshot for progressive display
+                await update_task(
+                    task_id,
+                    partial_result_bytes=orjson.dumps(comprehensive_result),
+                    progress=f"{finished}/3 analyses done: {'; '.join(notes)}",
+                    error=section_errors(comprehensive_result["errors"])
+                )
+    finally:
+        for section_task in section_tasks:
+            section_task.cancel()
     
-    # Step 3: Financial Analysis
-    research_tasks[task_id]["progress"] = "Step 3/3: Executing financial analysis..."
-    financial_result = research_workflow.financial_analysis(request.query, request.model)
+    if not comprehensive_result["sections"]:
+        # Nothing to report; background_research_task records the task as failed
+        raise RuntimeError(f"All comprehensive analyses failed: {section_errors(comprehensive_result['errors'])}")
     
-    if financial_result.get("status") == "completed":
-        formatted_financial = format_research_output(financial_result, "financial")
-        comprehensive_result["sections"]["financial"] = formatted_financial
-        comprehensive_result["progress"]["financial"] = "completed"
-        
-        # Calculate totals
-        total_citations = sum(
-            section.get("citations", 0) 
-            for section in comprehensive_result["sections"].values()
-        )
-        total_words = sum(
-            section.get("word_count", 0) 
-            for section in comprehensive_result["sections"].values()
-        )
-        
-        comprehensive_result["total_citations"] = total_citations
-        comprehensive_result["total_words"] = total_words
-        
-        # Final update
-        research_tasks[task_id]["partial_result"] = comprehensive_result.copy()
-        research_tasks[task_id]["progress"] = "All research completed! Generating final report..."
+    await update_task(task_id, progress="All research completed! Generating final report...")
     
     return comprehensive_result
 
-def background_research_task(task_id: str, request: ResearchRequest):
+def section_errors(errors: Dict[str, str]) -> Optional[str]:
+    """One-line summary of failed comprehensive sections (None when all succeeded)"""
+    if not errors:
+        return None
+    return "; ".join(f"{section} analysis: {error}" for section, error in errors.items())
+
+def utc_now_iso() -> str:
+    """Current time as a timezone-aware ISO 8601 string"""
+    return datetime.now(timezone.utc).isoformat()
+
+def format_duration(seconds: float) -> str:
+    """Render a duration in seconds as minutes and seconds, e.g. 2m 5s"""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds}s"
+
+async def progress_flusher(pending: asyncio.Event):
+    """Write queued progress messages to the database, one transaction per interval"""
+    while True:
+        await pending.wait()
+        # Let the rest of this interval's updates coalesce into the same write
+        await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+        pending.clear()
+        try:
+            await asyncio.to_thread(storage_service.flush_progress)
+        except Exception:
+            logger.exception("Progress flush error")
+
+def queue_progress(task_id: str, progress: str):
+    """Queue a task's progress message for the database, starting the flusher on first use in the running loop"""
+    global _progress_pending, _progress_flush_loop
+    loop = asyncio.get_running_loop()
+    if _progress_pending is None or _progress_flush_loop is not loop:
+        _progress_pending = asyncio.Event()
+        _progress_flush_loop = loop
+        flusher = loop.create_task(progress_flusher(_progress_pending))
+        running_tasks.add(flusher)
+        flusher.add_done_callback(running_tasks.discard)
+    storage_service.queue_progress(task_id, progress)
+    _progress_pending.set()
+
+async def background_research_task(task_id: str, request: ResearchRequest):
     """Background task for conducting research"""
-    start_time = datetime.now()
+    # Monotonic clock for durations; wall-clock timestamps are rendered once
+    start_ns = time.perf_counter_ns()
+    created_at = (await run_store_io(research_tasks.get, task_id) or {}).get("created_at") or utc_now_iso()
     
     try:
         # Update task status in storage service
-        storage_service.update_research_task(task_id, {
+        await asyncio.to_thread(storage_service.update_research_task, task_id, {
             "status": "running",
             "progress": "Initializing AI research..."
         })
         
-        research_tasks[task_id]["status"] = "running"
-        research_tasks[task_id]["progress"] = "Initializing AI research..."
+        await update_task(task_id, status="running", progress="Initializing AI research...")
         
         if request.research_type == "validation":
-            research_tasks[task_id]["progress"] = "Conducting idea validation analysis..."
-            storage_service.update_research_task(task_id, {"progress": "Conducting idea validation analysis..."})
-            result = research_workflow.validate_idea(request.query, request.model)
+            await update_task(task_id, progress="Conducting idea validation analysis...")
+            queue_progress(task_id, "Conducting idea validation analysis...")
+            result = await research_workflow.validate_idea(request.query, request.model)
         elif request.research_type == "market":
-            research_tasks[task_id]["progress"] = "Performing market research analysis..."
-            storage_service.update_research_task(task_id, {"progress": "Performing market research analysis..."})
-            result = research_workflow.market_research(request.query, request.model)
+            await update_task(task_id, progress="Performing market research analysis...")
+            queue_progress(task_id, "Performing market research analysis...")
+            result = await research_workflow.market_research(request.query, request.model)
         elif request.research_type == "financial":
-            research_tasks[task_id]["progress"] = "Executing financial analysis..."
-            storage_service.update_research_task(task_id, {"progress": "Executing financial analysis..."})
-            result = research_workflow.financial_analysis(request.query, request.model)
+            await update_task(task_id, progress="Executing financial analysis...")
+            queue_progress(task_id, "Executing financial analysis...")
+            result = await research_workflow.financial_analysis(request.query, request.model)
         elif request.research_type == "comprehensive":
             # Progressive comprehensive research
-            result = run_progressive_comprehensive_research(task_id, request)
+            result = await run_progressive_comprehensive_research(task_id, request)
         else:  # custom research
-            research_tasks[task_id]["progress"] = "Processing custom research query..."
-            storage_service.update_research_task(task_id, {"progress": "Processing custom research query..."})
-            result = research_workflow.custom_research(
+            await update_task(task_id, progress="Processing custom research query...")
+            queue_progress(task_id, "Processing custom research query...")
+            result = await research_workflow.custom_research(
                 request.query, 
                 request.model, 
                 "general", 
                 request.enrich_prompt
             )
         
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
+        processing_time_formatted = format_duration(processing_time)
         
         # Format the result for better display
-        formatted_result = format_research_output(result, request.research_type)
+        formatted_result = await format_research_output_async(result, request.research_type)
         
         # Store completed result in both memory (for compatibility) and database
-        completed_results[task_id] = ResearchResult(
+        await save_result(task_id, ResearchResult(
             task_id=task_id,
             status="completed",
             query=request.query,
             model=request.model,
             research_type=request.research_type,
-            result=formatted_result,
-            created_at=research_tasks[task_id]["created_at"],
-            completed_at=end_time.isoformat()
-        )
-        
-        # Add metadata to the completed result
-        completed_results[task_id].result["processing_time"] = round(processing_time, 1)
-        completed_results[task_id].result["processing_time_formatted"] = f"{int(processing_time // 60)}m {int(processing_time % 60)}s"
+            result={
+                **formatted_result,
+                "processing_time": round(processing_time, 1),
+                "processing_time_formatted": processing_time_formatted
+            },
+            created_at=created_at,
+            completed_at=utc_now_iso()
+        ))
         
-        research_tasks[task_id]["status"] = "completed"
-        research_tasks[task_id]["progress"] = f"Research completed successfully in {int(processing_time // 60)}m {int(processing_time % 60)}s"
+        # The full result now lives in completed_results, so keep only metadata here
+        await update_task(
+            task_id,
+            status="completed",
+            progress=f"Research completed successfully in {processing_time_formatted}",
+            partial_result_bytes=None
+        )
         
         # Save to storage service (database + documents)
-        storage_service.complete_research_task(task_id, formatted_result)
+        await asyncio.to_thread(storage_service.complete_research_task, task_id, formatted_result)
+        # The stored ideas portfolio changed along with the task
+        await run_store_io(bump_ideas_version)
         
     except Exception as e:
-        research_tasks[task_id]["status"] = "failed"
-        research_tasks[task_id]["error"] = str(e)
-        completed_results[task_id] = ResearchResult(
+        await save_result(task_id, ResearchResult(
             task_id=task_id,
             status="failed",
             query=request.query,
             model=request.model,
             research_type=request.research_type,
-            created_at=research_tasks[task_id]["created_at"],
+            created_at=created_at,
+            completed_at=utc_now_iso(),
             error=str(e)
-        )
+        ))
+        await update_task(task_id, status="failed", error=str(e), partial_result_bytes=None)
         
         # Update failed status in storage service
-        storage_service.update_research_task(task_id, {
+        await asyncio.to_thread(storage_service.update_research_task, task_id, {
             "status": "failed",
-            "progress": f"Research failed: {str(e)}"
+            "progress": f"Research failed: {str(e)}",
+            "error_message": str(e)
         })
 
 @app.get("/", response_class=HTMLResponse)
-async def home():
+async def home(request: Request):
     """Serve the main web interface"""
-    return """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>OpenAI Research Interface</title>
-        <script src="https://cdn.tailwindcss.com"></script>
-        <script src="https://unpkg.com/alpinejs@3.x.x/dist/cdn.min.js" defer></script>
-    </head>
-    <body class="bg-gray-50 min-h-screen">
-        <div x-data="researchApp()" class="container mx-auto px-4 py-8">
-            <!-- Header -->
-            <div class="text-center mb-8">
-                <h1 class="text-4xl font-bold text-gray-900 mb-2">OpenAI Research Interface</h1>
-                <p class="text-gray-600">Conduct comprehensive research using advanced AI models</p>
-            </div>
-
-            <!-- Model Selection & Research Form -->
-            <div class="bg-white rounded-lg shadow-md p-6 mb-8">
-                <form @submit.prevent="submitResearch()" class="space-y-6">
-                    <div>
-                        <label class="block text-sm font-medium text-gray-700 mb-2">Select Research Model</label>
-                        <select x-model="selectedModel" class="w-full border border-gray-300 rounded-md px-3 py-2 focus:outline-none focus:ring-2 focus:ring-blue-500">
-                            <template x-for="model in models" :key="model.id">
-                                <option :value="model.id" x-text="model.name"></option>
-                            </template>
-                        </select>
-                        <div x-show="selectedModelInfo" class="mt-2 p-3 bg-blue-50 rounded-md">
-                            <p class="text-sm text-blue-800" x-text="selectedModelInfo?.description"></p>
-                            <div class="mt-1 text-xs text-blue-600">
-                                <span x-text="'Best for: ' + selectedModelInfo?.best_for"></span> |
-                                <span x-text="'Cost: ' + selectedModelInfo?.cost"></span> |
-                                <span x-text="'Speed: ' + selectedModelInfo?.speed"></span>
-                            </div>
-                        </div>
-                    </div>
-
-                    <div>
-                        <label class="block text-sm font-medium text-gray-700 mb-2">Research Type</label>
-                        <select x-model="researchType" class="w-full border border-gray-300 rounded-md px-3 py-2 focus:outline-none focus:ring-2 focus:ring-blue-500">
-                            <option value="custom">Custom Research</option>
-                            <option value="validation">Idea Validation</option>
-                            <option value="market">Market Research</option>
-                            <option value="financial">Financial Analysis</option>
-                            <option value="comprehensive">Comprehensive Analysis (All Three)</option>
-                        </select>
-                    </div>
-
-                    <div>
-                        <label class="block text-sm font-medium text-gray-700 mb-2">Research Query</label>
-                        <textarea 
-                            x-model="query" 
-                            rows="4" 
-                            class="w-full border border-gray-300 rounded-md px-3 py-2 focus:outline-none focus:ring-2 focus:ring-blue-500"
-                            placeholder="Enter your research question or startup idea...">
-                        </textarea>
-                    </div>
-
-                    <div class="flex items-center">
-                        <input type="checkbox" x-model="enrichPrompt" class="h-4 w-4 text-blue-600 focus:ring-blue-500 border-gray-300 rounded">
-                        <label class="ml-2 block text-sm text-gray-700">Enrich prompt automatically (recommended)</label>
-                    </div>
-
-                    <button 
-                        type="submit" 
-                        :disabled="!query || isLoading"
-                        class="w-full bg-blue-600 text-white py-2 px-4 rounded-md hover:bg-blue-700 focus:outline-none focus:ring-2 focus:ring-blue-500 disabled:opacity-50 disabled:cursor-not-allowed">
-                        <span x-show="!isLoading">Start Research</span>
-                        <span x-show="isLoading">Starting Research...</span>
-                    </button>
-                </form>
-            </div>
+    # Revalidated on every load; the versioned script it references is cached long-term
+    headers = {"ETag": INDEX_ETAG, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == INDEX_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(content=INDEX_BODY, media_type="text/html", headers=headers)
 
-            <!-- Research Status -->
-            <div x-show="currentTask" class="bg-white rounded-lg shadow-md p-6 mb-8">
-                <h3 class="text-lg font-semibold mb-4">Research Progress</h3>
-                
-                <!-- Progress Steps -->
-                <div class="mb-6">
-                    <div class="flex items-center justify-between mb-2">
-                        <span class="text-sm font-medium">Progress</span>
-                        <span class="text-sm text-gray-600" x-text="getProgressPercentage() + '%'"></span>
-                    </div>
-                    <div class="w-full bg-gray-200 rounded-full h-3">
-                        <div class="bg-gradient-to-r from-blue-500 to-blue-600 h-3 rounded-full transition-all duration-1000 ease-out" 
-                             :style="'width: ' + getProgressPercentage() + '%'"></div>
-                    </div>
-                </div>
-
-                <!-- Step Indicators -->
-                <div class="space-y-3 mb-4">
-                    <div class="flex items-center space-x-3">
-                        <div class="flex-shrink-0 w-8 h-8 rounded-full flex items-center justify-center" 
-                             :class="getStepClass(1)">
-                            <span x-show="getStepNumber() > 1" class="text-white text-sm">✓</span>
-                            <span x-show="getStepNumber() === 1" class="w-3 h-3 bg-white rounded-full animate-pulse"></span>
-                            <span x-show="getStepNumber() < 1" class="text-gray-400 text-sm">1</span>
-                        </div>
-                        <div class="flex-1">
-                            <p class="text-sm font-medium" :class="getStepNumber() >= 1 ? 'text-gray-900' : 'text-gray-400'">
-                                Initialize Research
-                            </p>
-                            <p class="text-xs text-gray-500">Setting up AI models and preparing query</p>
-                        </div>
-                    </div>
-
-                    <div class="flex items-center space-x-3">
-                        <div class="flex-shrink-0 w-8 h-8 rounded-full flex items-center justify-center" 
-                             :class="getStepClass(2)">
-                            <span x-show="getStepNumber() > 2" class="text-white text-sm">✓</span>
-                            <span x-show="getStepNumber() === 2" class="w-3 h-3 bg-white rounded-full animate-pulse"></span>
-                            <span x-show="getStepNumber() < 2" class="text-gray-400 text-sm">2</span>
-                        </div>
-                        <div class="flex-1">
-                            <p class="text-sm font-medium" :class="getStepNumber() >= 2 ? 'text-gray-900' : 'text-gray-400'">
-                                Data Collection
-                            </p>
-                            <p class="text-xs text-gray-500">Gathering information from multiple sources</p>
-                        </div>
-                    </div>
-
-                    <div class="flex items-center space-x-3">
-                        <div class="flex-shrink-0 w-8 h-8 rounded-full flex items-center justify-center" 
-                             :class="getStepClass(3)">
-                            <span x-show="getStepNumber() > 3" class="text-white text-sm">✓</span>
-                            <span x-show="getStepNumber() === 3" class="w-3 h-3 bg-white rounded-full animate-pulse"></span>
-                            <span x-show="getStepNumber() < 3" class="text-gray-400 text-sm">3</span>
-                        </div>
-                        <div class="flex-1">
-                            <p class="text-sm font-medium" :class="getStepNumber() >= 3 ? 'text-gray-900' : 'text-gray-400'">
-                                Analysis & Processing
-                            </p>
-                            <p class="text-xs text-gray-500">AI analysis and report generation</p>
-                        </div>
-                    </div>
-
-                    <div class="flex items-center space-x-3">
-                        <div class="flex-shrink-0 w-8 h-8 rounded-full flex items-center justify-center" 
-                             :class="getStepClass(4)">
-                            <span x-show="getStepNumber() > 4" class="text-white text-sm">✓</span>
-                            <span x-show="getStepNumber() === 4" class="w-3 h-3 bg-white rounded-full animate-pulse"></span>
-                            <span x-show="getStepNumber() < 4" class="text-gray-400 text-sm">4</span>
-                        </div>
-                        <div class="flex-1">
-                            <p class="text-sm font-medium" :class="getStepNumber() >= 4 ? 'text-gray-900' : 'text-gray-400'">
-                                Final Report
-                            </p>
-                            <p class="text-xs text-gray-500">Formatting and finalizing results</p>
-                        </div>
-                    </div>
-                </div>
-
-                <!-- Current Status -->
-                <div class="bg-blue-50 rounded-lg p-4">
-                    <div class="flex items-center space-x-2">
-                        <div x-show="currentTask?.status === 'running'" class="flex-shrink-0">
-                            <div class="animate-spin w-4 h-4 border-2 border-blue-600 border-t-transparent rounded-full"></div>
-                        </div>
-                        <div>
-                            <p class="text-sm font-medium text-blue-900" x-text="currentTask?.progress || 'Processing...'"></p>
-                            <p class="text-xs text-blue-700">
-                                <span x-text="'Model: ' + (currentTask?.model || 'Unknown')"></span> • 
-                                <span x-text="'Type: ' + (currentTask?.research_type || 'custom')"></span>
-                            </p>
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <!-- Research Results -->
-            <div x-show="results.length > 0" class="space-y-6">
-                <h2 class="text-2xl font-bold text-gray-900">Research Results</h2>
-                <template x-for="result in results" :key="result.task_id">
-                    <div class="bg-white rounded-lg shadow-md overflow-hidden">
-                        <!-- Result Header -->
-                        <div class="bg-gradient-to-r from-blue-50 to-indigo-50 px-6 py-4 border-b">
-                            <div class="flex items-center justify-between mb-2">
-                                <h3 class="text-lg font-semibold text-gray-900" x-text="result.query"></h3>
-                                <div class="flex items-center space-x-2">
-                                    <span class="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-blue-100 text-blue-800" 
-                                          x-text="result.model"></span>
-                                    <span class="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-green-100 text-green-800" 
-                                          x-text="result.research_type"></span>
-                                </div>
-                            </div>
-                            
-                            <!-- Metadata Row -->
-                            <div class="flex items-center justify-between text-sm text-gray-600">
-                                <div class="flex items-center space-x-4">
-                                    <span x-show="result.result?.processing_time_formatted" class="flex items-center space-x-1">
-                                        <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 8v4l3 3m6-3a9 9 0 11-18 0 9 9 0 0118 0z"></path>
-                                        </svg>
-                                        <span x-text="result.result.processing_time_formatted"></span>
-                                    </span>
-                                    <span x-show="getCitationCount(result)" class="flex items-center space-x-1">
-                                        <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z"></path>
-                                        </svg>
-                                        <span x-text="getCitationCount(result) + ' citations'"></span>
-                                    </span>
-                                    <span x-show="getWordCount(result)" class="flex items-center space-x-1">
-                                        <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 19v-6a2 2 0 00-2-2H5a2 2 0 00-2 2v6a2 2 0 002 2h2a2 2 0 002-2zm0 0V9a2 2 0 012-2h2a2 2 0 012 2v10m-6 0a2 2 0 002 2h2a2 2 0 002-2m0 0V5a2 2 0 012-2h2a2 2 0 012 2v14a2 2 0 01-2 2h-2a2 2 0 01-2-2z"></path>
-                                        </svg>
-                                        <span x-text="getWordCount(result) + ' words'"></span>
-                                    </span>
-                                </div>
-                                <span class="text-xs" x-text="'Completed: ' + new Date(result.completed_at).toLocaleString()"></span>
-                            </div>
-                        </div>
-
-                        <!-- Result Content -->
-                        <div class="p-6">
-                            <div x-show="result.status === 'completed' && result.result">
-                                <!-- Comprehensive Research Display -->
-                                <div x-show="result.research_type === 'comprehensive'" class="space-y-6">
-                                    <template x-for="(section, sectionName) in result.result?.sections || {}" :key="sectionName">
-                                        <div class="border border-gray-200 rounded-lg">
-                                            <div class="bg-gray-50 px-4 py-3 border-b">
-                                                <h4 class="font-medium text-gray-900 capitalize" x-text="sectionName.replace('_', ' ')"></h4>
-                                                <div class="flex items-center space-x-3 text-sm text-gray-600 mt-1">
-                                                    <span x-show="section.citations" x-text="section.citations + ' citations'"></span>
-                                                    <span x-show="section.word_count" x-text="section.word_count + ' words'"></span>
-                                                </div>
-                                            </div>
-                                            <div class="p-4 max-h-64 overflow-y-auto">
-                                                <div class="prose prose-sm max-w-none" x-html="formatMarkdown(section.formatted_output || section.output)"></div>
-                                            </div>
-                                        </div>
-                                    </template>
-                                </div>
-
-                                <!-- Single Research Display -->
-                                <div x-show="result.research_type !== 'comprehensive'" class="max-h-96 overflow-y-auto">
-                                    <div class="prose prose-sm max-w-none" x-html="formatMarkdown(result.result?.formatted_output || result.result?.output || formatResult(result.result))"></div>
-                                </div>
-
-                                <!-- Action Buttons -->
-                                <div class="mt-6 flex space-x-3">
-                                    <button 
-                                        @click="downloadResult(result)"
-                                        class="inline-flex items-center px-4 py-2 bg-green-600 text-white text-sm font-medium rounded-md hover:bg-green-700 focus:outline-none focus:ring-2 focus:ring-green-500 focus:ring-offset-2">
-                                        <svg class="w-4 h-4 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 10v6m0 0l-3-3m3 3l3-3m2 8H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z"></path>
-                                        </svg>
-                                        Download Report
-                                    </button>
-                                    <button 
-                                        @click="copyResult(result)"
-                                        class="inline-flex items-center px-4 py-2 bg-gray-600 text-white text-sm font-medium rounded-md hover:bg-gray-700 focus:outline-none focus:ring-2 focus:ring-gray-500 focus:ring-offset-2">
-                                        <svg class="w-4 h-4 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 16H6a2 2 0 01-2-2V6a2 2 0 012-2h8a2 2 0 012 2v2m-6 12h8a2 2 0 002-2v-8a2 2 0 00-2-2h-8a2 2 0 00-2 2v8a2 2 0 002 2z"></path>
-                                        </svg>
-                                        Copy to Clipboard
-                                    </button>
-                                    <button 
-                                        @click="openDashboard(result)"
-                                        class="inline-flex items-center px-4 py-2 bg-purple-600 text-white text-sm font-medium rounded-md hover:bg-purple-700 focus:outline-none focus:ring-2 focus:ring-purple-500 focus:ring-offset-2">
-                                        <svg class="w-4 h-4 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 19v-6a2 2 0 00-2-2H5a2 2 0 00-2 2v6a2 2 0 002 2h2a2 2 0 002-2zm0 0V9a2 2 0 012-2h2a2 2 0 012 2v10m-6 0a2 2 0 002 2h2a2 2 0 002-2m0 0V5a2 2 0 012-2h2a2 2 0 012 2v14a2 2 0 01-2 2h-2a2 2 0 01-2-2z"></path>
-                                        </svg>
-                                        Open Integrated Dashboard
-                                    </button>
-                                </div>
-                            </div>
-
-                            <div x-show="result.status === 'failed'" class="bg-red-50 border border-red-200 rounded-md p-4">
-                                <div class="flex items-center">
-                                    <svg class="w-5 h-5 text-red-400 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 9v2m0 4h.01m-6.938 4h13.856c1.54 0 2.502-1.667 1.732-2.5L13.732 4c-.77-.833-1.964-.833-2.732 0L5.082 16.5c-.77.833.192 2.5 1.732 2.5z"></path>
-                                    </svg>
-                                    <p class="text-red-800 text-sm font-medium">Research Failed</p>
-                                </div>
-                                <p class="text-red-700 text-sm mt-1" x-text="result.error"></p>
-                            </div>
-                        </div>
-                    </div>
-                </template>
-            </div>
-        </div>
-
-        <script>
-            function researchApp() {
-                return {
-                    models: [],
-                    selectedModel: 'o3-deep-research',
-                    researchType: 'custom',
-                    query: '',
-                    enrichPrompt: true,
-                    isLoading: false,
-                    currentTask: null,
-                    results: [],
-
-                    async init() {
-                        await this.loadModels();
-                        this.checkPendingTasks();
-                        // Poll for updates every 5 seconds
-                        setInterval(() => this.checkPendingTasks(), 5000);
-                    },
-
-                    get selectedModelInfo() {
-                        return this.models.find(m => m.id === this.selectedModel);
-                    },
-
-                    async loadModels() {
-                        try {
-                            console.log('Loading models...');
-                            const response = await fetch('/api/models');
-                            console.log('Response status:', response.status);
-                            if (!response.ok) {
-                                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-                            }
-                            const data = await response.json();
-                            console.log('Models data received:', data);
-                            this.models = Object.entries(data).map(([id, info]) => ({
-                                id,
-                                name: info.name,
-                                description: info.description,
-                                best_for: info.best_for,
-                                cost: info.cost,
-                                speed: info.speed
-                            }));
-                            console.log('Models array:', this.models);
-                        } catch (error) {
-                            console.error('Failed to load models:', error);
-                            // Fallback models if API fails
-                            this.models = [
-                                {
-                                    id: 'o3-deep-research',
-                                    name: 'O3 Deep Research',
-                                    description: 'Most comprehensive research model with advanced reasoning capabilities',
-                                    best_for: 'Complex analysis, detailed reports, comprehensive research',
-                                    cost: 'Higher',
-                                    speed: 'Slower'
-                                },
-                                {
-                                    id: 'o4-mini-deep-research',
-                                    name: 'O4 Mini Deep Research',
-                                    description: 'Faster, cost-effective research model for quicker insights',
-                                    best_for: 'Quick research, initial exploration, cost-sensitive tasks',
-                                    cost: 'Lower',
-                                    speed: 'Faster'
-                                }
-                            ];
-                        }
-                    },
-
-                    async submitResearch() {
-                        if (!this.query.trim()) return;
-
-                        this.isLoading = true;
-                        try {
-                            const response = await fetch('/api/research', {
-                                method: 'POST',
-                                headers: {
-                                    'Content-Type': 'application/json',
-                                },
-                                body: JSON.stringify({
-                                    query: this.query,
-                                    model: this.selectedModel,
-                                    research_type: this.researchType,
-                                    enrich_prompt: this.enrichPrompt
-                                })
-                            });
-
-                            if (response.ok) {
-                                const task = await response.json();
-                                this.currentTask = task;
-                                this.query = '';
-                            } else {
-                                alert('Failed to start research');
-                            }
-                        } catch (error) {
-                            console.error('Error submitting research:', error);
-                            alert('Error submitting research');
-                        } finally {
-                            this.isLoading = false;
-                        }
-                    },
-
-                    async checkPendingTasks() {
-                        if (this.currentTask && (this.currentTask.status === 'pending' || this.currentTask.status === 'running')) {
-                            try {
-                                // For comprehensive research, check progressive results
-                                if (this.currentTask.research_type === 'comprehensive') {
-                                    const progressResponse = await fetch(`/api/research/${this.currentTask.task_id}/progressive`);
-                                    if (progressResponse.ok) {
-                                        const progressData = await progressResponse.json();
-                                        this.currentTask = progressData;
-                                        
-                                        // If there are partial results, add them to results display
-                                        if (progressData.partial_result && progressData.partial_result.sections) {
-                                            this.updateProgressiveResults(progressData);
-                                        }
-                                    }
-                                }
-                                
-                                // Check regular status
-                                const response = await fetch(`/api/research/${this.currentTask.task_id}/status`);
-                                if (response.ok) {
-                                    const status = await response.json();
-                                    this.currentTask = {...this.currentTask, ...status};
-
-                                    if (status.status === 'completed' || status.status === 'failed') {
-                                        await this.loadResults();
-                                        this.currentTask = null;
-                                    }
-                                }
-                            } catch (error) {
-                                console.error('Error checking task status:', error);
-                            }
-                        }
-                    },
-
-                    updateProgressiveResults(progressData) {
-                        // Find existing progressive result or create new one
-                        let existingIndex = this.results.findIndex(r => r.task_id === progressData.task_id);
-                        
-                        const progressiveResult = {
-                            task_id: progressData.task_id,
-                            query: this.currentTask.query,
-                            model: this.currentTask.model,
-                            research_type: 'comprehensive',
-                            status: 'in-progress',
-                            created_at: this.currentTask.created_at,
-                            result: progressData.partial_result
-                        };
-                        
-                        if (existingIndex >= 0) {
-                            // Update existing progressive result
-                            this.results[existingIndex] = progressiveResult;
-                        } else {
-                            // Add new progressive result
-                            this.results.unshift(progressiveResult);
-                        }
-                    },
-
-                    async loadResults() {
-                        try {
-                            const response = await fetch('/api/research/results');
-                            if (response.ok) {
-                                this.results = await response.json();
-                            }
-                        } catch (error) {
-                            console.error('Error loading results:', error);
-                        }
-                    },
-
-                    getProgressPercentage() {
-                        if (!this.currentTask) return 0;
-                        const status = this.currentTask.status;
-                        const progress = this.currentTask.progress || '';
-                        
-                        if (status === 'pending') return 10;
-                        if (status === 'running') {
-                            if (progress.includes('Initializing')) return 25;
-                            if (progress.includes('collecting') || progress.includes('Conducting') || progress.includes('Performing')) return 50;
-                            if (progress.includes('Processing') || progress.includes('analysis')) return 75;
-                            if (progress.includes('Finalizing')) return 90;
-                            return 60;
-                        }
-                        if (status === 'completed') return 100;
-                        return 0;
-                    },
-
-                    getStepNumber() {
-                        if (!this.currentTask) return 0;
-                        const progress = this.currentTask.progress || '';
-                        
-                        if (progress.includes('Initializing')) return 1;
-                        if (progress.includes('collecting') || progress.includes('Conducting') || progress.includes('Performing')) return 2;
-                        if (progress.includes('Processing') || progress.includes('analysis')) return 3;
-                        if (progress.includes('Finalizing') || this.currentTask.status === 'completed') return 4;
-                        return 1;
-                    },
-
-                    getStepClass(stepNumber) {
-                        const current = this.getStepNumber();
-                        if (current > stepNumber) return 'bg-green-500';
-                        if (current === stepNumber) return 'bg-blue-500';
-                        return 'bg-gray-300';
-                    },
-
-                    getCitationCount(result) {
-                        if (result.research_type === 'comprehensive') {
-                            return result.result?.total_citations || 0;
-                        }
-                        return result.result?.citations || 0;
-                    },
-
-                    getWordCount(result) {
-                        if (result.research_type === 'comprehensive') {
-                            return result.result?.total_words || 0;
-                        }
-                        return result.result?.word_count || 0;
-                    },
-
-                    formatMarkdown(text) {
-                        if (!text) return '';
-                        
-                        // Simple markdown to HTML conversion
-                        return text
-                            .replace(/### (.*?)\\n/g, '<h3 class="text-lg font-semibold mt-4 mb-2">$1</h3>')
-                            .replace(/## (.*?)\\n/g, '<h2 class="text-xl font-bold mt-6 mb-3">$1</h2>')
-                            .replace(/# (.*?)\\n/g, '<h1 class="text-2xl font-bold mt-8 mb-4">$1</h1>')
-                            .replace(/\\*\\*(.*?)\\*\\*/g, '<strong>$1</strong>')
-                            .replace(/\\*(.*?)\\*/g, '<em>$1</em>')
-                            .replace(/\\[([^\\]]+)\\]\\(([^)]+)\\)/g, '<a href="$2" class="text-blue-600 underline" target="_blank">$1</a>')
-                            .replace(/\\n- (.*?)(?=\\n|$)/g, '\\n<li class="ml-4">$1</li>')
-                            .replace(/(<li.*?>.*?<\\/li>)/gs, '<ul class="list-disc ml-6 mb-2">$1</ul>')
-                            .replace(/\\n\\n/g, '</p><p class="mb-3">')
-                            .replace(/^/, '<p class="mb-3">')
-                            .replace(/$/, '</p>');
-                    },
-
-                    formatResult(result) {
-                        if (typeof result === 'string') return result;
-                        if (result?.formatted_output) return result.formatted_output;
-                        if (result?.output) return result.output;
-                        return JSON.stringify(result, null, 2);
-                    },
-
-                    downloadResult(result) {
-                        let content = '';
-                        
-                        if (result.research_type === 'comprehensive') {
-                            content = `# Research Report: ${result.query}\n\n`;
-                            content += `**Model:** ${result.model}\n`;
-                            content += `**Processing Time:** ${result.result?.processing_time_formatted}\n`;
-                            content += `**Total Citations:** ${this.getCitationCount(result)}\n`;
-                            content += `**Total Words:** ${this.getWordCount(result)}\n\n`;
-                            content += `---\n\n`;
-                            
-                            for (const [sectionName, section] of Object.entries(result.result?.sections || {})) {
-                                content += `# ${sectionName.replace('_', ' ').toUpperCase()}\n\n`;
-                                content += section.formatted_output || section.output || '';
-                                content += `\n\n---\n\n`;
-                            }
-                        } else {
-                            content = `# Research Report: ${result.query}\n\n`;
-                            content += `**Model:** ${result.model}\n`;
-                            content += `**Type:** ${result.research_type}\n`;
-                            content += `**Processing Time:** ${result.result?.processing_time_formatted}\n`;
-                            content += `**Citations:** ${this.getCitationCount(result)}\n`;
-                            content += `**Words:** ${this.getWordCount(result)}\n\n`;
-                            content += `---\n\n`;
-                            content += this.formatResult(result.result);
-                        }
-                        
-                        const blob = new Blob([content], { type: 'text/markdown' });
-                        const url = URL.createObjectURL(blob);
-                        const a = document.createElement('a');
-                        a.href = url;
-                        a.download = `research_${result.query.substring(0, 30).replace(/[^a-zA-Z0-9]/g, '_')}.md`;
-                        a.click();
-                        URL.revokeObjectURL(url);
-                    },
-
-                    async copyResult(result) {
-                        const content = this.formatResult(result.result);
-                        try {
-                            await navigator.clipboard.writeText(content);
-                            alert('Result copied to clipboard!');
-                        } catch (error) {
-                            console.error('Failed to copy to clipboard:', error);
-                        }
-                    },
-
-                    openDashboard(result) {
-                        // Store result data for dashboard
-                        localStorage.setItem('dashboardData', JSON.stringify(result));
-                        // Open React dashboard in new tab
-                        window.open('http://localhost:8080', '_blank');
-                    }
-                }
-            }
-        </script>
-    </body>
-    </html>
-    """
+# Encoded /api/models payload: (expires_at, etag, body)
+MODELS_CACHE_TTL = 300
+_models_cache: Optional[tuple] = None
 
 @app.get("/api/models")
-async def get_models():
+async def get_models(request: Request):
     """Get available research models"""
+    global _models_cache
     if not research_client:
         raise HTTPException(status_code=500, detail="Research client not initialized")
     
-    return research_client.get_available_models()
+    if _models_cache is None or _models_cache[0] <= time.monotonic():
+        body = orjson.dumps(research_client.get_available_models())
+        etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+        _models_cache = (time.monotonic() + MODELS_CACHE_TTL, etag, body)
+    
+    _, etag, body = _models_cache
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={MODELS_CACHE_TTL}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def research_worker(queue: asyncio.Queue):
+    """Run queued research tasks one at a time"""
+    while True:
+        task_id, request = await queue.get()
+        try:
+            await background_research_task(task_id, request)
+        except Exception:
+            logger.exception("Research worker error for %s", task_id)
+        finally:
+            queue.task_done()
+
+def get_research_queue() -> asyncio.Queue:
+    """Queue feeding the research workers, started on first use in the running event loop"""
+    global research_queue, _research_queue_loop
+    loop = asyncio.get_running_loop()
+    if research_queue is None or _research_queue_loop is not loop:
+        research_queue = asyncio.Queue(maxsize=RESEARCH_QUEUE_SIZE)
+        _research_queue_loop = loop
+        for _ in range(RESEARCH_WORKERS):
+            worker = loop.create_task(research_worker(research_queue))
+            running_tasks.add(worker)
+            worker.add_done_callback(running_tasks.discard)
+    return research_queue
 
 @app.post("/api/research")
-async def start_research(request: ResearchRequest, background_tasks: BackgroundTasks):
+async def start_research(request: ResearchRequest):
     """Start a new research task"""
     if not research_client or not research_workflow:
         raise HTTPException(status_code=500, detail="Research client not initialized")
     
-    task_id = str(uuid.uuid4())
+    queue = None
+    if not task_queue.is_enabled():
+        queue = get_research_queue()
+        if queue.full():
+            raise HTTPException(status_code=503, detail="Research queue is full, please retry shortly")
+    
+    task_id = uuid.uuid4().hex
     
     # Store task info in memory (for compatibility)
-    research_tasks[task_id] = {
+    task = {
         "task_id": task_id,
         "status": "pending",
-        "created_at": datetime.now().isoformat(),
+        "created_at": utc_now_iso(),
         "query": request.query,
         "model": request.model,
         "research_type": request.research_type,
         "progress": "Task created, waiting to start..."
     }
+    await run_store_io(research_tasks.__setitem__, task_id, task)
+    active_task_ids.add(task_id)
     
     # Save task to storage service (database)
     task_data = {
@@ -896,67 +874,230 @@ async def start_research(request: ResearchRequest, background_tasks: BackgroundT
         "progress": "Task created, waiting to start...",
         "enrich_prompt": request.enrich_prompt
     }
-    storage_service.save_research_task(task_data)
+    await asyncio.to_thread(storage_service.save_research_task, task_data)
     
-    # Start background task
-    background_tasks.add_task(background_research_task, task_id, request)
+    if task_queue.is_enabled():
+        # Hand the research off to a queue worker
+        await asyncio.to_thread(task_queue.enqueue_research, task_id, task, request.model_dump())
+    else:
+        try:
+            # Picked up by the next free research worker
+            queue.put_nowait((task_id, request))
+        except asyncio.QueueFull:
+            # Other submissions filled the queue while this one was being saved
+            await run_store_io(research_tasks.pop, task_id, None)
+            finish_active_task(task_id)
+            await asyncio.to_thread(storage_service.update_research_task, task_id, {
+                "status": "failed",
+                "progress": "Rejected: research queue was full",
+                "error_message": "Research queue was full"
+            })
+            raise HTTPException(status_code=503, detail="Research queue is full, please retry shortly")
     
-    return ResearchStatus(**research_tasks[task_id])
+    return ResearchStatus(**task)
+
+# Upper bound on how long a status request may be held open waiting for a change
+MAX_STATUS_WAIT = 30
+
+def task_change_event(task_id: str) -> Optional[asyncio.Event]:
+    """Event set on the task's next update (None when updates happen in another process)"""
+    if task_queue.is_enabled() or task_id not in active_task_ids:
+        return None
+    return task_events.setdefault(task_id, asyncio.Event())
+
+async def wait_for_task_change(task_id: str, event: Optional[asyncio.Event], timeout: float) -> bool:
+    """Wait until the task changes or the timeout passes; False if the wait simply ran out"""
+    try:
+        if event:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        if isinstance(research_tasks, RedisTaskStore) and not task_queue.is_enabled():
+            # Running on another worker; wake on its Redis notification, re-checking every 2s
+            return await research_tasks.wait_for_change(task_id, min(2, timeout))
+        else:
+            # Queued tasks live in another process; poll the result backend
+            await asyncio.sleep(min(2, timeout))
+    except asyncio.TimeoutError:
+        pass
+    return False
 
 @app.get("/api/research/{task_id}/status")
-async def get_research_status(task_id: str):
-    """Get the status of a research task"""
-    if task_id not in research_tasks:
-        raise HTTPException(status_code=404, detail="Task not found")
+async def get_research_status(task_id: str, request: Request, wait: float = 0):
+    """Get the status of a research task (with ?wait=N and If-None-Match, long-poll for a change)"""
+    deadline = time.monotonic() + min(max(wait, 0), MAX_STATUS_WAIT)
+    known_etag = request.headers.get("if-none-match")
+    while True:
+        # Grab the change event before reading state so no update is missed
+        event = task_change_event(task_id)
+        task_data = await load_task_state(task_id)
+        if not task_data:
+            raise HTTPException(status_code=404, detail="Task not found")
+        
+        body = orjson.dumps(ResearchStatus(**task_data).model_dump())
+        etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+        remaining = deadline - time.monotonic()
+        if etag != known_etag or remaining <= 0 or task_data["status"] in ("completed", "failed"):
+            break
+        await wait_for_task_change(task_id, event, remaining)
     
-    return ResearchStatus(**research_tasks[task_id])
+    if etag == known_etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+# Upper bound on task ids per batch status request
+MAX_BATCH_STATUS_IDS = 100
+
+@app.post("/api/research/status/batch")
+async def get_research_status_batch(task_ids: List[str]):
+    """Get the status of several research tasks in one request (unknown ids map to null)"""
+    task_ids = task_ids[:MAX_BATCH_STATUS_IDS]
+    statuses = {}
+    for task_id, task_data in zip(task_ids, await load_task_states(task_ids)):
+        statuses[task_id] = ResearchStatus(**task_data).model_dump() if task_data else None
+    return Response(content=orjson.dumps(statuses), media_type="application/json")
 
 @app.get("/api/research/{task_id}/progressive")
 async def get_progressive_results(task_id: str):
     """Get progressive results for comprehensive research"""
-    if task_id not in research_tasks:
+    task_data = await load_task_state(task_id)
+    if not task_data:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    task_data = research_tasks[task_id]
+    return task_snapshot(task_id, task_data)
+
+@app.get("/api/research/{task_id}/stream")
+async def stream_research_progress(task_id: str):
+    """Stream task progress as Server-Sent Events until the task finishes"""
+    if not await load_task_state(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
     
-    # Return partial results if available
-    if "partial_result" in task_data and task_data["partial_result"]:
-        return {
-            "task_id": task_id,
-            "status": task_data["status"],
-            "progress": task_data["progress"],
-            "partial_result": task_data["partial_result"],
-            "research_type": task_data.get("research_type", "comprehensive")
-        }
+    async def events():
+        last_payload = None
+        while True:
+            # Grab the change event before reading state so no update is missed
+            event = task_change_event(task_id)
+            task_data = await load_task_state(task_id)
+            if not task_data:
+                yield b"event: error\ndata: {\"detail\": \"Task not found\"}\n\n"
+                return
+            
+            payload = orjson.dumps(task_snapshot(task_id, task_data))
+            if payload != last_payload:
+                yield b"event: progress\ndata: " + payload + b"\n\n"
+                last_payload = payload
+            
+            if task_data["status"] in ("completed", "failed"):
+                body = await run_store_io(load_result_body, task_id)
+                if body is None:
+                    result = await load_finished_result(task_id)
+                    body = orjson.dumps(result)
+                yield b"event: done\ndata: " + body + b"\n\n"
+                return
+            
+            if not await wait_for_task_change(task_id, event, 15):
+                yield b": keep-alive\n\n"
     
-    return {
-        "task_id": task_id,
-        "status": task_data["status"],
-        "progress": task_data["progress"],
-        "partial_result": None,
-        "research_type": task_data.get("research_type", "comprehensive")
-    }
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/api/research/{task_id}/result")
-async def get_research_result(task_id: str):
+async def get_research_result(task_id: str, request: Request):
     """Get the result of a completed research task"""
-    if task_id not in completed_results:
+    cached = await run_store_io(result_bodies.get, task_id)
+    if cached:
+        etag, body = cached
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        if isinstance(body, str):
+            if RESULT_ACCEL_PREFIX:
+                return Response(media_type="application/json", headers={
+                    "ETag": etag, "X-Accel-Redirect": f"{RESULT_ACCEL_PREFIX}{os.path.basename(body)}"
+                })
+            # Streamed from RESULT_STORE_DIR without loading it into memory
+            return LargeChunkFileResponse(body, media_type="application/json", headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+    
+    # Encode directly; returning the dataclass would deep-copy it through jsonable_encoder first
+    result = await run_store_io(completed_results.get, task_id) or await load_finished_result(task_id)
+    if not result:
         raise HTTPException(status_code=404, detail="Result not found")
     
-    return completed_results[task_id]
+    # Finished results don't change, so later reads are served from the encoded body
+    body = orjson.dumps(result)
+    etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    await run_store_io(result_bodies.__setitem__, task_id, (etag, body))
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+# Default and maximum number of results per /api/research/results page
+RESULTS_PAGE_SIZE = 50
+RESULTS_PAGE_MAX = 200
+
+def collect_result_bodies(task_ids: List[str]) -> List[bytes]:
+    """Encoded bodies for the given results, skipping any that have since expired"""
+    bodies = []
+    for task_id in task_ids:
+        body = load_result_body(task_id)
+        if body is None:
+            result = completed_results.get(task_id)
+            if result is None:
+                continue
+            body = orjson.dumps(result)
+        bodies.append(body)
+    return bodies
 
 @app.get("/api/research/results")
-async def get_all_results():
-    """Get all research results"""
-    return list(completed_results.values())
+async def get_all_results(request: Request, cursor: int = 0,
+                          limit: int = Query(RESULTS_PAGE_SIZE, ge=1, le=RESULTS_PAGE_MAX)):
+    """Get research results in completion order, one page at a time"""
+    task_ids, next_cursor = await run_store_io(result_index.page, cursor, limit)
+    headers = {"Cache-Control": "no-cache"}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)
+    
+    # A page's ETag derives from its results' ETags, so an unchanged page is answered without touching the bodies
+    etag = None
+    cached = await run_store_io(result_bodies.get_many, task_ids)
+    if all(cached):
+        page_key = ",".join(body_etag for body_etag, _ in cached) + f"|{next_cursor}"
+        etag = f'"{hashlib.md5(page_key.encode(), usedforsecurity=False).hexdigest()}"'
+        headers["ETag"] = etag
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+    
+    # Splice together the bodies encoded when each result was stored
+    if result_files:
+        # Reading many files would stall the event loop
+        bodies = await asyncio.to_thread(collect_result_bodies, task_ids)
+    else:
+        bodies = await run_store_io(collect_result_bodies, task_ids)
+    content = b"[" + b",".join(bodies) + b"]"
+    if etag is None:
+        headers["ETag"] = f'"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+def forget_result(task_id: str):
+    """Drop a task and its result from every store"""
+    result = completed_results.pop(task_id, None)
+    if result is not None:
+        record_aggregates(result, -1)
+    result_index.discard(task_id)
+    dashboard_ideas.pop(task_id, None)
+    bump_ideas_version()
+    drop_result_body(task_id)
+    research_tasks.pop(task_id, None)
 
 @app.delete("/api/research/{task_id}")
 async def delete_research_result(task_id: str):
     """Delete a research result"""
-    if task_id in completed_results:
-        del completed_results[task_id]
-    if task_id in research_tasks:
-        del research_tasks[task_id]
+    await run_store_io(forget_result, task_id)
+    finish_active_task(task_id)
+    if task_queue.is_enabled():
+        await asyncio.to_thread(task_queue.forget_task, task_id)
     
     return {"message": "Result deleted successfully"}
 
@@ -965,100 +1106,119 @@ async def get_dashboard_overview():
     """Get dashboard overview metrics from storage service"""
     try:
         # Get real metrics from storage service
-        overview = storage_service.get_dashboard_overview()
+        overview = await asyncio.to_thread(storage_service.get_dashboard_overview)
+        # Research requests served by joining an identical in-flight run
+        overview["inflight_hits"] = research_client.inflight.hits if research_client else 0
+        # Results dropped from memory for size or age
+        overview["evicted_results"] = completed_results.evictions
         return overview
     except Exception as e:
-        print(f"Error getting dashboard overview: {e}")
-        # Fallback to memory-based calculation for compatibility
-        total_ideas = len(completed_results)
-        if total_ideas == 0:
-            return {
-                "total_ideas": 0,
-                "avg_market_score": 0,
-                "ideas_ready_for_development": 0,
-                "total_market_opportunity": "$0",
-                "new_ideas_this_month": 0,
-                "avg_research_depth": 0,
-                "validation_success_rate": 0
-            }
-        
-        # Calculate metrics from completed research
-        completed_research = list(completed_results.values())
-        successful_research = [r for r in completed_research if r.status == "completed"]
-        
-        avg_citations = sum(
-            r.result.get("total_citations", r.result.get("citations", 0)) 
-            for r in successful_research if r.result
-        ) / max(len(successful_research), 1)
-        
+        logger.warning("Error getting dashboard overview: %s", e)
+        # Fallback to the running totals kept by store_result
+        aggregates = await run_store_io(load_aggregates)
+        this_month = datetime.now(timezone.utc).strftime("%Y-%m")
+        return overview_from_aggregates(
+            aggregates.total_ideas, aggregates.successful, aggregates.failed, aggregates.citations_sum,
+            aggregates.month_counts[this_month]
+        )
+
+@lru_cache(maxsize=1)
+def overview_from_aggregates(total_ideas: int, successful: int, failed: int, citations_sum: int,
+                             new_this_month: int = 0) -> Dict[str, Any]:
+    """Dashboard overview derived from the running totals, rebuilt only when they change"""
+    if total_ideas == 0:
         return {
-            "total_ideas": total_ideas,
-            "avg_market_score": 75.5,  # Mock score - would calculate from results
-            "ideas_ready_for_development": len(successful_research),
-            "total_market_opportunity": "$450B",  # Mock - would calculate from market research
-            "new_ideas_this_month": total_ideas,
-            "avg_research_depth": round(avg_citations, 1),
-            "validation_success_rate": round((len(successful_research) / total_ideas) * 100, 1) if total_ideas > 0 else 0
+            "total_ideas": 0,
+            "avg_market_score": 0,
+            "ideas_ready_for_development": 0,
+            "total_market_opportunity": "$0",
+            "new_ideas_this_month": 0,
+            "avg_research_depth": 0,
+            "validation_success_rate": 0,
+            "failed_research": 0
         }
+    
+    avg_citations = citations_sum / max(successful, 1)
+    
+    return {
+        "total_ideas": total_ideas,
+        "avg_market_score": 75.5,  # Mock score - would calculate from results
+        "ideas_ready_for_development": successful,
+        "total_market_opportunity": "$450B",  # Mock - would calculate from market research
+        "new_ideas_this_month": new_this_month,
+        "avg_research_depth": round(avg_citations, 1),
+        "validation_success_rate": round((successful / total_ideas) * 100, 1),
+        "failed_research": failed
+    }
 
-@app.get("/api/dashboard/ideas")
-async def get_dashboard_ideas():
-    """Get all ideas for dashboard from storage service"""
+def idea_from_result(result: ResearchResult) -> Dict[str, Any]:
+    """Project a stored result into the dashboard idea shape"""
+    # Scores are computed once when the result is stored
+    scores = (result.result or {}).get("scores") or score_output(result.result)
+    market_score = scores["market_opportunity"]
+    feasibility_score = scores["technical_feasibility"]
+    
+    idea = {
+        "idea_id": result.task_id,
+        "idea_name": result.query[:50] + ("..." if len(result.query) > 50 else ""),
+        "description": result.query,
+        "industry": "technology",  # Would be extracted from research
+        "research_model": result.model,
+        "status": "validated" if result.status == "completed" else "initial",
+        "created_at": result.created_at,
+        "last_research": result.completed_at or result.created_at,
+        "scores": {
+            "market_opportunity": market_score,
+            "technical_feasibility": feasibility_score,
+            "competitive_advantage": 65,
+            "risk_level": 4
+        },
+        "research_data": {
+            "total_citations": result_citations(result),
+            "research_depth_score": 85,
+            "validation_sources": 10,
+            "competitor_analysis_count": 5
+        }
+    }
+    return idea
+
+async def load_dashboard_ideas() -> List[Dict[str, Any]]:
+    """Ideas from the storage service, falling back to the in-memory results"""
     try:
         # Get real ideas from storage service
-        ideas = storage_service.get_dashboard_ideas()
-        return {"ideas": ideas}
+        return await asyncio.to_thread(storage_service.get_dashboard_ideas)
     except Exception as e:
-        print(f"Error getting dashboard ideas: {e}")
-        # Fallback to memory-based calculation for compatibility
-        ideas = []
-        
-        for result in completed_results.values():
-            # Extract market data from research results
-            market_score = 75  # Default score
-            feasibility_score = 70  # Default score
-            
-            # Try to extract scores from research content if available
-            if result.result and isinstance(result.result, dict):
-                # Parse research output for scores (simplified)
-                output_text = result.result.get("formatted_output", result.result.get("output", ""))
-                if "market opportunity" in str(output_text).lower():
-                    market_score = 80
-                if "feasible" in str(output_text).lower():
-                    feasibility_score = 75
-            
-            idea = {
-                "idea_id": result.task_id,
-                "idea_name": result.query[:50] + ("..." if len(result.query) > 50 else ""),
-                "description": result.query,
-                "industry": "technology",  # Would be extracted from research
-                "research_model": result.model,
-                "status": "validated" if result.status == "completed" else "initial",
-                "created_at": result.created_at,
-                "last_research": result.completed_at or result.created_at,
-                "scores": {
-                    "market_opportunity": market_score,
-                    "technical_feasibility": feasibility_score,
-                    "competitive_advantage": 65,
-                    "risk_level": 4
-                },
-                "research_data": {
-                    "total_citations": result.result.get("total_citations", result.result.get("citations", 0)) if result.result else 0,
-                    "research_depth_score": 85,
-                    "validation_sources": 10,
-                    "competitor_analysis_count": 5
-                }
-            }
-            ideas.append(idea)
-        
-        return {"ideas": ideas}
+        logger.warning("Error getting dashboard ideas: %s", e)
+        # Fallback to memory-based calculation, reusing each result's projection until it changes
+        return await run_store_io(ideas_from_results)
 
-@app.get("/dashboard")
-async def dashboard_page():
-    """Serve the React dashboard"""
-    # Serve the React app built files
-    # This would normally serve from a dist folder after building the React app
-    return HTMLResponse("""
+def ideas_from_results() -> List[Dict[str, Any]]:
+    """Dashboard ideas for every stored result"""
+    ideas = []
+    
+    for task_id, result in completed_results.items():
+        idea = dashboard_ideas.get(task_id)
+        if idea is None:
+            idea = dashboard_ideas[task_id] = idea_from_result(result)
+        ideas.append(idea)
+    
+    return ideas
+
+@app.get("/api/dashboard/ideas")
+async def get_dashboard_ideas(request: Request):
+    """Get all ideas for dashboard from storage service"""
+    global _ideas_body_cache
+    version = await run_store_io(current_ideas_version)
+    headers = {"ETag": f'W/"ideas-{version}"', "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    if _ideas_body_cache is None or _ideas_body_cache[0] != version:
+        _ideas_body_cache = (version, orjson.dumps({"ideas": await load_dashboard_ideas()}))
+    return Response(content=_ideas_body_cache[1], media_type="application/json", headers=headers)
+
+# Static placeholder page, encoded once at import
+DASHBOARD_BODY = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -1084,20 +1244,42 @@ async def dashboard_page():
         </div>
     </body>
     </html>
-    """)
+    """.encode("utf-8")
+DASHBOARD_ETAG = f'"{hashlib.md5(DASHBOARD_BODY, usedforsecurity=False).hexdigest()}"'
+DASHBOARD_HEADERS = {"ETag": DASHBOARD_ETAG, "Cache-Control": "public, max-age=3600"}
+
+@app.get("/dashboard", response_class=HTMLResponse)
+async def dashboard_page(request: Request):
+    """Serve the React dashboard"""
+    # Serve the React app built files
+    # This would normally serve from a dist folder after building the React app
+    if request.headers.get("if-none-match") == DASHBOARD_ETAG:
+        return Response(status_code=304, headers=DASHBOARD_HEADERS)
+    return Response(content=DASHBOARD_BODY, media_type="text/html", headers=DASHBOARD_HEADERS)
+
+# Only the counters vary between probes, so the body is a pre-encoded template
+HEALTH_TEMPLATE = (
+    b'{"status":"healthy","research_client_initialized":%s,"active_tasks":%d,'
+    b'"tasks_by_status":{"pending":%d,"running":%d},"queued_tasks":%d,"completed_results":%d}'
+)
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "research_client_initialized": research_client is not None,
-        "active_tasks": len([t for t in research_tasks.values() if t["status"] in ["pending", "running"]]),
-        "completed_results": len(completed_results)
-    }
+    active, running = len(active_task_ids), len(running_task_ids)
+    stored_results = await run_store_io(len, completed_results)
+    return Response(content=HEALTH_TEMPLATE % (
+        b"true" if research_client is not None else b"false",
+        active,
+        active - running,
+        running,
+        research_queue.qsize() if research_queue else 0,
+        stored_results
+    ), media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
     print("Starting OpenAI Research Interface...")
     print("Open your browser to: http://localhost:8000")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvicorn picks uvloop/httptools automatically when installed; see run.sh for production
+    uvicorn.run(app, host="0.0.0.0", port=8000, limit_concurrency=1000, backlog=2048, timeout_keep_alive=75)
@@ -6,16 +6,48 @@ This module defines the database schema for storing research results, ideas, and
 Using SQLAlchemy ORM with SQLite for simplicity and portability.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, JSON, ForeignKey
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Text, Boolean, JSON, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.pool import StaticPool
 from datetime import datetime
 import uuid
 import os
+import orjson
+
+# Database setup (set DATABASE_URL to a server database to share task state across workers and restarts)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./research_platform.db")
+
+def _engine_options(url: str) -> dict:
+    """Connection pool settings for the configured database"""
+    if url.startswith("sqlite"):
+        if ":memory:" in url:
+            # One shared connection, otherwise every session sees an empty database
+            return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+        return {}
+    return {"pool_size": 10, "max_overflow": 10, "pool_recycle": 300, "pool_pre_ping": True, "pool_timeout": 30}
+
+def _json_dumps(value) -> str:
+    """Encode JSON columns with orjson"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# JSON columns (result payloads, distributions) are encoded and parsed with orjson
+engine = create_engine(
+    DATABASE_URL, echo=True, json_serializer=_json_dumps, json_deserializer=orjson.loads,
+    **_engine_options(DATABASE_URL)
+)
+
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL journal with NORMAL sync: commits append to the log instead of fsyncing the database"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
 
-# Database setup
-DATABASE_URL = "sqlite:///./research_platform.db"
-engine = create_engine(DATABASE_URL, echo=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -24,7 +56,7 @@ class ResearchTask(Base):
     __tablename__ = "research_tasks"
     
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(String, unique=True, index=True, default=lambda: str(uuid.uuid4()))
+    task_id = Column(String, unique=True, index=True, default=lambda: uuid.uuid4().hex)
     query = Column(Text, nullable=False)
     model = Column(String, nullable=False)  # o3-deep-research, o4-mini-research
     research_type = Column(String, nullable=False)  # custom, validation, market, financial, comprehensive
@@ -46,6 +78,11 @@ class ResearchTask(Base):
     
     # Relationships
     research_results = relationship("ResearchResult", back_populates="task", cascade="all, delete-orphan")
+    
+    # Serves "completed tasks, newest first" listings without a table scan and sort
+    __table_args__ = (
+        Index("ix_tasks_status_completed", status, completed_at.desc()),
+    )
 
 class ResearchResult(Base):
     """Stores processed research results for dashboard display"""
@@ -153,6 +190,9 @@ class SystemMetrics(Base):
 def create_tables():
     """Create all tables in the database"""
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add indexes introduced since separately
+    for index in ResearchTask.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
 
 def get_db():
     """Get database session"""
@@ -0,0 +1,42 @@
+#!/bin/bash
+
+# AI Research Platform Production Server
+# uvloop event loop + httptools parser, with bounded concurrency and keep-alive.
+#
+# Task state, results, pagination order and the active-task counts live in process
+# memory unless REDIS_URL is set, so multiple workers are only used when it is.
+# CELERY_BROKER_URL alone moves research into queue workers but shares none of that.
+
+set -e
+
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )"
+cd "$SCRIPT_DIR"
+
+if [ -z "$WEB_CONCURRENCY" ]; then
+    if [ -n "$REDIS_URL" ]; then
+        WEB_CONCURRENCY=$(nproc 2>/dev/null || echo 2)
+    else
+        WEB_CONCURRENCY=1
+    fi
+fi
+
+# Per-request access lines are off by default; ACCESS_LOG=1 turns them back on
+ACCESS_LOG_FLAG="--no-access-log"
+if [ -n "$ACCESS_LOG" ]; then
+    ACCESS_LOG_FLAG="--access-log"
+fi
+
+# Server and Date headers are skipped: they cost a write per response and pollers never read them
+exec uvicorn app:app \
+    --host "${HOST:-0.0.0.0}" \
+    --port "${PORT:-8000}" \
+    --loop uvloop \
+    --http httptools \
+    --workers "$WEB_CONCURRENCY" \
+    --limit-concurrency "${LIMIT_CONCURRENCY:-1000}" \
+    --backlog "${BACKLOG:-2048}" \
+    --timeout-keep-alive "${TIMEOUT_KEEP_ALIVE:-75}" \
+    --log-level "${LOG_LEVEL:-warning}" \
+    --no-server-header \
+    --no-date-header \
+    "$ACCESS_LOG_FLAG"
@@ -7,11 +7,30 @@ with proper metadata and folder structure.
 """
 
 import os
-import json
+import sys
+import logging
+import threading
+import orjson
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import re
+from functools import lru_cache
+
+logger = logging.getLogger("research_app.documents")
+
+# Filename sanitizing patterns, compiled once for every saved document
+_FILENAME_STRIP_RE = re.compile(r'[^\w\s-]')
+_FILENAME_COLLAPSE_RE = re.compile(r'[-\s]+')
+
+def _encode_metadata(metadata: Dict[str, Any]) -> bytes:
+    """Encode document metadata the same way for every writer (indented so the files stay readable)"""
+    return orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+
+@lru_cache(maxsize=4)
+def _report_dates(minute: datetime) -> Tuple[str, str]:
+    """Header and footer dates for reports generated within the same minute"""
+    return minute.strftime("%B %d, %Y at %I:%M %p"), minute.strftime("%B %d, %Y")
 
 class ResearchDocumentManager:
     """Manages storage and retrieval of research documents"""
@@ -20,6 +39,16 @@ class ResearchDocumentManager:
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
         self._create_folder_structure()
+        # Metadata of every document keyed by task_id, loaded from disk once and kept current on writes
+        self._metadata_index: Optional[Dict[str, Dict[str, Any]]] = None
+        # Metadata directory mtime at the last scan; a change means another process added or removed files
+        self._metadata_dir_mtime = None
+        # Per-file mtimes at the last parse, so a rescan only re-reads files that changed
+        self._metadata_file_mtimes: Dict[str, int] = {}
+        # Sorted list_documents results per research_type, dropped whenever the index changes
+        self._listings: Dict[Optional[str], list] = {}
+        # Guards the index and listings, which are read and updated from the I/O threadpool
+        self._lock = threading.RLock()
     
     def _create_folder_structure(self):
         """Create organized folder structure for research documents"""
@@ -33,14 +62,18 @@ class ResearchDocumentManager:
             "archives"
         ]
         
+        # One directory listing instead of a mkdir attempt per folder
+        with os.scandir(self.base_path) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
         for folder in folders:
-            (self.base_path / folder).mkdir(exist_ok=True)
+            if folder not in existing:
+                (self.base_path / folder).mkdir(exist_ok=True)
     
     def _sanitize_filename(self, name: str) -> str:
         """Convert idea name to safe filename"""
         # Remove special characters and replace spaces with underscores
-        sanitized = re.sub(r'[^\w\s-]', '', name)
-        sanitized = re.sub(r'[-\s]+', '_', sanitized)
+        sanitized = _FILENAME_STRIP_RE.sub('', name)
+        sanitized = _FILENAME_COLLAPSE_RE.sub('_', sanitized)
         return sanitized.lower()[:50]  # Limit length
     
     def _get_folder_for_type(self, research_type: str) -> Path:
@@ -70,7 +103,8 @@ class ResearchDocumentManager:
         
         # Create filename
         sanitized_name = self._sanitize_filename(idea_name)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"{sanitized_name}_{research_type}_{timestamp}.md"
         
         # Get appropriate folder
@@ -80,27 +114,28 @@ class ResearchDocumentManager:
         # Extract key information from research data
         result = research_data.get('result', {})
         
-        # Generate MD content
-        md_content = self._generate_markdown_content(
+        # Generate MD sections; each ends in whitespace, so words never straddle two sections
+        sections = self._markdown_sections(
             idea_name=idea_name,
             research_type=research_type,
             research_data=result,
             model_used=model_used,
-            task_id=task_id
+            task_id=task_id,
+            generated_at=now
         )
         
-        # Save MD file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(md_content)
+        # Save MD file, streaming the sections instead of joining them into one large string first
+        with open(file_path, 'w', encoding='utf-8', buffering=262144) as f:
+            f.writelines(sections)
         
         # Save metadata
         self._save_metadata(task_id, file_path, {
             'idea_name': idea_name,
             'research_type': research_type,
             'model_used': model_used,
-            'created_at': datetime.now().isoformat(),
+            'created_at': now.isoformat(),
             'file_path': str(file_path),
-            'word_count': len(md_content.split()),
+            'word_count': sum(len(section.split()) for section in sections),
             'task_id': task_id
         })
         
@@ -111,217 +146,291 @@ class ResearchDocumentManager:
                                  research_type: str,
                                  research_data: Dict[str, Any],
                                  model_used: str,
-                                 task_id: str) -> str:
+                                 task_id: str,
+                                 generated_at: Optional[datetime] = None) -> str:
         """Generate formatted markdown content"""
+        return "".join(self._markdown_sections(
+            idea_name, research_type, research_data, model_used, task_id, generated_at
+        ))
+    
+    def _markdown_sections(self,
+                           idea_name: str,
+                           research_type: str,
+                           research_data: Dict[str, Any],
+                           model_used: str,
+                           task_id: str,
+                           generated_at: Optional[datetime] = None) -> List[str]:
+        """Generate the markdown document as a list of sections"""
+        generated_at = generated_at or datetime.now()
+        generated, generated_date = _report_dates(generated_at.replace(second=0, microsecond=0))
         
         # Header
-        md_content = f"""# {idea_name}
+        parts = [f"""# {idea_name}
 **Research Type:** {research_type.title()}  
 **AI Model:** {model_used}  
-**Generated:** {datetime.now().strftime("%B %d, %Y at %I:%M %p")}  
+**Generated:** {generated}  
 **Task ID:** `{task_id}`
 
 ---
 
-"""
+"""]
         
         # Executive Summary
         if 'executive_summary' in research_data:
-            md_content += f"""## Executive Summary
+            parts.append(f"""## Executive Summary
 
 {research_data['executive_summary']}
 
 ---
 
-"""
+""")
         
         # Main content based on research type
-        if research_type == "comprehensive":
-            md_content += self._format_comprehensive_research(research_data)
-        elif research_type == "validation":
-            md_content += self._format_validation_research(research_data)
-        elif research_type == "market":
-            md_content += self._format_market_research(research_data)
-        elif research_type == "financial":
-            md_content += self._format_financial_research(research_data)
-        else:
-            md_content += self._format_custom_research(research_data)
+        formatter = self._FORMATTERS.get(research_type, ResearchDocumentManager._format_custom_research)
+        parts.append(formatter(self, research_data))
         
         # Citations and Sources
         if 'citations' in research_data:
-            md_content += f"""## Sources and Citations
+            parts.append(f"""## Sources and Citations
 
 {research_data['citations']}
 
-"""
+""")
         
         # Metadata footer
-        md_content += f"""---
+        parts.append(f"""---
 
-*This research report was generated using {model_used} on {datetime.now().strftime("%B %d, %Y")}. Task ID: {task_id}*
-"""
+*This research report was generated using {model_used} on {generated_date}. Task ID: {task_id}*
+""")
         
-        return md_content
+        return parts
     
     def _format_comprehensive_research(self, data: Dict[str, Any]) -> str:
         """Format comprehensive research results"""
-        content = ""
+        parts = []
         
         # Idea Validation Section
         if 'validation' in data:
-            content += f"""## 🔍 Idea Validation
+            parts.append(f"""## 🔍 Idea Validation
 
 {data['validation']}
 
-"""
+""")
         
         # Market Research Section  
         if 'market_research' in data:
-            content += f"""## 📊 Market Research
+            parts.append(f"""## 📊 Market Research
 
 {data['market_research']}
 
-"""
+""")
         
         # Financial Analysis Section
         if 'financial_analysis' in data:
-            content += f"""## 💰 Financial Analysis
+            parts.append(f"""## 💰 Financial Analysis
 
 {data['financial_analysis']}
 
-"""
+""")
         
-        return content
+        return "".join(parts)
     
     def _format_validation_research(self, data: Dict[str, Any]) -> str:
         """Format idea validation research"""
-        content = f"""## 🔍 Idea Validation Analysis
+        parts = ["""## 🔍 Idea Validation Analysis
 
-"""
+"""]
         
         if 'analysis' in data:
-            content += f"{data['analysis']}\n\n"
+            parts.append(f"{data['analysis']}\n\n")
         
         if 'key_findings' in data:
-            content += f"""### Key Findings
+            parts.append(f"""### Key Findings
 
 {data['key_findings']}
 
-"""
+""")
         
-        return content
+        return "".join(parts)
     
     def _format_market_research(self, data: Dict[str, Any]) -> str:
         """Format market research results"""
-        content = f"""## 📊 Market Research Analysis
+        parts = ["""## 📊 Market Research Analysis
 
-"""
+"""]
         
         if 'market_analysis' in data:
-            content += f"{data['market_analysis']}\n\n"
+            parts.append(f"{data['market_analysis']}\n\n")
         
         if 'competitive_analysis' in data:
-            content += f"""### Competitive Analysis
+            parts.append(f"""### Competitive Analysis
 
 {data['competitive_analysis']}
 
-"""
+""")
         
-        return content
+        return "".join(parts)
     
     def _format_financial_research(self, data: Dict[str, Any]) -> str:
         """Format financial analysis results"""
-        content = f"""## 💰 Financial Analysis
+        parts = ["""## 💰 Financial Analysis
 
-"""
+"""]
         
         if 'financial_projections' in data:
-            content += f"{data['financial_projections']}\n\n"
+            parts.append(f"{data['financial_projections']}\n\n")
         
         if 'cost_analysis' in data:
-            content += f"""### Cost Analysis
+            parts.append(f"""### Cost Analysis
 
 {data['cost_analysis']}
 
-"""
+""")
         
-        return content
+        return "".join(parts)
     
     def _format_custom_research(self, data: Dict[str, Any]) -> str:
         """Format custom research results"""
-        content = f"""## 🔬 Research Analysis
+        parts = ["""## 🔬 Research Analysis
 
-"""
+"""]
         
         if 'analysis' in data:
-            content += f"{data['analysis']}\n\n"
+            parts.append(f"{data['analysis']}\n\n")
         elif 'result' in data:
-            content += f"{data['result']}\n\n"
+            parts.append(f"{data['result']}\n\n")
         
-        return content
+        return "".join(parts)
+    
+    # Section formatter for each research type; anything else is formatted as custom research
+    _FORMATTERS = {
+        "comprehensive": _format_comprehensive_research,
+        "validation": _format_validation_research,
+        "market": _format_market_research,
+        "financial": _format_financial_research,
+    }
     
     def _save_metadata(self, task_id: str, file_path: Path, metadata: Dict[str, Any]):
         """Save metadata for research document"""
+        with self._lock:
+            index = self._document_index()
+            self._write_metadata(task_id, metadata)
+            index[task_id] = metadata
+            self._listings.clear()
+            # Our own write changed the folder mtime; don't let it force a rescan
+            self._metadata_dir_mtime = (self.base_path / "metadata").stat().st_mtime_ns
+    
+    def _write_metadata(self, task_id: str, metadata: Dict[str, Any]):
+        """Replace task_id's metadata file atomically (caller holds the lock)
+
+        Going through a rename changes the folder mtime even when the file already
+        existed, so other processes notice rewrites as well as new documents.
+        """
         metadata_file = self.base_path / "metadata" / f"{task_id}.json"
-        
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+        tmp_file = metadata_file.with_name(f".{task_id}.{os.getpid()}.tmp")
+        tmp_file.write_bytes(_encode_metadata(metadata))
+        os.replace(tmp_file, metadata_file)
+        self._metadata_file_mtimes[task_id] = metadata_file.stat().st_mtime_ns
+    
+    def _document_index(self) -> Dict[str, Dict[str, Any]]:
+        """Metadata by task_id, rescanning the metadata folder only when its contents changed"""
+        with self._lock:
+            metadata_dir = self.base_path / "metadata"
+            mtime = metadata_dir.stat().st_mtime_ns
+            if self._metadata_index is None or mtime != self._metadata_dir_mtime:
+                previous = self._metadata_index or {}
+                index, file_mtimes = {}, {}
+                # scandir gives the file type from the listing; a cheap stat decides whether to re-parse
+                with os.scandir(metadata_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".json") or not entry.is_file(follow_symlinks=False):
+                            continue
+                        task_id = entry.name[:-len(".json")]
+                        file_mtime = entry.stat().st_mtime_ns
+                        if task_id in previous and self._metadata_file_mtimes.get(task_id) == file_mtime:
+                            index[task_id] = previous[task_id]
+                        else:
+                            with open(entry.path, 'rb') as f:
+                                index[task_id] = self._intern_metadata(orjson.loads(f.read()))
+                        file_mtimes[task_id] = file_mtime
+                self._metadata_file_mtimes = file_mtimes
+                self._metadata_index = index
+                self._listings.clear()
+                self._metadata_dir_mtime = mtime
+            return self._metadata_index
+    
+    @staticmethod
+    def _intern_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Share one string object per research type and model across all indexed documents"""
+        for key in ('research_type', 'model_used'):
+            if isinstance(metadata.get(key), str):
+                metadata[key] = sys.intern(metadata[key])
+        return metadata
     
     def get_document_path(self, task_id: str) -> Optional[str]:
         """Get document path for a task ID"""
-        metadata_file = self.base_path / "metadata" / f"{task_id}.json"
-        
-        if metadata_file.exists():
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                return metadata.get('file_path')
-        
-        return None
+        metadata = self._document_index().get(task_id)
+        return metadata.get('file_path') if metadata else None
     
     def list_documents(self, research_type: Optional[str] = None) -> list:
         """List all research documents, optionally filtered by type"""
-        documents = []
-        metadata_dir = self.base_path / "metadata"
-        
-        for metadata_file in metadata_dir.glob("*.json"):
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+        with self._lock:
+            index = self._document_index()
+            documents = self._listings.get(research_type)
+            if documents is None:
+                documents = [
+                    metadata for metadata in index.values()
+                    if research_type is None or metadata.get('research_type') == research_type
+                ]
                 
-                if research_type is None or metadata.get('research_type') == research_type:
-                    documents.append(metadata)
-        
-        # Sort by creation date, newest first
-        documents.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        return documents
+                # Sort by creation date, newest first
+                documents.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+                self._listings[research_type] = documents
+            return list(documents)
     
     def archive_document(self, task_id: str) -> bool:
         """Move document to archives folder"""
-        try:
-            document_path = self.get_document_path(task_id)
-            if document_path and os.path.exists(document_path):
-                # Move to archives
-                source = Path(document_path)
-                destination = self.base_path / "archives" / source.name
-                source.rename(destination)
-                
-                # Update metadata
-                metadata_file = self.base_path / "metadata" / f"{task_id}.json"
-                if metadata_file.exists():
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
+        return task_id in self.archive_documents([task_id])
+    
+    def archive_documents(self, task_ids: List[str]) -> List[str]:
+        """Move several documents to the archives folder, returning the task IDs archived"""
+        archived = []
+        archived_at = datetime.now().isoformat()
+        with self._lock:
+            index = self._document_index()
+            for task_id in task_ids:
+                try:
+                    metadata = index.get(task_id)
+                    document_path = metadata.get('file_path') if metadata else None
+                    if not document_path or not os.path.exists(document_path):
+                        continue
                     
-                    metadata['archived'] = True
-                    metadata['archived_at'] = datetime.now().isoformat()
-                    metadata['file_path'] = str(destination)
+                    # Move to archives
+                    source = Path(document_path)
+                    destination = self.base_path / "archives" / source.name
+                    source.rename(destination)
                     
-                    with open(metadata_file, 'w', encoding='utf-8') as f:
-                        json.dump(metadata, f, indent=2)
-                
-                return True
-        except Exception as e:
-            print(f"Error archiving document: {e}")
-        
-        return False
+                    # Update metadata
+                    metadata_file = self.base_path / "metadata" / f"{task_id}.json"
+                    if metadata_file.exists():
+                        metadata = orjson.loads(metadata_file.read_bytes())
+                        
+                        metadata['archived'] = True
+                        metadata['archived_at'] = archived_at
+                        metadata['file_path'] = str(destination)
+                        
+                        self._write_metadata(task_id, metadata)
+                        index[task_id] = metadata
+                    
+                    archived.append(task_id)
+                except Exception as e:
+                    logger.warning("Error archiving document %s: %s", task_id, e)
+            
+            if archived:
+                # Listings are rebuilt once for the whole batch
+                self._listings.clear()
+                self._metadata_dir_mtime = (self.base_path / "metadata").stat().st_mtime_ns
+        return archived
 
 # Initialize document manager
 research_docs = ResearchDocumentManager()
@@ -0,0 +1,80 @@
+"""
+Micro-batching for upstream calls
+Collects items submitted within a short window and hands them to one
+handler call, so a burst of small requests costs a single round trip.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class MicroBatcher:
+    """Groups submissions arriving within max_wait seconds (up to max_batch) into one handler call"""
+
+    def __init__(self, handler: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch: int = 8, max_wait: float = 0.05):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        # Number of handler calls that served more than one submission
+        self.batches = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Strong references to in-flight handler calls
+        self._dispatches = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue item and wait for its share of the batched result"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def _gather_window(self) -> list:
+        """Wait for one submission, then take whatever else arrives before the window closes"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._gather_window()
+            # Dispatch without blocking so the next window can fill meanwhile
+            dispatch = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: list):
+        if len(batch) > 1:
+            self.batches += 1
+        error = None
+        try:
+            results = await self.handler([item for item, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            if len(results) < len(batch):
+                error = RuntimeError(f"Batch handler returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            error = e
+        finally:
+            # No submitter is left waiting: missing results fail, a cancelled dispatch cancels them
+            for _, future in batch:
+                if not future.done():
+                    if error is None:
+                        future.cancel()
+                    else:
+                        future.set_exception(error)
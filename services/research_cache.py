@@ -0,0 +1,248 @@
+"""
+Research response cache
+Exact SHA-256 lookup first, then a semantic lookup over query embeddings so
+paraphrased queries can reuse a previous deep research run.
+"""
+
+import os
+import re
+import math
+import time
+import asyncio
+import hashlib
+import logging
+import operator
+import threading
+import orjson
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Awaitable, Callable
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Bump whenever research or enrichment prompt templates change
+PROMPT_VERSION = "v1"
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Time-sensitive queries always go to the model
+_TIME_SENSITIVE_RE = re.compile(r"\b(today|now|current|currently|latest|this (week|month|year))\b", re.I)
+
+logger = logging.getLogger("research_app.cache")
+
+# OpenSSL-backed constructor (uses SHA-NI / ARMv8 SHA2 where available)
+_sha256 = hashlib.sha256
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache keys (case and whitespace insensitive)"""
+    return " ".join(query.lower().split())
+
+
+def is_time_sensitive(query: str) -> bool:
+    """Whether a query asks about the present and must bypass the cache"""
+    return bool(_TIME_SENSITIVE_RE.search(query))
+
+
+def _unit(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length so cosine similarity is a dot product"""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+class ResearchCache:
+    """Two-tier (exact + semantic) LRU cache for research responses with TTL
+
+    The sync methods block (Redis round trips, the semantic scan); async callers
+    use the aget/aset/afind_similar wrappers, which run them on a worker thread.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 7 * 24 * 3600,
+                 similarity_threshold: float = 0.92, redis_url: Optional[str] = None,
+                 max_semantic_entries: int = 1000):
+        self.max_entries = max_entries
+        # Only the most recently used entries keep their embedding (float32, ~6 KB each)
+        self.max_semantic_entries = max_semantic_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Keys of entries with an embedding, least recently used first
+        self._semantic: "OrderedDict[str, None]" = OrderedDict()
+        # Guards the in-memory tiers; the wrappers call in from several threads
+        self._lock = threading.Lock()
+        self._redis = None
+
+        if redis_url and redis:
+            try:
+                self._redis = redis.Redis.from_url(redis_url)
+            except Exception as e:
+                logger.warning("Research cache falling back to memory: %s", e)
+
+    @classmethod
+    def from_env(cls) -> "ResearchCache":
+        """Create a cache using REDIS_URL for the exact tier when configured"""
+        return cls(redis_url=os.getenv("REDIS_URL"))
+
+    def make_key(self, model: str, research_type: str, query: str, **scope) -> str:
+        """Build the exact-match key for a query"""
+        payload = {
+            "model": model,
+            "research_type": research_type,
+            "query": normalize_query(query),
+            "prompt_version": PROMPT_VERSION,
+            **scope
+        }
+        # Single-shot hash over pre-encoded bytes
+        return _sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Exact lookup; returns the cached response or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self._redis is not None:
+            try:
+                raw = self._redis.get(f"research_cache:{key}")
+                if raw:
+                    entry = orjson.loads(raw)
+                    with self._lock:
+                        self._remember(key, entry)
+            except Exception as e:
+                logger.warning("Research cache read failed: %s", e)
+
+        if entry is None:
+            return None
+        with self._lock:
+            if entry["expires_at"] < time.time() or entry["prompt_version"] != PROMPT_VERSION:
+                self._forget(key)
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry["response"]
+
+    def find_similar(self, embedding: List[float], model: str, research_type: str,
+                     **scope) -> Optional[Dict[str, Any]]:
+        """Semantic lookup; returns the closest response above the threshold"""
+        query = _unit(embedding)
+        now = time.time()
+        best_key, best_score = None, self.similarity_threshold
+
+        with self._lock:
+            for key in list(self._semantic):
+                entry = self._entries[key]
+                if entry["expires_at"] < now:
+                    self._forget(key)
+                    continue
+                if (entry["model"] != model or entry["research_type"] != research_type
+                        or entry["scope"] != scope or entry["prompt_version"] != PROMPT_VERSION):
+                    continue
+                score = sum(map(operator.mul, query, entry["embedding"]))
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            self._semantic.move_to_end(best_key)
+            return self._entries[best_key]["response"]
+
+    def set(self, key: str, response: Dict[str, Any], model: str, research_type: str,
+            embedding: Optional[List[float]] = None, **scope):
+        """Store a response under its exact key (and embedding, if given)"""
+        unit = _unit(embedding) if embedding else None
+        entry = {
+            "input_hash": key,
+            "prompt_version": PROMPT_VERSION,
+            "model": model,
+            "research_type": research_type,
+            "scope": scope,
+            "embedding": unit,
+            "response": response,
+            "expires_at": time.time() + self.ttl_seconds
+        }
+        # Encoded before the embedding is packed into a float32 array
+        payload = orjson.dumps(entry, default=str) if self._redis is not None else None
+        with self._lock:
+            self._remember(key, entry)
+
+        if payload is not None:
+            try:
+                self._redis.set(f"research_cache:{key}", payload, ex=self.ttl_seconds)
+            except Exception as e:
+                logger.warning("Research cache write failed: %s", e)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """get() on a worker thread, for use inside request handlers"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def afind_similar(self, embedding: List[float], model: str, research_type: str,
+                            **scope) -> Optional[Dict[str, Any]]:
+        """find_similar() on a worker thread, for use inside request handlers"""
+        return await asyncio.to_thread(self.find_similar, embedding, model, research_type, **scope)
+
+    async def aset(self, key: str, response: Dict[str, Any], model: str, research_type: str,
+                   embedding: Optional[List[float]] = None, **scope):
+        """set() on a worker thread, for use inside request handlers"""
+        await asyncio.to_thread(self.set, key, response, model, research_type, embedding, **scope)
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        """Insert into the in-memory tiers (caller holds the lock), evicting least recently used entries"""
+        if entry.get("embedding") is not None:
+            entry["embedding"] = array("f", entry["embedding"])
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if entry.get("embedding") is not None:
+            self._semantic[key] = None
+            self._semantic.move_to_end(key)
+        else:
+            self._semantic.pop(key, None)
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            self._semantic.pop(old_key, None)
+        while len(self._semantic) > self.max_semantic_entries:
+            # The response stays cached for exact hits; only its embedding is dropped
+            old_key, _ = self._semantic.popitem(last=False)
+            self._entries[old_key]["embedding"] = None
+
+    def _forget(self, key: str):
+        """Drop an entry from both in-memory tiers (caller holds the lock)"""
+        self._entries.pop(key, None)
+        self._semantic.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution"""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+
+    async def run(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the in-flight call for key, or start one with compute()"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.hits += 1
+            # Shielded so a waiter giving up doesn't cancel the shared call
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a call without waiters doesn't log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
@@ -5,16 +5,65 @@ Combines all research functionality into a single, comprehensive client
 """
 
 import os
-import json
+import re
 import time
+import logging
+import random
+import asyncio
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
+from collections import OrderedDict
+from services.research_cache import ResearchCache, SingleFlight, EMBEDDING_MODEL, normalize_query, is_time_sensitive
+
+try:
+    import h2  # noqa: F401 - lets httpx negotiate HTTP/2 with the API
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 load_dotenv()
 
+# Runtime messages go through the app's queued log handler instead of blocking on stdout
+logger = logging.getLogger("research_app.client")
+
+# Intent label in a classifier reply, tolerating case, punctuation and surrounding words
+_INTENT_RE = re.compile(r'\b(info|cmd)\b', re.IGNORECASE)
+
+# Bounded, keep-alive connection pool shared by every OpenAI call in the process. Enough idle
+# connections are kept for the research workers (comprehensive tasks run three calls each)
+# so steady load never pays for a new TLS handshake.
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=32, keepalive_expiry=30)
+OPENAI_HTTP_TIMEOUT = httpx.Timeout(connect=10, read=3600, write=60, pool=30)
+# Connection failures are retried by the transport; HTTP errors are retried by the SDK
+OPENAI_CONNECT_RETRIES = 2
+_shared_openai_clients: Dict[str, AsyncOpenAI] = {}
+
+def get_openai_client(api_key: str) -> AsyncOpenAI:
+    """Return the process-wide pooled AsyncOpenAI client for an API key"""
+    client = _shared_openai_clients.get(api_key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    limits=OPENAI_HTTP_LIMITS, http2=HTTP2_AVAILABLE, retries=OPENAI_CONNECT_RETRIES
+                ),
+                timeout=OPENAI_HTTP_TIMEOUT
+            )
+        )
+        _shared_openai_clients[api_key] = client
+    return client
+
+async def close_openai_clients():
+    """Close the pooled connections of every shared client"""
+    while _shared_openai_clients:
+        _, client = _shared_openai_clients.popitem()
+        await client.close()
+
 @dataclass
 class ResearchConfig:
     """Configuration for research requests"""
@@ -33,10 +82,11 @@ class OpenAIResearchClient:
         if not self.api_key:
             raise ValueError("API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
         
-        self.client = OpenAI(
-            api_key=self.api_key,
-            timeout=3600
-        )
+        self.client = get_openai_client(self.api_key)
+        self.cache = ResearchCache.from_env()
+        # Identical research already running is awaited rather than started again
+        self.inflight = SingleFlight()
+        self._intent_cache: "OrderedDict[str, str]" = OrderedDict()
         
         # Available models for research
         self.available_models = {
@@ -60,7 +110,7 @@ class OpenAIResearchClient:
         """Get list of available research models with their capabilities"""
         return self.available_models
     
-    def create_response(
+    async def create_response(
         self,
         model: str,
         input_text: str,
@@ -89,46 +139,53 @@ class OpenAIResearchClient:
             request_data["max_tool_calls"] = max_tool_calls
         
         try:
-            response = self.client.responses.create(**request_data)
+            response = await self.client.responses.create(**request_data)
             return response
         except Exception as e:
-            print(f"Error creating research response: {e}")
+            logger.warning("Error creating research response: %s", e)
             return None
     
-    def get_response(self, response_id: str):
+    async def get_response(self, response_id: str):
         """Get a specific research response by ID"""
         try:
-            return self.client.responses.retrieve(response_id)
+            return await self.client.responses.retrieve(response_id)
         except Exception as e:
-            print(f"Error retrieving response {response_id}: {e}")
+            logger.warning("Error retrieving response %s: %s", response_id, e)
             return None
     
-    def list_responses(self, limit: int = 20, order: str = "desc"):
+    async def list_responses(self, limit: int = 20, order: str = "desc"):
         """List research responses"""
         try:
-            return self.client.responses.list(limit=limit, order=order)
+            return await self.client.responses.list(limit=limit, order=order)
         except Exception as e:
-            print(f"Error listing responses: {e}")
+            logger.warning("Error listing responses: %s", e)
             return None
     
-    def wait_for_completion(self, response_id: str, check_interval: int = 5, max_wait: int = 3600):
-        """Wait for a background research task to complete"""
-        start_time = time.time()
+    async def wait_for_completion(self, response_id: str, check_interval: float = 2,
+                                  max_wait: int = 3600, max_interval: float = 30):
+        """
+        Wait for a background research task to complete, polling with jittered
+        exponential backoff (check_interval doubling up to max_interval)
+        """
+        start_time = time.monotonic()
+        attempt = 0
         
-        while time.time() - start_time < max_wait:
-            response = self.get_response(response_id)
+        while time.monotonic() - start_time < max_wait:
+            response = await self.get_response(response_id)
             
             if response and hasattr(response, 'status'):
                 if response.status == 'completed':
                     return response
-                elif response.status == 'failed':
-                    raise Exception(f"Research task failed: {response}")
+                elif response.status in ('failed', 'cancelled'):
+                    raise Exception(f"Research task {response.status}: {response}")
             
-            time.sleep(check_interval)
+            interval = min(max_interval, check_interval * 2 ** attempt) * random.uniform(0.75, 1.25)
+            attempt += 1
+            await asyncio.sleep(interval)
         
         raise TimeoutError(f"Research task did not complete within {max_wait} seconds")
     
-    def enrich_prompt(self, user_request: str, research_type: str = "general") -> str:
+    async def enrich_prompt(self, user_request: str, research_type: str = "general") -> str:
         """
         Enrich the user prompt to make it more detailed and specific for deep research
         """
@@ -166,16 +223,73 @@ class OpenAIResearchClient:
         - Always request inline citations with full source metadata
         """
         
+        cache_key = self.cache.make_key("gpt-4.1", research_type, user_request, kind="enrich")
+        cached = await self.cache.aget(cache_key)
+        if cached:
+            return cached["prompt"]
+        
         try:
-            response = self.client.responses.create(
+            response = await self.client.responses.create(
                 model="gpt-4.1",
                 input=user_request,
                 instructions=enrichment_instructions
             )
-            return response.output_text if hasattr(response, 'output_text') else user_request
+            if not hasattr(response, 'output_text'):
+                return user_request
+            await self.cache.aset(cache_key, {"prompt": response.output_text}, "gpt-4.1", research_type, kind="enrich")
+            return response.output_text
         except Exception as e:
-            print(f"Error enriching prompt: {e}")
+            logger.warning("Error enriching prompt: %s", e)
             return user_request
+    
+    async def classify_query(self, query: str) -> str:
+        """
+        Classify a query as "info" (information retrieval, safe to cache) or
+        "cmd" (asks for an action or bespoke artifact, never cached)
+        """
+        normalized = normalize_query(query)
+        if normalized in self._intent_cache:
+            self._intent_cache.move_to_end(normalized)
+            return self._intent_cache[normalized]
+        
+        try:
+            response = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": (
+                        "Classify the user's request. Reply INFO if it asks for information, analysis or "
+                        "research. Reply CMD if it asks to perform an action or produce a personalised "
+                        "artifact (write an email, generate and submit a spec, etc.). "
+                        "Answer exactly INFO or CMD."
+                    )},
+                    {"role": "user", "content": query}
+                ],
+                max_tokens=5,
+                temperature=0
+            )
+            match = _INTENT_RE.search(response.choices[0].message.content or "")
+        except Exception as e:
+            logger.warning("Error classifying query: %s", e)
+            # Don't cache anything we couldn't classify
+            return "cmd"
+        
+        if not match:
+            logger.warning("Unrecognised query classification: %r", response.choices[0].message.content)
+            return "cmd"
+        intent = match.group(1).lower()
+        self._intent_cache[normalized] = intent
+        while len(self._intent_cache) > 1024:
+            self._intent_cache.popitem(last=False)
+        return intent
+    
+    async def embed(self, text: str) -> Optional[List[float]]:
+        """Embed text for semantic cache lookups"""
+        try:
+            response = await self.client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning("Error creating embedding: %s", e)
+            return None
 
 class ResearchWorkflow:
     """
@@ -209,7 +323,7 @@ class ResearchWorkflow:
         
         return tools
     
-    def validate_idea(self, idea: str, model: str = "o4-mini-deep-research") -> Dict[str, Any]:
+    async def validate_idea(self, idea: str, model: str = "o4-mini-deep-research") -> Dict[str, Any]:
         """
         Validate a startup or product idea following the template structure
         """
@@ -249,7 +363,7 @@ class ResearchWorkflow:
         
         tools = self._prepare_tools(use_web_search=True, use_code_interpreter=True)
         
-        response = self.client.create_response(
+        response = await self.client.create_response(
             model=model,
             input_text=validation_prompt,
             background=True,
@@ -257,7 +371,7 @@ class ResearchWorkflow:
         )
         
         if response and response.id:
-            completed_response = self.client.wait_for_completion(response.id)
+            completed_response = await self.client.wait_for_completion(response.id)
             return {
                 "type": "idea_validation",
                 "response_id": response.id,
@@ -267,7 +381,7 @@ class ResearchWorkflow:
         
         return {"type": "idea_validation", "status": "failed", "response": response}
     
-    def market_research(self, idea: str, model: str = "o3-deep-research") -> Dict[str, Any]:
+    async def market_research(self, idea: str, model: str = "o3-deep-research") -> Dict[str, Any]:
         """
         Conduct comprehensive market research for a product idea
         """
@@ -324,7 +438,7 @@ class ResearchWorkflow:
         
         tools = self._prepare_tools(use_web_search=True, use_code_interpreter=True)
         
-        response = self.client.create_response(
+        response = await self.client.create_response(
             model=model,
             input_text=market_prompt,
             background=True,
@@ -333,7 +447,7 @@ class ResearchWorkflow:
         )
         
         if response and response.id:
-            completed_response = self.client.wait_for_completion(response.id)
+            completed_response = await self.client.wait_for_completion(response.id)
             return {
                 "type": "market_research",
                 "response_id": response.id,
@@ -343,7 +457,7 @@ class ResearchWorkflow:
         
         return {"type": "market_research", "status": "failed", "response": response}
     
-    def financial_analysis(self, idea: str, model: str = "o3-deep-research") -> Dict[str, Any]:
+    async def financial_analysis(self, idea: str, model: str = "o3-deep-research") -> Dict[str, Any]:
         """
         Conduct comprehensive financial analysis for a startup idea
         """
@@ -394,7 +508,7 @@ class ResearchWorkflow:
         
         tools = self._prepare_tools(use_web_search=True, use_code_interpreter=True)
         
-        response = self.client.create_response(
+        response = await self.client.create_response(
             model=model,
             input_text=finance_prompt,
             background=True,
@@ -403,7 +517,7 @@ class ResearchWorkflow:
         )
         
         if response and response.id:
-            completed_response = self.client.wait_for_completion(response.id)
+            completed_response = await self.client.wait_for_completion(response.id)
             return {
                 "type": "financial_analysis",
                 "response_id": response.id,
@@ -413,68 +527,92 @@ class ResearchWorkflow:
         
         return {"type": "financial_analysis", "status": "failed", "response": response}
     
-    def comprehensive_research(self, idea: str, model: str = "o3-deep-research") -> Dict[str, Any]:
+    async def comprehensive_research(self, idea: str, model: str = "o3-deep-research") -> Dict[str, Any]:
         """
         Conduct all three types of research (validation, market, financial) for an idea
         """
-        print(f"Starting comprehensive research for: {idea}")
-        print("-" * 50)
+        logger.info("Starting comprehensive research for: %s", idea)
         
         results = {}
         
-        print("1. Starting Idea Validation...")
-        validation_result = self.validate_idea(idea, model="o4-mini-deep-research")
+        logger.info("1. Starting Idea Validation...")
+        validation_result = await self.validate_idea(idea, model="o4-mini-deep-research")
         results["validation"] = validation_result
-        print(f"   Validation completed. Response ID: {validation_result.get('response_id')}")
+        logger.info("   Validation completed. Response ID: %s", validation_result.get('response_id'))
         
-        print("2. Starting Market Research...")
-        market_result = self.market_research(idea, model)
+        logger.info("2. Starting Market Research...")
+        market_result = await self.market_research(idea, model)
         results["market_research"] = market_result
-        print(f"   Market research completed. Response ID: {market_result.get('response_id')}")
+        logger.info("   Market research completed. Response ID: %s", market_result.get('response_id'))
         
-        print("3. Starting Financial Analysis...")
-        financial_result = self.financial_analysis(idea, model)
+        logger.info("3. Starting Financial Analysis...")
+        financial_result = await self.financial_analysis(idea, model)
         results["financial_analysis"] = financial_result
-        print(f"   Financial analysis completed. Response ID: {financial_result.get('response_id')}")
+        logger.info("   Financial analysis completed. Response ID: %s", financial_result.get('response_id'))
         
-        print("-" * 50)
-        print("Comprehensive research completed!")
+        logger.info("Comprehensive research completed!")
         
         return results
     
-    def custom_research(self, query: str, model: str = "o3-deep-research", 
+    async def custom_research(self, query: str, model: str = "o3-deep-research", 
                        research_type: str = "general", enrich_prompt: bool = True) -> Dict[str, Any]:
         """
         Conduct custom research with optional prompt enrichment
+        Repeated or paraphrased queries are served from the research cache
         """
-        research_prompt = query
-        
-        if enrich_prompt:
-            print("Enriching prompt...")
-            research_prompt = self.client.enrich_prompt(query, research_type)
-        
-        tools = self._prepare_tools(use_web_search=True, use_code_interpreter=True)
-        
-        response = self.client.create_response(
-            model=model,
-            input_text=research_prompt,
-            background=True,
-            tools=tools,
-            max_tool_calls=40
-        )
-        
-        if response and response.id:
-            completed_response = self.client.wait_for_completion(response.id)
-            return {
-                "type": "custom_research",
-                "response_id": response.id,
-                "output": completed_response.output_text if hasattr(completed_response, 'output_text') else None,
-                "status": "completed",
-                "original_query": query,
-                "enriched_prompt": research_prompt if enrich_prompt else None
-            }
+        cache = self.client.cache
+        cache_key = cache.make_key(model, research_type, query, enrich_prompt=enrich_prompt)
+        # Only informational, non time-sensitive queries are cached
+        cacheable = not is_time_sensitive(query)
+        cached = await cache.aget(cache_key) if cacheable else None
+        embedding = None
+        if cacheable and not cached:
+            # Both are round trips on the miss path, so they overlap; a "cmd" verdict discards the embedding
+            intent, embedding = await asyncio.gather(
+                self.client.classify_query(query), self.client.embed(normalize_query(query))
+            )
+            cacheable = intent == "info"
+            if not cacheable:
+                embedding = None
+            elif embedding:
+                cached = await cache.afind_similar(embedding, model, research_type, enrich_prompt=enrich_prompt)
+        if cached:
+            return {**cached, "processing_time": 0, "cache_hit": True}
+        
+        async def run():
+            research_prompt = query
+            
+            if enrich_prompt:
+                logger.info("Enriching prompt...")
+                research_prompt = await self.client.enrich_prompt(query, research_type)
+            
+            tools = self._prepare_tools(use_web_search=True, use_code_interpreter=True)
+            
+            response = await self.client.create_response(
+                model=model,
+                input_text=research_prompt,
+                background=True,
+                tools=tools,
+                max_tool_calls=40
+            )
+            
+            if response and response.id:
+                completed_response = await self.client.wait_for_completion(response.id)
+                result = {
+                    "type": "custom_research",
+                    "response_id": response.id,
+                    "output": completed_response.output_text if hasattr(completed_response, 'output_text') else None,
+                    "status": "completed",
+                    "original_query": query,
+                    "enriched_prompt": research_prompt if enrich_prompt else None
+                }
+                if cacheable and result["output"]:
+                    await cache.aset(cache_key, result, model, research_type, embedding, enrich_prompt=enrich_prompt)
+                return result
+            
+            return {"type": "custom_research", "status": "failed", "response": response}
         
-        return {"type": "custom_research", "status": "failed", "response": response}
+        return dict(await self.client.inflight.run(cache_key, run))
 
 def test_connection():
     """Test the OpenAI API connection and configuration"""
@@ -486,11 +624,11 @@ def test_connection():
         print("✓ Research client initialized successfully")
         
         # Test basic API connection
-        simple_response = client.client.chat.completions.create(
+        simple_response = asyncio.run(client.client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": "Say 'API connection successful'"}],
             max_tokens=10
-        )
+        ))
         
         if simple_response.choices[0].message.content:
             print("✓ API connection successful")
@@ -522,19 +660,20 @@ if __name__ == "__main__":
         print("\nExample usage:")
         print("-" * 30)
         print("""
+import asyncio
 from research_client import OpenAIResearchClient, ResearchWorkflow
 
 client = OpenAIResearchClient()
 workflow = ResearchWorkflow(client)
 
 # Custom research
-result = workflow.custom_research(
+result = asyncio.run(workflow.custom_research(
     "What are the latest AI trends in 2025?",
     model="o4-mini-deep-research"
-)
+))
 print(result["output"])
 
 # Startup validation
-validation = workflow.validate_idea("AI-powered fitness app")
+validation = asyncio.run(workflow.validate_idea("AI-powered fitness app"))
 print(validation["output"])
 """)
@@ -0,0 +1,106 @@
+"""
+Research output formatting
+Pure functions that turn raw research output into display fields (markdown
+rendered to sanitized HTML, citation and word counts). Kept free of app state
+so the CPU process pool can import them without loading the web app.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+try:
+    import bleach
+except ImportError:
+    bleach = None
+
+# Markdown link citations: [text](url)
+_CITATION_RE = re.compile(r'\[[^\]]+\]\([^)]+\)')
+
+
+def extract_citations(text: str) -> int:
+    """Extract citation count from research text"""
+    # Substring search is far cheaper than the regex on link-free text
+    if not text or '](' not in text:
+        return 0
+    # Count markdown links without materializing the matches
+    return sum(1 for _ in _CITATION_RE.finditer(text))
+
+
+def count_words(text: str) -> int:
+    """Count whitespace-separated words"""
+    return len(text.split()) if text else 0
+
+
+# Markup allowed in rendered research output (everything else is stripped)
+_ALLOWED_TAGS = [
+    "p", "br", "hr", "h1", "h2", "h3", "h4", "strong", "em", "ul", "ol", "li", "a",
+    "code", "pre", "blockquote", "table", "thead", "tbody", "tr", "th", "td"
+]
+_ALLOWED_ATTRIBUTES = {"a": ["href", "title"]}
+_ALLOWED_PROTOCOLS = ["http", "https", "mailto"]
+
+
+def render_markdown(text: str) -> Optional[str]:
+    """Render research markdown to sanitized HTML (None if markdown or bleach is missing)"""
+    # Link URLs are only filtered by bleach, so without it the client renders the text itself
+    if not text or markdown is None or bleach is None:
+        return None
+    md = markdown.Markdown(extensions=["fenced_code", "tables"])
+    # Raw HTML in model output is shown as text, never passed through
+    md.preprocessors.deregister("html_block")
+    md.inlinePatterns.deregister("html")
+    return bleach.clean(
+        md.convert(text), tags=_ALLOWED_TAGS, attributes=_ALLOWED_ATTRIBUTES,
+        protocols=_ALLOWED_PROTOCOLS, strip=True
+    )
+
+
+def format_research_output(result: Dict[str, Any], research_type: str) -> Dict[str, Any]:
+    """Format research result for better display"""
+    if not result or not result.get("output"):
+        return result
+    
+    output_text = result["output"]
+    
+    # For comprehensive research, format each section
+    if research_type == "comprehensive" and isinstance(result, dict):
+        formatted_sections = {}
+        total_citations = 0
+        total_words = 0
+        
+        for section_name, section_data in result.items():
+            if isinstance(section_data, dict) and section_data.get("output"):
+                section_output = section_data["output"]
+                section_citations = extract_citations(section_output)
+                section_words = count_words(section_output)
+                total_citations += section_citations
+                total_words += section_words
+                
+                formatted_sections[section_name] = {
+                    **section_data,
+                    "formatted_output": section_output,
+                    "formatted_html": render_markdown(section_output),
+                    "citations": section_citations,
+                    "word_count": section_words
+                }
+        
+        return {
+            "type": "comprehensive",
+            "sections": formatted_sections,
+            "total_citations": total_citations,
+            "total_words": total_words
+        }
+    
+    # For single research types
+    return {
+        **result,
+        "formatted_output": output_text,
+        "formatted_html": render_markdown(output_text),
+        "citations": extract_citations(output_text),
+        "word_count": count_words(output_text)
+    }
@@ -0,0 +1,46 @@
+"""
+On-disk result bodies
+Keeps the encoded JSON of finished results in files so only a small
+handle (uri, size, sha256) has to stay in process memory.
+"""
+
+import os
+import re
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_TASK_ID_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+
+class ResultFileStore:
+    """Encoded result bodies stored as <base_path>/<task_id>.json"""
+
+    def __init__(self, base_path: str):
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+    def path(self, task_id: str) -> Path:
+        """File holding task_id's body (task ids are restricted to safe filename characters)"""
+        if not _TASK_ID_RE.fullmatch(task_id):
+            raise ValueError(f"Invalid task id: {task_id!r}")
+        return self.base_path / f"{task_id}.json"
+
+    def write(self, task_id: str, body: bytes) -> Dict[str, Any]:
+        """Store body atomically and return its handle"""
+        path = self.path(task_id)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+        return {"uri": str(path), "size": len(body), "sha256": hashlib.sha256(body).hexdigest()}
+
+    def read(self, task_id: str) -> Optional[bytes]:
+        """Body for task_id, or None if it was never written or has been removed"""
+        try:
+            return self.path(task_id).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, task_id: str):
+        """Remove task_id's body if present"""
+        self.path(task_id).unlink(missing_ok=True)
@@ -0,0 +1,79 @@
+"""
+Completion-ordered index of stored results
+Backs cursor pagination of /api/research/results: a page costs O(limit)
+instead of a walk over every stored result.
+"""
+
+import bisect
+from collections.abc import MutableMapping
+from typing import List, Optional, Tuple
+
+from services.task_store import RedisTaskStore
+
+
+class ResultIndex:
+    """In-memory completion order; cursors are sequence numbers of the last returned task"""
+
+    def __init__(self):
+        self._next_seq = 0
+        # Current sequence number per task; re-adding a task moves it to the end
+        self._seq = {}
+        # (seq, task_id) in ascending seq, including stale entries until compaction
+        self._log: List[Tuple[int, str]] = []
+
+    def add(self, task_id: str):
+        self._next_seq += 1
+        self._seq[task_id] = self._next_seq
+        self._log.append((self._next_seq, task_id))
+        self._compact()
+
+    def discard(self, task_id: str):
+        self._seq.pop(task_id, None)
+        self._compact()
+
+    def page(self, cursor: int, limit: int) -> Tuple[List[str], Optional[int]]:
+        """Up to limit task ids completed after cursor, plus the cursor for the next page (None at the end)"""
+        task_ids = []
+        last_seq = cursor
+        for seq, task_id in self._log[bisect.bisect_right(self._log, cursor, key=lambda entry: entry[0]):]:
+            if self._seq.get(task_id) != seq:
+                continue
+            if len(task_ids) == limit:
+                return task_ids, last_seq
+            task_ids.append(task_id)
+            last_seq = seq
+        return task_ids, None
+
+    def _compact(self):
+        # Drop stale entries once they outnumber live ones
+        if len(self._log) > 2 * len(self._seq) + 64:
+            self._log = [(seq, task_id) for seq, task_id in self._log if self._seq.get(task_id) == seq]
+
+
+class RedisResultIndex:
+    """Completion order kept in a Redis sorted set, shared by all worker processes"""
+
+    def __init__(self, client, namespace: str):
+        self.client = client
+        self.key = f"{namespace}:order"
+        self.seq_key = f"{namespace}:order_seq"
+
+    def add(self, task_id: str):
+        self.client.zadd(self.key, {task_id: self.client.incr(self.seq_key)})
+
+    def discard(self, task_id: str):
+        self.client.zrem(self.key, task_id)
+
+    def page(self, cursor: int, limit: int) -> Tuple[List[str], Optional[int]]:
+        """Up to limit task ids completed after cursor, plus the cursor for the next page (None at the end)"""
+        entries = self.client.zrangebyscore(self.key, f"({cursor}", "+inf", start=0, num=limit + 1, withscores=True)
+        task_ids = [member.decode() for member, _ in entries[:limit]]
+        next_cursor = int(entries[limit - 1][1]) if len(entries) > limit else None
+        return task_ids, next_cursor
+
+
+def create_result_index(store: MutableMapping, namespace: str = "completed_results"):
+    """Index matching the results store: shared through Redis when the store is"""
+    if isinstance(store, RedisTaskStore):
+        return RedisResultIndex(store.client, namespace)
+    return ResultIndex()
@@ -9,21 +9,70 @@ Provides methods to store, retrieve, and analyze research data.
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, extract
-import json
+from sqlalchemy import func, desc, extract, update, bindparam
 import re
+import threading
 
 from models.database import (
     SessionLocal, ResearchTask, ResearchResult, IdeaPortfolio, SystemMetrics,
     get_db, init_database
 )
 from services.document_manager import research_docs
+from services.task_store import TaskStore
+
+# Indicator vocabularies used to score and classify research content
+_POSITIVE_MARKET = ('large market', 'growing market', 'opportunity', 'demand', 'potential')
+_NEGATIVE_MARKET = ('small market', 'declining', 'saturated', 'competitive')
+_TECH_POSITIVE = ('feasible', 'proven technology', 'available tools', 'straightforward')
+_TECH_NEGATIVE = ('complex', 'challenging', 'difficult', 'unproven', 'experimental')
+_COMP_POSITIVE = ('unique', 'innovative', 'first-mover', 'differentiated')
+_COMP_NEGATIVE = ('crowded market', 'many competitors', 'commoditized')
+
+_INDUSTRY_KEYWORDS = {
+    'technology': ('tech', 'software', 'ai', 'blockchain', 'iot', 'cloud', 'saas'),
+    'healthcare': ('health', 'medical', 'hospital', 'patient', 'therapy', 'wellness', 'pharma'),
+    'fintech': ('finance', 'payment', 'banking', 'crypto', 'trading', 'investment', 'loan'),
+    'education': ('education', 'learning', 'student', 'school', 'university', 'course', 'teaching'),
+    'e-commerce': ('ecommerce', 'retail', 'shopping', 'marketplace', 'store', 'commerce'),
+    'fitness': ('fitness', 'workout', 'exercise', 'gym', 'sports', 'training'),
+    'entertainment': ('game', 'media', 'music', 'video', 'streaming', 'entertainment'),
+    'food': ('food', 'restaurant', 'cooking', 'delivery', 'recipe', 'meal')
+}
+
+
+def _indicator_pattern(indicators) -> "re.Pattern":
+    """Compile a case-insensitive matcher that also reports overlapping indicators"""
+    alternatives = sorted(set(indicators), key=len, reverse=True)
+    return re.compile("(?=(" + "|".join(map(re.escape, alternatives)) + "))", re.IGNORECASE)
+
+
+def _indicator_hits(pattern: "re.Pattern", content: str) -> set:
+    """Return the set of indicators found anywhere in the content"""
+    return {match.group(1).lower() for match in pattern.finditer(content)}
+
+
+_SCORE_INDICATOR_RE = _indicator_pattern(
+    _POSITIVE_MARKET + _NEGATIVE_MARKET + _TECH_POSITIVE + _TECH_NEGATIVE + _COMP_POSITIVE + _COMP_NEGATIVE
+)
+_INDUSTRY_KEYWORD_RE = _indicator_pattern(
+    keyword for keywords in _INDUSTRY_KEYWORDS.values() for keyword in keywords
+)
 
 class StorageService:
     """Main service for handling research data storage and retrieval"""
     
+    # Task ids per IN (...) lookup when summarizing results, well under SQLite's bound-parameter limit
+    SUMMARY_BATCH_SIZE = 500
+    
     def __init__(self):
         self.doc_manager = research_docs
+        # Citation/word counts of completed results, keyed by task_id
+        self._result_summaries = TaskStore(maxsize=10000, ttl=7 * 86400)
+        # Latest unwritten progress message per task_id, written in batches by flush_progress
+        self._pending_progress: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        # Serializes batched flushes with direct task updates so a stale message never lands last
+        self._write_lock = threading.Lock()
         init_database()  # Ensure database is initialized
     
     def get_db_session(self) -> Session:
@@ -52,8 +101,44 @@ class StorageService:
         finally:
             db.close()
     
+    def queue_progress(self, task_id: str, progress: str):
+        """Record a progress message for the next flush_progress (only the latest per task is kept)"""
+        with self._pending_lock:
+            self._pending_progress[task_id] = progress
+    
+    def flush_progress(self) -> int:
+        """Write every queued progress message in one transaction; returns the number of tasks updated"""
+        with self._write_lock:
+            with self._pending_lock:
+                pending, self._pending_progress = self._pending_progress, {}
+            if not pending:
+                return 0
+            
+            table = ResearchTask.__table__
+            statement = (
+                update(table)
+                .where(table.c.task_id == bindparam("b_task_id"))
+                .values(progress=bindparam("b_progress"))
+            )
+            db = self.get_db_session()
+            try:
+                db.execute(statement, [
+                    {"b_task_id": task_id, "b_progress": progress} for task_id, progress in pending.items()
+                ])
+                db.commit()
+            finally:
+                db.close()
+            return len(pending)
+    
     def update_research_task(self, task_id: str, updates: Dict[str, Any]):
         """Update research task status and progress"""
+        with self._write_lock:
+            # This write supersedes any progress still waiting for a flush
+            with self._pending_lock:
+                self._pending_progress.pop(task_id, None)
+            self._update_research_task(task_id, updates)
+    
+    def _update_research_task(self, task_id: str, updates: Dict[str, Any]):
         db = self.get_db_session()
         try:
             task = db.query(ResearchTask).filter(ResearchTask.task_id == task_id).first()
@@ -74,6 +159,13 @@ class StorageService:
     
     def complete_research_task(self, task_id: str, result_data: Dict[str, Any]) -> bool:
         """Complete a research task with results"""
+        with self._write_lock:
+            # Like update_research_task: a flush holding an older message can't land after this
+            with self._pending_lock:
+                self._pending_progress.pop(task_id, None)
+            return self._complete_research_task(task_id, result_data)
+    
+    def _complete_research_task(self, task_id: str, result_data: Dict[str, Any]) -> bool:
         db = self.get_db_session()
         try:
             # Update task with results
@@ -191,50 +283,16 @@ class StorageService:
             'risk_level': 5
         }
         
-        # Analyze content for positive/negative indicators
-        content = str(result).lower()
+        # One case-insensitive scan collects every indicator present in the content
+        found = _indicator_hits(_SCORE_INDICATOR_RE, str(result))
         
-        # Market opportunity indicators
-        positive_market = ['large market', 'growing market', 'opportunity', 'demand', 'potential']
-        negative_market = ['small market', 'declining', 'saturated', 'competitive']
+        def tally(base: int, positive, negative) -> int:
+            score = base + 5 * len(found.intersection(positive)) - 5 * len(found.intersection(negative))
+            return max(0, min(100, score))
         
-        market_score = 70
-        for indicator in positive_market:
-            if indicator in content:
-                market_score += 5
-        for indicator in negative_market:
-            if indicator in content:
-                market_score -= 5
-        
-        scores['market_opportunity'] = max(0, min(100, market_score))
-        
-        # Technical feasibility indicators
-        tech_positive = ['feasible', 'proven technology', 'available tools', 'straightforward']
-        tech_negative = ['complex', 'challenging', 'difficult', 'unproven', 'experimental']
-        
-        tech_score = 65
-        for indicator in tech_positive:
-            if indicator in content:
-                tech_score += 5
-        for indicator in tech_negative:
-            if indicator in content:
-                tech_score -= 5
-        
-        scores['technical_feasibility'] = max(0, min(100, tech_score))
-        
-        # Competitive advantage 
-        comp_positive = ['unique', 'innovative', 'first-mover', 'differentiated']
-        comp_negative = ['crowded market', 'many competitors', 'commoditized']
-        
-        comp_score = 60
-        for indicator in comp_positive:
-            if indicator in content:
-                comp_score += 5
-        for indicator in comp_negative:
-            if indicator in content:
-                comp_score -= 5
-        
-        scores['competitive_advantage'] = max(0, min(100, comp_score))
+        scores['market_opportunity'] = tally(70, _POSITIVE_MARKET, _NEGATIVE_MARKET)
+        scores['technical_feasibility'] = tally(65, _TECH_POSITIVE, _TECH_NEGATIVE)
+        scores['competitive_advantage'] = tally(60, _COMP_POSITIVE, _COMP_NEGATIVE)
         
         return scores
     
@@ -266,23 +324,11 @@ class StorageService:
     
     def _determine_industry(self, query: str, result: Dict[str, Any]) -> str:
         """Determine industry from query and result content"""
-        content = (query + " " + str(result)).lower()
-        
-        industry_keywords = {
-            'technology': ['tech', 'software', 'ai', 'blockchain', 'iot', 'cloud', 'saas'],
-            'healthcare': ['health', 'medical', 'hospital', 'patient', 'therapy', 'wellness', 'pharma'],
-            'fintech': ['finance', 'payment', 'banking', 'crypto', 'trading', 'investment', 'loan'],
-            'education': ['education', 'learning', 'student', 'school', 'university', 'course', 'teaching'],
-            'e-commerce': ['ecommerce', 'retail', 'shopping', 'marketplace', 'store', 'commerce'],
-            'fitness': ['fitness', 'workout', 'exercise', 'gym', 'sports', 'training'],
-            'entertainment': ['game', 'media', 'music', 'video', 'streaming', 'entertainment'],
-            'food': ['food', 'restaurant', 'cooking', 'delivery', 'recipe', 'meal']
-        }
+        found = _indicator_hits(_INDUSTRY_KEYWORD_RE, query + " " + str(result))
         
-        for industry, keywords in industry_keywords.items():
-            for keyword in keywords:
-                if keyword in content:
-                    return industry
+        for industry, keywords in _INDUSTRY_KEYWORDS.items():
+            if found.intersection(keywords):
+                return industry
         
         return 'other'
     
@@ -520,7 +566,8 @@ class StorageService:
                     "progress": task.progress,
                     "created_at": task.created_at.isoformat() if task.created_at else None,
                     "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                    "result_data": task.result_data
+                    "result_data": task.result_data,
+                    "error": task.error_message
                 }
             return None
         finally:
@@ -530,28 +577,43 @@ class StorageService:
         """Get all completed research results"""
         db = self.get_db_session()
         try:
-            tasks = db.query(ResearchTask).filter(
+            # Project plain columns instead of hydrating ORM objects with their result payloads
+            rows = db.query(
+                ResearchTask.task_id, ResearchTask.query, ResearchTask.model, ResearchTask.research_type,
+                ResearchTask.status, ResearchTask.created_at, ResearchTask.completed_at
+            ).filter(
                 ResearchTask.status == 'completed'
             ).order_by(desc(ResearchTask.completed_at)).all()
             
+            # Completed results don't change, so each one's summary is computed only once
+            missing = [row.task_id for row in rows if row.task_id not in self._result_summaries]
+            # Payloads are streamed in small batches so only a few are decoded in memory at once
+            for start in range(0, len(missing), self.SUMMARY_BATCH_SIZE):
+                batch = missing[start:start + self.SUMMARY_BATCH_SIZE]
+                for task_id, result_data in db.query(ResearchTask.task_id, ResearchTask.result_data).filter(
+                    ResearchTask.task_id.in_(batch)
+                ).yield_per(100):
+                    self._result_summaries[task_id] = {
+                        "total_citations": self._count_citations(result_data),
+                        "word_count": self._count_words(result_data)
+                    } if result_data else None
+            
             results = []
-            for task in tasks:
+            for row in rows:
                 result_data = {
-                    "task_id": task.task_id,
-                    "query": task.query,
-                    "model": task.model,
-                    "research_type": task.research_type,
-                    "status": task.status,
-                    "created_at": task.created_at.isoformat() if task.created_at else None,
-                    "completed_at": task.completed_at.isoformat() if task.completed_at else None
+                    "task_id": row.task_id,
+                    "query": row.query,
+                    "model": row.model,
+                    "research_type": row.research_type,
+                    "status": row.status,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "completed_at": row.completed_at.isoformat() if row.completed_at else None
                 }
                 
                 # Add result summary if available
-                if task.result_data:
-                    result_data["result"] = {
-                        "total_citations": self._count_citations(task.result_data),
-                        "word_count": self._count_words(task.result_data)
-                    }
+                summary = self._result_summaries.get(row.task_id)
+                if summary:
+                    result_data["result"] = summary
                 
                 results.append(result_data)
             
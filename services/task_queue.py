@@ -0,0 +1,125 @@
+"""
+Optional Celery task queue for running research outside the web process
+Enabled when celery is installed and CELERY_BROKER_URL is set;
+otherwise the API keeps running research in-process.
+
+Start a worker with: celery -A services.task_queue worker --loglevel=info
+"""
+
+import os
+import asyncio
+import logging
+import orjson
+from typing import Dict, Any, Optional
+
+try:
+    from celery import Celery
+    from celery.result import AsyncResult
+except ImportError:
+    Celery = None
+    AsyncResult = None
+
+logger = logging.getLogger("research_app.queue")
+
+BROKER_URL = os.getenv("CELERY_BROKER_URL")
+RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND") or BROKER_URL
+
+celery_app = None
+# One event loop per worker process so the shared AsyncOpenAI connection pool stays usable
+_worker_loop = None
+
+
+def _run_in_worker_loop(coro):
+    """Run a coroutine on this worker process's persistent event loop"""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_loop.run_until_complete(coro)
+
+
+if Celery and BROKER_URL:
+    celery_app = Celery('research', broker=BROKER_URL, backend=RESULT_BACKEND)
+    celery_app.conf.update(
+        task_track_started=True,
+        task_acks_late=True,
+        worker_prefetch_multiplier=1,
+        result_expires=7 * 24 * 3600,
+    )
+
+    @celery_app.task(bind=True, name="research.run")
+    def run_research(self, task_id: str, task_data: Dict[str, Any], request_data: Dict[str, Any]):
+        """Run a research task in a worker, publishing progress through the result backend"""
+        import app as research_app
+
+        research_app.research_tasks[task_id] = dict(task_data)
+        research_app.progress_reporters[task_id] = lambda state: self.update_state(
+            state='PROGRESS', meta=_json_safe_state(state)
+        )
+        try:
+            request = research_app.ResearchRequest(**request_data)
+            _run_in_worker_loop(research_app.background_research_task(task_id, request))
+            body = research_app.load_result_body(task_id)
+            return {
+                "task": _json_safe_state(research_app.research_tasks[task_id]),
+                "result": orjson.loads(body) if body else None
+            }
+        finally:
+            research_app.progress_reporters.pop(task_id, None)
+            research_app.research_tasks.pop(task_id, None)
+            research_app.completed_results.pop(task_id, None)
+            research_app.drop_result_body(task_id)
+
+
+def _json_safe_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy task state for the result backend, decoding serialized partial results"""
+    meta = dict(state)
+    if isinstance(meta.get("partial_result_bytes"), bytes):
+        meta["partial_result_bytes"] = meta["partial_result_bytes"].decode()
+    return meta
+
+
+def is_enabled() -> bool:
+    """Whether research should be handed off to queue workers"""
+    return celery_app is not None
+
+
+def enqueue_research(task_id: str, task_data: Dict[str, Any], request_data: Dict[str, Any]):
+    """Enqueue a research task under the API's task id"""
+    run_research.apply_async(args=[task_id, task_data, request_data], task_id=task_id)
+
+
+def get_task_state(task_id: str) -> Optional[Dict[str, Any]]:
+    """Get the latest task state reported by a worker, or None if unknown"""
+    if not celery_app:
+        return None
+    try:
+        result = AsyncResult(task_id, app=celery_app)
+        if result.state == 'PROGRESS':
+            return result.info
+        if result.state == 'SUCCESS':
+            return result.result.get("task")
+    except Exception as e:
+        logger.warning("Task queue lookup failed: %s", e)
+    return None
+
+
+def get_task_result(task_id: str) -> Optional[Dict[str, Any]]:
+    """Get the final result of a finished queued task, or None"""
+    if not celery_app:
+        return None
+    try:
+        result = AsyncResult(task_id, app=celery_app)
+        if result.state == 'SUCCESS':
+            return result.result.get("result")
+    except Exception as e:
+        logger.warning("Task queue lookup failed: %s", e)
+    return None
+
+
+def forget_task(task_id: str):
+    """Drop a task's state from the result backend"""
+    if celery_app:
+        try:
+            AsyncResult(task_id, app=celery_app).forget()
+        except Exception as e:
+            logger.warning("Task queue cleanup failed: %s", e)
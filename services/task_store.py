@@ -0,0 +1,273 @@
+"""
+Bounded task store
+Dict-like container for task state and results that evicts the least
+recently used entries beyond maxsize and drops entries older than ttl.
+With REDIS_URL set, entries live in Redis instead so every worker process
+sees the same tasks.
+"""
+
+import os
+import time
+import logging
+import pickle
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    redis = None
+    redis_asyncio = None
+
+logger = logging.getLogger("research_app.store")
+
+
+class TaskStore(MutableMapping):
+    """Dict-like store bounded by entry count (LRU) and age (TTL)"""
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 86400,
+                 timer: Callable[[], float] = time.monotonic,
+                 on_evict: Optional[Callable[[Any, Any], None]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.on_evict = on_evict
+        self.evictions = 0
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        # Full TTL sweeps for len()/iteration run at most once per interval; lookups still check expiry
+        self.expire_interval = 1.0
+        self._next_sweep = float("-inf")
+        # Makes each operation atomic for callers on worker threads; on_evict runs after it is released
+        self._lock = threading.RLock()
+
+    def _evicted(self, key, value):
+        """Count an entry dropped for size or age and hand it to on_evict"""
+        self.evictions += 1
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def __getitem__(self, key):
+        with self._lock:
+            expires_at, value = self._data[key]
+            if expires_at > self.timer():
+                self._data.move_to_end(key)
+                return value
+            del self._data[key]
+        self._evicted(key, value)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        evicted = []
+        with self._lock:
+            self._data[key] = (self.timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted_key, (_, evicted_value) = self._data.popitem(last=False)
+                evicted.append((evicted_key, evicted_value))
+        for evicted_key, evicted_value in evicted:
+            self._evicted(evicted_key, evicted_value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+
+    def pop(self, key, *default):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self.timer():
+                return value
+            self._evicted(key, value)
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator:
+        self._sweep()
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        self._sweep()
+        return len(self._data)
+
+    def get_many(self, keys: list) -> list:
+        """Values for keys (None where missing or expired)"""
+        return [self.get(key) for key in keys]
+
+    def values(self) -> list:
+        """Snapshot of live values (does not affect LRU order)"""
+        self._sweep()
+        with self._lock:
+            return [value for _, value in self._data.values()]
+
+    def items(self) -> list:
+        """Snapshot of live (key, value) pairs (does not affect LRU order)"""
+        self._sweep()
+        with self._lock:
+            return [(key, value) for key, (_, value) in self._data.items()]
+
+    def _sweep(self):
+        """expire(), unless a sweep already ran within expire_interval"""
+        now = self.timer()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.expire_interval
+            self.expire()
+
+    def expire(self):
+        """Drop all entries past their TTL"""
+        now = self.timer()
+        with self._lock:
+            expired = [(k, value) for k, (expires_at, value) in self._data.items() if expires_at <= now]
+            for key, _ in expired:
+                del self._data[key]
+        for key, value in expired:
+            self._evicted(key, value)
+
+
+class RedisTaskStore(MutableMapping):
+    """Dict-like store kept in Redis (TTL-bound) and shared by all worker processes
+
+    Keys are tracked in a sorted set scored by last write, so len() and iteration
+    never scan the keyspace and the store can be held to maxsize. on_evict only
+    sees entries dropped for size; TTL expiry happens inside Redis.
+    """
+
+    def __init__(self, client, namespace: str, ttl: float = 86400, url: str = None,
+                 maxsize: int = 1000, on_evict: Optional[Callable[[Any, Any], None]] = None):
+        self.client = client
+        self.prefix = f"{namespace}:"
+        # Outside the value prefix so it can never collide with an entry key
+        self.index_key = f"{namespace}.index"
+        self.ttl = int(ttl)
+        self.url = url
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.evictions = 0
+        self._async_client = None
+
+    def _key(self, key) -> str:
+        return f"{self.prefix}{key}"
+
+    def _channel(self, key) -> str:
+        return f"{self.prefix}{key}:events"
+
+    def __getitem__(self, key):
+        # Values are internal task state written by this app, never user-supplied bytes
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            raise KeyError(key)
+        return pickle.loads(raw)
+
+    def __setitem__(self, key, value):
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self._key(key), pickle.dumps(value), ex=self.ttl)
+            pipe.zadd(self.index_key, {key: time.time()})
+            pipe.expire(self.index_key, self.ttl)
+            pipe.zcard(self.index_key)
+            pipe.publish(self._channel(key), b"")
+            size = pipe.execute()[3]
+        if size > self.maxsize:
+            self._evict_oldest(size - self.maxsize)
+
+    def _evict_oldest(self, count: int):
+        """Drop the count least recently written entries, reporting each to on_evict"""
+        # ZPOPMIN is atomic, so concurrent writers never evict the same entry twice
+        keys = [key.decode() for key, _ in self.client.zpopmin(self.index_key, count)]
+        if not keys:
+            return
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.mget([self._key(key) for key in keys])
+            pipe.delete(*[self._key(key) for key in keys])
+            raws = pipe.execute()[0]
+        for key, raw in zip(keys, raws):
+            if raw is None:
+                continue
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(key, pickle.loads(raw))
+
+    def __delitem__(self, key):
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.delete(self._key(key))
+            pipe.zrem(self.index_key, key)
+            deleted = pipe.execute()[0]
+        if not deleted:
+            raise KeyError(key)
+
+    def pop(self, key, *default):
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(self._key(key))
+            pipe.delete(self._key(key))
+            pipe.zrem(self.index_key, key)
+            raw = pipe.execute()[0]
+        if raw is not None:
+            return pickle.loads(raw)
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def _live_keys(self, fetch: bool):
+        """Drop index entries whose values have expired, then return the keys or their count"""
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(self.index_key, "-inf", time.time() - self.ttl)
+            if fetch:
+                pipe.zrange(self.index_key, 0, -1)
+            else:
+                pipe.zcard(self.index_key)
+            return pipe.execute()[1]
+
+    def __iter__(self) -> Iterator:
+        return iter([key.decode() for key in self._live_keys(fetch=True)])
+
+    def __len__(self) -> int:
+        return self._live_keys(fetch=False)
+
+    def get_many(self, keys: list) -> list:
+        """Values for keys (None where missing), fetched in one round trip"""
+        if not keys:
+            return []
+        raws = self.client.mget([self._key(key) for key in keys])
+        return [None if raw is None else pickle.loads(raw) for raw in raws]
+
+    def values(self) -> list:
+        """Snapshot of live values, fetched in one round trip"""
+        return [value for _, value in self.items()]
+
+    def items(self) -> list:
+        """Snapshot of live (key, value) pairs, fetched in one round trip"""
+        keys = list(self)
+        return [(key, value) for key, value in zip(keys, self.get_many(keys)) if value is not None]
+
+    async def wait_for_change(self, key, timeout: float) -> bool:
+        """Wait up to timeout seconds for any worker to update key; False on timeout"""
+        if self._async_client is None:
+            self._async_client = redis_asyncio.Redis.from_url(self.url)
+        pubsub = self._async_client.pubsub()
+        try:
+            await pubsub.subscribe(self._channel(key))
+            deadline = time.monotonic() + timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                if await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining):
+                    return True
+            return False
+        finally:
+            await pubsub.reset()
+
+
+def create_task_store(namespace: str, maxsize: int = 1000, ttl: float = 86400,
+                      on_evict: Optional[Callable[[Any, Any], None]] = None) -> MutableMapping:
+    """Redis-backed store when REDIS_URL is set and reachable, else an in-memory TaskStore"""
+    url = os.getenv("REDIS_URL")
+    if url and redis:
+        try:
+            client = redis.Redis.from_url(url)
+            client.ping()
+            return RedisTaskStore(client, namespace, ttl, url, maxsize=maxsize, on_evict=on_evict)
+        except Exception as e:
+            logger.warning("Task store %s falling back to memory: %s", namespace, e)
+    return TaskStore(maxsize=maxsize, ttl=ttl, on_evict=on_evict)
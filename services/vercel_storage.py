@@ -4,7 +4,6 @@ Uses environment variables and external storage for serverless deployment
 """
 
 import os
-import json
 import asyncio
 from typing import Dict, List, Any, Optional
 from datetime import datetime
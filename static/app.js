@@ -0,0 +1,630 @@
+// Compiled once; shared by every render
+const HTML_ESCAPE_RE = /[&<>"]/g;
+const HTML_ENTITIES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+const UNSAFE_FILENAME_RE = /[^a-zA-Z0-9]/g;
+// Link schemes rendered as anchors; javascript:, data: and the rest stay plain text
+const SAFE_LINK_RE = /^(https?|mailto):/i;
+// Same fields as Date.toLocaleString(), without building a formatter per call
+const DATE_TIME_FORMAT = new Intl.DateTimeFormat(undefined, {
+    year: 'numeric', month: 'numeric', day: 'numeric',
+    hour: 'numeric', minute: 'numeric', second: 'numeric'
+});
+
+function escapeHtml(text) {
+    return text.replace(HTML_ESCAPE_RE, c => HTML_ENTITIES[c]);
+}
+
+marked.use({
+    gfm: true,
+    breaks: true,
+    renderer: {
+        link(href, title, text) {
+            if (!SAFE_LINK_RE.test(href || '')) return text;
+            return `<a href="${escapeHtml(href)}" target="_blank" rel="noopener noreferrer">${text}</a>`;
+        },
+        html(html) {
+            // Show raw HTML from model output as text instead of injecting it
+            return escapeHtml(html);
+        }
+    }
+});
+
+// Rendered HTML keyed by markdown source; lives outside Alpine's reactive proxy
+const markdownCache = new Map();
+
+function renderMarkdown(text) {
+    if (!text) return '';
+
+    let html = markdownCache.get(text);
+    if (html === undefined) {
+        html = marked.parse(text);
+        if (markdownCache.size > 500) markdownCache.clear();
+        markdownCache.set(text, html);
+    }
+    return html;
+}
+
+function resultText(result) {
+    if (typeof result === 'string') return result;
+    if (result?.formatted_output) return result.formatted_output;
+    if (result?.output) return result.output;
+    return JSON.stringify(result, null, 2);
+}
+
+function escapeValue(value) {
+    return escapeHtml(String(value ?? ''));
+}
+
+function renderSection(sectionName, section) {
+    return `
+        <div class="border border-gray-200 rounded-lg">
+            <div class="bg-gray-50 px-4 py-3 border-b">
+                <h4 class="font-medium text-gray-900 capitalize">${escapeValue(sectionName.replace('_', ' '))}</h4>
+                <div class="flex items-center space-x-3 text-sm text-gray-600 mt-1">
+                    ${section.citations ? `<span>${escapeValue(section.citations)} citations</span>` : ''}
+                    ${section.word_count ? `<span>${escapeValue(section.word_count)} words</span>` : ''}
+                </div>
+            </div>
+            <div class="p-4 max-h-64 overflow-y-auto section-pane">
+                <div class="prose prose-sm max-w-none">${section.formatted_html || renderMarkdown(section.formatted_output || section.output)}</div>
+            </div>
+        </div>`;
+}
+
+function renderResultContent(result) {
+    if (result.status === 'failed') {
+        return `
+            <div class="bg-red-50 border border-red-200 rounded-md p-4">
+                <div class="flex items-center">
+                    <svg class="w-5 h-5 text-red-400 mr-2" fill="none" stroke="currentColor"><use href="#icon-warning"></use></svg>
+                    <p class="text-red-800 text-sm font-medium">Research Failed</p>
+                </div>
+                <p class="text-red-700 text-sm mt-1">${escapeValue(result.error)}</p>
+            </div>`;
+    }
+    if (result.status !== 'completed' || !result.result) return '';
+
+    const body = result.research_type === 'comprehensive'
+        ? `<div class="space-y-6">${Object.entries(result.result.sections || {}).map(([name, section]) => renderSection(name, section)).join('')}</div>`
+        : `<div class="max-h-96 overflow-y-auto">
+               <div class="prose prose-sm max-w-none">${result.result.formatted_html || renderMarkdown(resultText(result.result))}</div>
+           </div>`;
+
+    return `
+        <div>
+            ${body}
+            <div class="mt-6 flex space-x-3">
+                <button data-action="downloadResult"
+                    class="inline-flex items-center px-4 py-2 bg-green-600 text-white text-sm font-medium rounded-md hover:bg-green-700 focus:outline-none focus:ring-2 focus:ring-green-500 focus:ring-offset-2">
+                    <svg class="w-4 h-4 mr-2" fill="none" stroke="currentColor"><use href="#icon-download"></use></svg>
+                    Download Report
+                </button>
+                <button data-action="copyResult"
+                    class="inline-flex items-center px-4 py-2 bg-gray-600 text-white text-sm font-medium rounded-md hover:bg-gray-700 focus:outline-none focus:ring-2 focus:ring-gray-500 focus:ring-offset-2">
+                    <svg class="w-4 h-4 mr-2" fill="none" stroke="currentColor"><use href="#icon-copy"></use></svg>
+                    Copy to Clipboard
+                </button>
+                <button data-action="openDashboard"
+                    class="inline-flex items-center px-4 py-2 bg-purple-600 text-white text-sm font-medium rounded-md hover:bg-purple-700 focus:outline-none focus:ring-2 focus:ring-purple-500 focus:ring-offset-2">
+                    <svg class="w-4 h-4 mr-2" fill="none" stroke="currentColor"><use href="#icon-chart"></use></svg>
+                    Open Integrated Dashboard
+                </button>
+            </div>
+        </div>`;
+}
+
+function renderResultCard(result) {
+    const details = result.result || {};
+    return `
+        <div class="bg-gradient-to-r from-blue-50 to-indigo-50 px-6 py-4 border-b">
+            <div class="flex items-center justify-between mb-2">
+                <h3 class="text-lg font-semibold text-gray-900">${escapeValue(result.query)}</h3>
+                <div class="flex items-center space-x-2">
+                    <span class="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-blue-100 text-blue-800">${escapeValue(result.model)}</span>
+                    <span class="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-green-100 text-green-800">${escapeValue(result.research_type)}</span>
+                </div>
+            </div>
+            <div class="flex items-center justify-between text-sm text-gray-600">
+                <div class="flex items-center space-x-4">
+                    ${details.processing_time_formatted ? `
+                    <span class="flex items-center space-x-1">
+                        <svg class="w-4 h-4" fill="none" stroke="currentColor"><use href="#icon-clock"></use></svg>
+                        <span>${escapeValue(details.processing_time_formatted)}</span>
+                    </span>` : ''}
+                    ${result._citations ? `
+                    <span class="flex items-center space-x-1">
+                        <svg class="w-4 h-4" fill="none" stroke="currentColor"><use href="#icon-document"></use></svg>
+                        <span>${escapeValue(result._citations)} citations</span>
+                    </span>` : ''}
+                    ${result._words ? `
+                    <span class="flex items-center space-x-1">
+                        <svg class="w-4 h-4" fill="none" stroke="currentColor"><use href="#icon-chart"></use></svg>
+                        <span>${escapeValue(result._words)} words</span>
+                    </span>` : ''}
+                </div>
+                <span class="text-xs">Completed: ${escapeValue(result._completedAt)}</span>
+            </div>
+        </div>
+        <div class="p-6">${renderResultContent(result)}</div>`;
+}
+
+// One element per result; re-renders only when it is handed a different result object
+class ResultCard extends HTMLElement {
+    set data(result) {
+        if (this._result === result) return;
+        this._result = result;
+        this.innerHTML = renderResultCard(result);
+    }
+
+    get data() {
+        return this._result;
+    }
+}
+customElements.define('result-card', ResultCard);
+
+function reconcileResultCards(container, results) {
+    const cards = new Map();
+    for (const card of container.children) cards.set(card.dataset.taskId, card);
+
+    results.forEach((result, index) => {
+        let card = cards.get(result.task_id);
+        if (card) {
+            cards.delete(result.task_id);
+        } else {
+            card = document.createElement('result-card');
+            card.className = 'block bg-white rounded-lg shadow-md overflow-hidden';
+            card.dataset.taskId = result.task_id;
+        }
+        card.data = result;
+        const current = container.children[index];
+        if (current !== card) container.insertBefore(card, current || null);
+    });
+
+    for (const card of cards.values()) card.remove();
+}
+
+// Live task stream and polling fallback; native objects stay outside Alpine's proxy too
+let progressSource = null;
+let pollTimer = null;
+let polling = false;
+let pollDelay = 0;
+const MAX_POLL_DELAY = 30000;
+// Cursor for the next page of stored results (null once every page is loaded)
+let resultsCursor = null;
+let loadingResultsPage = false;
+
+function researchApp() {
+    return {
+        models: [],
+        selectedModel: 'o3-deep-research',
+        researchType: 'custom',
+        query: '',
+        enrichPrompt: true,
+        isLoading: false,
+        currentTask: null,
+        progressStep: 0,
+        progressPercent: 0,
+        results: [],
+        renderLimit: 10,
+        pendingProgressiveResult: null,
+        progressFrame: 0,
+
+        async init() {
+            this.observeResultsSentinel();
+            document.addEventListener('visibilitychange', () => {
+                pollDelay = 0;
+                this.schedulePoll();
+            });
+            await this.loadModels();
+        },
+
+        get visibleResults() {
+            // Only mount the cards near the viewport; the rest render on scroll
+            return this.results.slice(0, this.renderLimit);
+        },
+
+        renderResults(results) {
+            // Raw objects keep card rendering out of Alpine's dependency tracking
+            reconcileResultCards(this.$refs.resultsList, results.map(result => Alpine.raw(result)));
+        },
+
+        handleResultAction(event) {
+            const button = event.target.closest('[data-action]');
+            if (!button) return;
+            this[button.dataset.action](button.closest('result-card').data);
+        },
+
+        observeResultsSentinel() {
+            const sentinel = this.$refs.resultsSentinel;
+            const observer = new IntersectionObserver(async (entries) => {
+                if (!entries[0].isIntersecting) return;
+                if (this.renderLimit < this.results.length) {
+                    this.renderLimit += 10;
+                } else if (!await this.loadMoreResults()) {
+                    return;
+                }
+                // Re-observe so the callback fires again if the sentinel is still visible
+                this.$nextTick(() => {
+                    observer.unobserve(sentinel);
+                    observer.observe(sentinel);
+                });
+            }, { rootMargin: '600px' });
+            observer.observe(sentinel);
+        },
+
+        get selectedModelInfo() {
+            return this.models.find(m => m.id === this.selectedModel);
+        },
+
+        async loadModels() {
+            try {
+                console.log('Loading models...');
+                const response = await fetch('/api/models');
+                console.log('Response status:', response.status);
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+                }
+                const data = await response.json();
+                console.log('Models data received:', data);
+                this.models = Object.entries(data).map(([id, info]) => ({
+                    id,
+                    name: info.name,
+                    description: info.description,
+                    best_for: info.best_for,
+                    cost: info.cost,
+                    speed: info.speed
+                }));
+                console.log('Models array:', this.models);
+            } catch (error) {
+                console.error('Failed to load models:', error);
+                // Fallback models if API fails
+                this.models = [
+                    {
+                        id: 'o3-deep-research',
+                        name: 'O3 Deep Research',
+                        description: 'Most comprehensive research model with advanced reasoning capabilities',
+                        best_for: 'Complex analysis, detailed reports, comprehensive research',
+                        cost: 'Higher',
+                        speed: 'Slower'
+                    },
+                    {
+                        id: 'o4-mini-deep-research',
+                        name: 'O4 Mini Deep Research',
+                        description: 'Faster, cost-effective research model for quicker insights',
+                        best_for: 'Quick research, initial exploration, cost-sensitive tasks',
+                        cost: 'Lower',
+                        speed: 'Faster'
+                    }
+                ];
+            }
+        },
+
+        async submitResearch() {
+            if (!this.query.trim()) return;
+
+            this.isLoading = true;
+            try {
+                const response = await fetch('/api/research', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify({
+                        query: this.query,
+                        model: this.selectedModel,
+                        research_type: this.researchType,
+                        enrich_prompt: this.enrichPrompt
+                    })
+                });
+
+                if (response.ok) {
+                    const task = await response.json();
+                    this.setCurrentTask(task);
+                    this.watchTask(task.task_id);
+                    this.query = '';
+                } else {
+                    alert('Failed to start research');
+                }
+            } catch (error) {
+                console.error('Error submitting research:', error);
+                alert('Error submitting research');
+            } finally {
+                this.isLoading = false;
+            }
+        },
+
+        watchTask(taskId) {
+            this.stopWatching();
+            if (!window.EventSource) {
+                this.startPolling();
+                return;
+            }
+
+            // The server pushes a progress event only when the task state changes
+            const source = new EventSource(`/api/research/${taskId}/stream`);
+            source.addEventListener('progress', (event) => {
+                const progressData = JSON.parse(event.data);
+                this.setCurrentTask({...this.currentTask, ...progressData});
+                if (progressData.partial_result && progressData.partial_result.sections) {
+                    this.updateProgressiveResults(progressData);
+                }
+            });
+            source.addEventListener('done', async () => {
+                this.stopWatching();
+                await this.loadResults();
+                this.setCurrentTask(null);
+            });
+            source.onerror = () => {
+                // Fall back to polling if the stream drops before the task finishes
+                this.stopWatching();
+                this.startPolling();
+            };
+            progressSource = source;
+        },
+
+        startPolling() {
+            polling = true;
+            pollDelay = 0;
+            this.schedulePoll();
+        },
+
+        schedulePoll() {
+            clearTimeout(pollTimer);
+            pollTimer = null;
+            // Paused while idle or in a background tab; visibilitychange resumes it
+            if (!polling || !this.currentTask || document.hidden) return;
+
+            const baseDelay = this.currentTask.status === 'running' ? 2000 : 5000;
+            pollTimer = setTimeout(async () => {
+                const progress = this.currentTask?.progress;
+                await this.checkPendingTasks();
+                // Back off while nothing changes; snap back as soon as progress moves
+                pollDelay = this.currentTask?.progress === progress
+                    ? Math.min((pollDelay || baseDelay) * 2, MAX_POLL_DELAY)
+                    : 0;
+                this.schedulePoll();
+            }, pollDelay || baseDelay);
+        },
+
+        stopWatching() {
+            if (progressSource) {
+                progressSource.close();
+                progressSource = null;
+            }
+            polling = false;
+            clearTimeout(pollTimer);
+            pollTimer = null;
+        },
+
+        async checkPendingTasks() {
+            if (this.currentTask && (this.currentTask.status === 'pending' || this.currentTask.status === 'running')) {
+                try {
+                    const taskId = this.currentTask.task_id;
+                    // For comprehensive research, check progressive results alongside the status
+                    const [progressResponse, response] = await Promise.all([
+                        this.currentTask.research_type === 'comprehensive'
+                            ? fetch(`/api/research/${taskId}/progressive`)
+                            : null,
+                        fetch(`/api/research/${taskId}/status`)
+                    ]);
+
+                    if (progressResponse && progressResponse.ok) {
+                        const progressData = await progressResponse.json();
+                        this.setCurrentTask({...this.currentTask, ...progressData});
+
+                        // If there are partial results, add them to results display
+                        if (progressData.partial_result && progressData.partial_result.sections) {
+                            this.updateProgressiveResults(progressData);
+                        }
+                    }
+
+                    if (response.ok) {
+                        const status = await response.json();
+                        this.setCurrentTask({...this.currentTask, ...status});
+
+                        if (status.status === 'completed' || status.status === 'failed') {
+                            this.stopWatching();
+                            await this.loadResults();
+                            this.setCurrentTask(null);
+                        }
+                    }
+                } catch (error) {
+                    console.error('Error checking task status:', error);
+                }
+            }
+        },
+
+        updateProgressiveResults(progressData) {
+            this.pendingProgressiveResult = {
+                task_id: progressData.task_id,
+                query: this.currentTask.query,
+                model: this.currentTask.model,
+                research_type: 'comprehensive',
+                status: 'in-progress',
+                created_at: this.currentTask.created_at,
+                result: progressData.partial_result
+            };
+            this.addResultStats(this.pendingProgressiveResult);
+
+            // Coalesce updates into a single results write per frame
+            if (this.progressFrame) return;
+            this.progressFrame = requestAnimationFrame(() => {
+                this.progressFrame = 0;
+                const progressiveResult = this.pendingProgressiveResult;
+                this.pendingProgressiveResult = null;
+                if (!progressiveResult) return;
+
+                // Find existing progressive result or create new one
+                const existingIndex = this.results.findIndex(r => r.task_id === progressiveResult.task_id);
+                if (existingIndex >= 0) {
+                    this.results.splice(existingIndex, 1, progressiveResult);
+                } else {
+                    this.results.unshift(progressiveResult);
+                }
+            });
+        },
+
+        async loadResults() {
+            try {
+                const response = await fetch('/api/research/results');
+                if (response.ok) {
+                    // Final results supersede any queued progressive update
+                    this.pendingProgressiveResult = null;
+                    resultsCursor = response.headers.get('X-Next-Cursor');
+                    const results = await response.json();
+                    results.forEach(result => this.addResultStats(result));
+                    this.results = results;
+                }
+            } catch (error) {
+                console.error('Error loading results:', error);
+            }
+        },
+
+        async loadMoreResults() {
+            // Later pages are fetched only once the list is scrolled to its end
+            if (!resultsCursor || loadingResultsPage) return false;
+            loadingResultsPage = true;
+            try {
+                const response = await fetch(`/api/research/results?cursor=${encodeURIComponent(resultsCursor)}`);
+                if (response.ok) {
+                    resultsCursor = response.headers.get('X-Next-Cursor');
+                    const results = await response.json();
+                    results.forEach(result => this.addResultStats(result));
+                    this.results.push(...results);
+                    return true;
+                }
+            } catch (error) {
+                console.error('Error loading more results:', error);
+            } finally {
+                loadingResultsPage = false;
+            }
+            return false;
+        },
+
+        setCurrentTask(task) {
+            // Derive progress indicators once per update instead of on every render
+            this.currentTask = task;
+            this.progressStep = this.getStepNumber(task);
+            this.progressPercent = this.getProgressPercentage(task);
+        },
+
+        getProgressPercentage(task) {
+            if (!task) return 0;
+            const status = task.status;
+            const progress = task.progress || '';
+
+            if (status === 'pending') return 10;
+            if (status === 'running') {
+                if (progress.includes('Initializing')) return 25;
+                if (progress.includes('collecting') || progress.includes('Conducting') || progress.includes('Performing')) return 50;
+                if (progress.includes('Processing') || progress.includes('analysis')) return 75;
+                if (progress.includes('Finalizing')) return 90;
+                return 60;
+            }
+            if (status === 'completed') return 100;
+            return 0;
+        },
+
+        getStepNumber(task) {
+            if (!task) return 0;
+            const progress = task.progress || '';
+
+            if (progress.includes('Initializing')) return 1;
+            if (progress.includes('collecting') || progress.includes('Conducting') || progress.includes('Performing')) return 2;
+            if (progress.includes('Processing') || progress.includes('analysis')) return 3;
+            if (progress.includes('Finalizing') || task.status === 'completed') return 4;
+            return 1;
+        },
+
+        getStepClass(stepNumber) {
+            if (this.progressStep > stepNumber) return 'bg-green-500';
+            if (this.progressStep === stepNumber) return 'bg-blue-500';
+            return 'bg-gray-300';
+        },
+
+        addResultStats(result) {
+            // Computed once per result so card bindings read plain fields
+            result._citations = this.getCitationCount(result);
+            result._words = this.getWordCount(result);
+            result._completedAt = result.completed_at ? DATE_TIME_FORMAT.format(new Date(result.completed_at)) : '';
+        },
+
+        getCitationCount(result) {
+            if (result.research_type === 'comprehensive') {
+                return result.result?.total_citations || 0;
+            }
+            return result.result?.citations || 0;
+        },
+
+        getWordCount(result) {
+            if (result.research_type === 'comprehensive') {
+                return result.result?.total_words || 0;
+            }
+            return result.result?.word_count || 0;
+        },
+
+        formatMarkdown(text) {
+            return renderMarkdown(text);
+        },
+
+        formatResult(result) {
+            return resultText(result);
+        },
+
+        downloadResult(result) {
+            // Collect parts and hand them to the Blob directly instead of growing one string
+            const parts = [`# Research Report: ${result.query}\n\n`, `**Model:** ${result.model}\n`];
+
+            if (result.research_type === 'comprehensive') {
+                parts.push(
+                    `**Processing Time:** ${result.result?.processing_time_formatted}\n`,
+                    `**Total Citations:** ${result._citations}\n`,
+                    `**Total Words:** ${result._words}\n\n`,
+                    `---\n\n`
+                );
+
+                for (const [sectionName, section] of Object.entries(result.result?.sections || {})) {
+                    parts.push(
+                        `# ${sectionName.replace('_', ' ').toUpperCase()}\n\n`,
+                        section.formatted_output || section.output || '',
+                        `\n\n---\n\n`
+                    );
+                }
+            } else {
+                parts.push(
+                    `**Type:** ${result.research_type}\n`,
+                    `**Processing Time:** ${result.result?.processing_time_formatted}\n`,
+                    `**Citations:** ${result._citations}\n`,
+                    `**Words:** ${result._words}\n\n`,
+                    `---\n\n`,
+                    this.formatResult(result.result)
+                );
+            }
+
+            const blob = new Blob(parts, { type: 'text/markdown' });
+            const url = URL.createObjectURL(blob);
+            const a = document.createElement('a');
+            a.href = url;
+            a.download = `research_${result.query.substring(0, 30).replace(UNSAFE_FILENAME_RE, '_')}.md`;
+            a.click();
+            URL.revokeObjectURL(url);
+        },
+
+        async copyResult(result) {
+            const content = this.formatResult(result.result);
+            try {
+                await navigator.clipboard.writeText(content);
+                alert('Result copied to clipboard!');
+            } catch (error) {
+                console.error('Failed to copy to clipboard:', error);
+            }
+        },
+
+        openDashboard(result) {
+            // Store result data for dashboard
+            localStorage.setItem('dashboardData', JSON.stringify(result));
+            // Open React dashboard in new tab
+            window.open('http://localhost:8080', '_blank');
+        }
+    }
+}
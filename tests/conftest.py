@@ -15,6 +15,23 @@ os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 from app import app
 
 
+@pytest.fixture(autouse=True)
+def release_task_state():
+    """Drop the in-memory task entries a test created so state doesn't pile up across the suite"""
+    import app as app_module
+    
+    stores = (app_module.research_tasks, app_module.completed_results,
+              app_module.active_task_ids, app_module.running_task_ids)
+    before = [set(store) for store in stores]
+    yield
+    for key in set(app_module.completed_results) - before[1]:
+        app_module.forget_evicted_result(key, app_module.completed_results.pop(key, None))
+    for key in set(app_module.research_tasks) - before[0]:
+        app_module.research_tasks.pop(key, None)
+    app_module.active_task_ids.intersection_update(before[2])
+    app_module.running_task_ids.intersection_update(before[3])
+
+
 @pytest.fixture
 def client():
     """Create a test client for the FastAPI app"""
@@ -24,7 +41,7 @@ def client():
 @pytest.fixture
 def mock_openai_client():
     """Mock OpenAI client for testing"""
-    with patch('services.research_client.OpenAI') as mock:
+    with patch('services.research_client.AsyncOpenAI') as mock:
         mock_client = Mock()
         mock.return_value = mock_client
         yield mock_client
@@ -2,6 +2,7 @@
 Basic tests for AI Research Platform API endpoints
 """
 
+import asyncio
 import pytest
 from unittest.mock import patch, Mock
 
@@ -13,6 +14,25 @@ def test_health_endpoint(client):
     data = response.json()
     assert "status" in data
     assert data["status"] == "healthy"
+    assert set(data) == {"status", "research_client_initialized", "active_tasks",
+                         "tasks_by_status", "queued_tasks", "completed_results"}
+
+
+def test_health_active_tasks(client):
+    """Test that the active task count follows status changes"""
+    from app import research_tasks, active_task_ids, running_task_ids, update_task
+    
+    research_tasks["active-task"] = {"task_id": "active-task", "status": "pending"}
+    active_task_ids.add("active-task")
+    assert client.get("/health").json()["active_tasks"] == len(active_task_ids)
+    
+    asyncio.run(update_task("active-task", status="running"))
+    assert client.get("/health").json()["tasks_by_status"]["running"] == len(running_task_ids)
+    assert "active-task" in running_task_ids
+    
+    asyncio.run(update_task("active-task", status="completed"))
+    assert "active-task" not in active_task_ids
+    assert "active-task" not in running_task_ids
 
 
 def test_home_endpoint(client):
@@ -20,6 +40,30 @@ def test_home_endpoint(client):
     response = client.get("/")
     assert response.status_code == 200
     assert "text/html" in response.headers["content-type"]
+    
+    response = client.get("/", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+
+def test_versioned_static_assets(client):
+    """Test that hashed script URLs are cached long-term"""
+    import re
+    
+    script_url = re.search(r'src="(/static/app\.js\?v=\w+)"', client.get("/").text).group(1)
+    response = client.get(script_url)
+    assert response.status_code == 200
+    assert "immutable" in response.headers["cache-control"]
+    assert client.get("/static/app.js").headers["cache-control"] == "no-cache"
+
+
+def test_models_endpoint_etag(client):
+    """Test that the models list is served with an ETag and honours If-None-Match"""
+    response = client.get("/api/models")
+    assert response.status_code == 200
+    assert "o3-deep-research" in response.json()
+    
+    response = client.get("/api/models", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
 
 
 def test_models_endpoint(client):
@@ -48,6 +92,52 @@ def test_research_endpoint_validation(client, sample_research_request):
     
     response = client.post("/api/research", json=invalid_request)
     assert response.status_code == 422  # Validation error
+    
+    # Test with an oversized query
+    from app import MAX_QUERY_CHARS
+    oversized_request = {**sample_research_request, "query": "x" * (MAX_QUERY_CHARS + 1)}
+    response = client.post("/api/research", json=oversized_request)
+    assert response.status_code == 422
+
+
+def test_research_queue_full_returns_503(monkeypatch, sample_research_request):
+    """Test that submissions beyond the research queue bound are rejected with 503"""
+    import app as app_module
+    from fastapi.testclient import TestClient
+    
+    monkeypatch.setattr(app_module, "RESEARCH_WORKERS", 0)
+    monkeypatch.setattr(app_module, "RESEARCH_QUEUE_SIZE", 1)
+    monkeypatch.setattr(app_module, "research_queue", None)
+    
+    with TestClient(app_module.app) as client:
+        assert client.post("/api/research", json=sample_research_request).status_code == 200
+        assert client.post("/api/research", json=sample_research_request).status_code == 503
+
+
+def test_research_queue_filling_during_submit_rolls_back(monkeypatch, sample_research_request):
+    """Test that a queue that fills while a task is being saved yields a 503 and no stuck pending task"""
+    import app as app_module
+    from fastapi.testclient import TestClient
+    
+    monkeypatch.setattr(app_module, "RESEARCH_WORKERS", 0)
+    monkeypatch.setattr(app_module, "RESEARCH_QUEUE_SIZE", 1)
+    monkeypatch.setattr(app_module, "research_queue", None)
+    get_queue = app_module.get_research_queue
+    
+    def racing_queue():
+        queue = get_queue()
+        full, early_check = type(queue).full.__get__(queue), [False]
+        # Passes the early check, as if the last slot were taken right afterwards
+        queue.full = lambda: early_check.pop() if early_check else full()
+        return queue
+    
+    monkeypatch.setattr(app_module, "get_research_queue", racing_queue)
+    with TestClient(app_module.app) as client:
+        assert client.post("/api/research", json=sample_research_request).status_code == 200
+        active, tasks = set(app_module.active_task_ids), set(app_module.research_tasks)
+        assert client.post("/api/research", json=sample_research_request).status_code == 503
+        assert app_module.active_task_ids == active
+        assert set(app_module.research_tasks) == tasks
 
 
 def test_research_status_not_found(client):
@@ -62,6 +152,320 @@ def test_research_result_not_found(client):
     assert response.status_code == 404
 
 
+def test_research_status_from_database(client):
+    """Test that task status and results survive losing in-memory state"""
+    from services.storage_service import storage_service
+    
+    storage_service.save_research_task({
+        "task_id": "stored-task",
+        "query": "test",
+        "model": "o3-deep-research",
+        "research_type": "custom",
+        "status": "running",
+        "progress": "Processing custom research query..."
+    })
+    
+    response = client.get("/api/research/stored-task/status")
+    assert response.status_code == 200
+    assert response.json()["status"] == "running"
+    
+    storage_service.update_research_task("stored-task", {"status": "failed", "error_message": "boom"})
+    response = client.get("/api/research/stored-task/result")
+    assert response.status_code == 200
+    assert response.json()["error"] == "boom"
+    
+    # Read through: the encoded body is reused on the next request
+    response = client.get("/api/research/stored-task/result", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+
+def test_progress_writes_are_batched(client):
+    """Test that queued progress is written in one flush and superseded by direct updates"""
+    from services.storage_service import storage_service
+    
+    for task_id in ("batched-a", "batched-b"):
+        storage_service.save_research_task({
+            "task_id": task_id,
+            "query": "test",
+            "model": "o3-deep-research",
+            "research_type": "custom",
+            "status": "running"
+        })
+    storage_service.queue_progress("batched-a", "Step 1")
+    storage_service.queue_progress("batched-a", "Step 2")
+    storage_service.queue_progress("batched-b", "Step 1")
+    storage_service.queue_progress("batched-b", "Stale")
+    storage_service.update_research_task("batched-b", {"progress": "Done"})
+    
+    assert storage_service.flush_progress() == 1
+    assert storage_service.get_research_task("batched-a")["progress"] == "Step 2"
+    assert storage_service.get_research_task("batched-b")["progress"] == "Done"
+    assert storage_service.flush_progress() == 0
+
+def test_comprehensive_sections_run_concurrently(monkeypatch):
+    """Test that comprehensive sections overlap and never stall the event loop"""
+    import asyncio
+    import time
+    import app
+    
+    def section(duration):
+        async def research(query, model):
+            await asyncio.sleep(duration)
+            return {"status": "completed", "output": "Findings from [a study](http://example.com)."}
+        return research
+    
+    workflow = Mock(validate_idea=section(0.1), market_research=section(0.2), financial_analysis=section(0.15))
+    monkeypatch.setattr(app, "research_workflow", workflow)
+    request = app.ResearchRequest(query="Test idea", research_type="comprehensive")
+    
+    async def run():
+        # Loop lag probe: a ticker that should wake every 10ms while the sections run
+        lag = []
+        async def ticker():
+            while True:
+                before = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lag.append(time.perf_counter() - before - 0.01)
+        probe = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        result = await app.run_progressive_comprehensive_research("concurrent-task", request)
+        elapsed = time.perf_counter() - started
+        probe.cancel()
+        return result, elapsed, max(lag)
+    
+    # Best of three rounds, so a one-off GC pause or scheduler hiccup can't fail the timing checks
+    rounds = [asyncio.run(run()) for _ in range(3)]
+    result = rounds[0][0]
+    assert set(result["sections"]) == {"validation", "market", "financial"}
+    assert result["total_citations"] == 3
+    assert min(elapsed for _, elapsed, _ in rounds) < 0.2 + 0.1  # slowest section plus overhead; back to back is 0.45s
+    assert min(max_lag for _, _, max_lag in rounds) < 0.1
+
+
+def test_comprehensive_section_failures_are_reported(monkeypatch):
+    """Test that failed sections are recorded and a run with no successful section fails"""
+    import app
+    
+    async def succeed(query, model):
+        return {"status": "completed", "output": "Findings."}
+    
+    async def fail(query, model):
+        raise RuntimeError("upstream down")
+    
+    request = app.ResearchRequest(query="Test idea", research_type="comprehensive")
+    app.research_tasks["partial-task"] = {"task_id": "partial-task", "status": "running"}
+    monkeypatch.setattr(app, "research_workflow", Mock(validate_idea=succeed, market_research=fail, financial_analysis=succeed))
+    result = asyncio.run(app.run_progressive_comprehensive_research("partial-task", request))
+    assert set(result["sections"]) == {"validation", "financial"}
+    assert result["progress"]["market"] == "failed"
+    assert app.research_tasks["partial-task"]["error"] == "market analysis: upstream down"
+    
+    monkeypatch.setattr(app, "research_workflow", Mock(validate_idea=fail, market_research=fail, financial_analysis=fail))
+    with pytest.raises(RuntimeError, match="All comprehensive analyses failed"):
+        asyncio.run(app.run_progressive_comprehensive_research("failed-task", request))
+
+def test_research_status_batch(client):
+    """Test batched status lookup for several tasks, in memory and in the database"""
+    from app import research_tasks
+    from services.storage_service import storage_service
+    
+    research_tasks["batch-task"] = {
+        "task_id": "batch-task",
+        "status": "running",
+        "created_at": "2025-01-01T00:00:00",
+        "query": "test",
+        "model": "o3-deep-research",
+        "research_type": "custom",
+        "progress": "Processing custom research query..."
+    }
+    
+    storage_service.save_research_task({
+        "task_id": "stored-batch-task",
+        "query": "test",
+        "model": "o3-deep-research",
+        "research_type": "custom",
+        "status": "completed"
+    })
+    
+    response = client.post("/api/research/status/batch",
+                           json=["batch-task", "stored-batch-task", "non-existent-task-id"])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["batch-task"]["status"] == "running"
+    assert data["stored-batch-task"]["status"] == "completed"
+    assert data["non-existent-task-id"] is None
+
+
+def test_queued_results_are_adopted_on_completion(client, monkeypatch):
+    """Test that a queue worker's finished result reaches this process's result listing"""
+    import app as app_module
+    
+    state = {
+        "task_id": "queued-task",
+        "status": "completed",
+        "created_at": "2025-01-01T00:00:00",
+        "query": "test",
+        "model": "o3-deep-research",
+        "research_type": "custom"
+    }
+    result = {**state, "result": {"output": "Findings."}, "completed_at": "2025-01-01T00:05:00", "error": None}
+    monkeypatch.setattr(app_module.task_queue, "is_enabled", lambda: True)
+    monkeypatch.setattr(app_module.task_queue, "get_task_state", lambda task_id: dict(state))
+    monkeypatch.setattr(app_module.task_queue, "get_task_result", lambda task_id: dict(result))
+    
+    response = client.get("/api/research/queued-task/status")
+    assert response.json()["status"] == "completed"
+    assert app_module.completed_results["queued-task"].result["output"] == "Findings."
+    listed = client.get("/api/research/results").json()
+    assert "queued-task" in [item["task_id"] for item in listed]
+
+
+def test_research_status_long_poll(client):
+    """Test that status honours If-None-Match and returns once the task changes"""
+    from app import research_tasks, update_task
+    
+    research_tasks["poll-task"] = {
+        "task_id": "poll-task",
+        "status": "running",
+        "created_at": "2025-01-01T00:00:00",
+        "query": "test",
+        "model": "o3-deep-research",
+        "research_type": "custom",
+        "progress": "Processing custom research query..."
+    }
+    
+    response = client.get("/api/research/poll-task/status")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    
+    response = client.get("/api/research/poll-task/status?wait=0.1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    asyncio.run(update_task("poll-task", progress="Finalizing results..."))
+    response = client.get("/api/research/poll-task/status?wait=5", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["progress"] == "Finalizing results..."
+
+
+def test_research_result_etag(client):
+    """Test that completed results are served with an ETag and honour If-None-Match"""
+    from app import store_result, ResearchResult
+    
+    store_result("etag-task", ResearchResult(
+        task_id="etag-task",
+        status="completed",
+        query="test",
+        model="o3-deep-research",
+        research_type="custom",
+        result={"output": "Sample output"},
+        created_at="2025-01-01T00:00:00"
+    ))
+    
+    response = client.get("/api/research/etag-task/result")
+    assert response.status_code == 200
+    assert response.json()["result"]["output"] == "Sample output"
+    etag = response.headers["etag"]
+    
+    response = client.get("/api/research/etag-task/result", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    response = client.get("/api/research/results")
+    assert any(r["task_id"] == "etag-task" for r in response.json())
+    response = client.get("/api/research/results", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+    
+    response = client.get("/api/research/results?limit=1")
+    assert len(response.json()) == 1
+    if "x-next-cursor" in response.headers:
+        next_page = client.get(f"/api/research/results?limit=1&cursor={response.headers['x-next-cursor']}").json()
+        assert next_page[0]["task_id"] != response.json()[0]["task_id"]
+
+
+def test_result_bodies_offloaded_to_disk(client, monkeypatch, tmp_path):
+    """Test that with RESULT_STORE_DIR only a handle stays in memory and the body is served from disk"""
+    import app as app_module
+    from services.result_files import ResultFileStore
+    
+    monkeypatch.setattr(app_module, "result_files", ResultFileStore(str(tmp_path)))
+    app_module.store_result("disk-task", app_module.ResearchResult(
+        task_id="disk-task",
+        status="completed",
+        query="test",
+        model="o3-deep-research",
+        research_type="custom",
+        result={"output": "Sample output " * 100, "citations": 2},
+        created_at="2025-01-01T00:00:00"
+    ))
+    
+    stored = app_module.completed_results["disk-task"].result
+    assert "output" not in stored
+    assert stored["citations"] == 2
+    assert stored["body"]["size"] == (tmp_path / "disk-task.json").stat().st_size
+    
+    response = client.get("/api/research/disk-task/result")
+    assert response.status_code == 200
+    assert response.json()["result"]["output"].startswith("Sample output")
+    
+    monkeypatch.setattr(app_module, "RESULT_ACCEL_PREFIX", "/internal/results/")
+    response = client.get("/api/research/disk-task/result")
+    assert response.headers["x-accel-redirect"] == "/internal/results/disk-task.json"
+    assert response.content == b""
+    
+    client.delete("/api/research/disk-task")
+    assert not (tmp_path / "disk-task.json").exists()
+
+
+def test_evicted_result_body_takes_its_file_along(client, monkeypatch, tmp_path):
+    """Test that a body aged out of result_bodies deletes its file and the slimmed result pointing at it"""
+    import app as app_module
+    from services.result_files import ResultFileStore
+    
+    monkeypatch.setattr(app_module, "result_files", ResultFileStore(str(tmp_path)))
+    asyncio.run(app_module.save_result("evicted-body-task", app_module.ResearchResult(
+        task_id="evicted-body-task",
+        status="completed",
+        query="test",
+        model="o3-deep-research",
+        research_type="custom",
+        result={"output": "Sample output " * 100},
+        created_at="2025-01-01T00:00:00"
+    )))
+    assert (tmp_path / "evicted-body-task.json").exists()
+    
+    app_module.forget_evicted_body("evicted-body-task", app_module.result_bodies.pop("evicted-body-task"))
+    assert not (tmp_path / "evicted-body-task.json").exists()
+    assert "evicted-body-task" not in app_module.completed_results
+
+
+def test_research_stream(client):
+    """Test SSE progress stream for a finished task"""
+    from app import research_tasks, completed_results, ResearchResult
+    
+    response = client.get("/api/research/non-existent-task-id/stream")
+    assert response.status_code == 404
+    
+    research_tasks["stream-task"] = {
+        "task_id": "stream-task",
+        "status": "completed",
+        "progress": "Research completed successfully in 0m 1s",
+        "research_type": "custom"
+    }
+    completed_results["stream-task"] = ResearchResult(
+        task_id="stream-task",
+        status="completed",
+        query="test",
+        model="o3-deep-research",
+        research_type="custom",
+        created_at="2025-01-01T00:00:00"
+    )
+    
+    response = client.get("/api/research/stream-task/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "event: progress" in response.text
+    assert "event: done" in response.text
+
+
 def test_dashboard_endpoints(client):
     """Test dashboard endpoints"""
     response = client.get("/api/dashboard/overview")
@@ -71,6 +475,51 @@ def test_dashboard_endpoints(client):
     assert response.status_code == 200
     data = response.json()
     assert "ideas" in data
+    etag = response.headers["etag"]
+    assert client.get("/api/dashboard/ideas", headers={"If-None-Match": etag}).status_code == 304
+    
+    from app import bump_ideas_version
+    bump_ideas_version()
+    assert client.get("/api/dashboard/ideas", headers={"If-None-Match": etag}).status_code == 200
+    
+    response = client.get("/dashboard")
+    assert response.status_code == 200
+    response = client.get("/dashboard", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+
+def test_dashboard_aggregates_follow_results(client):
+    """Test that dashboard totals are kept up to date as results are stored and deleted"""
+    from app import store_result, load_aggregates, ResearchResult
+    
+    before = load_aggregates()
+    before = (before.total_ideas, before.successful, before.failed, before.citations_sum)
+    
+    def result(status, citations):
+        return ResearchResult(
+            task_id="aggregate-task",
+            status=status,
+            query="test",
+            model="o3-deep-research",
+            research_type="custom",
+            result={"output": "Sample output", "citations": citations},
+            created_at="2025-01-01T00:00:00"
+        )
+    
+    month_before = load_aggregates().month_counts["2025-01"]
+    store_result("aggregate-task", result("failed", 0))
+    after = load_aggregates()
+    assert (after.total_ideas, after.failed) == (before[0] + 1, before[2] + 1)
+    assert after.month_counts["2025-01"] == month_before + 1
+    
+    store_result("aggregate-task", result("completed", 3))
+    after = load_aggregates()
+    assert (after.total_ideas, after.successful, after.failed, after.citations_sum) == (before[0] + 1, before[1] + 1, before[2], before[3] + 3)
+    
+    client.delete("/api/research/aggregate-task")
+    after = load_aggregates()
+    assert (after.total_ideas, after.successful, after.failed, after.citations_sum) == before
+    assert after.month_counts["2025-01"] == month_before
 
 
 class TestResearchTypes:
@@ -94,6 +543,11 @@ class TestResearchTypes:
                 # Should not return validation error for research_type
                 assert response.status_code != 422 or "research_type" not in response.text
 
+    def test_unknown_research_type_rejected(self, client):
+        """Test that unknown research types are rejected before a task is created"""
+        response = client.post("/api/research", json={"query": "Test query", "research_type": "astrology"})
+        assert response.status_code == 422
+
 
 class TestUtilityFunctions:
     """Test utility functions"""
@@ -127,3 +581,49 @@ class TestUtilityFunctions:
         assert "citations" in formatted
         assert "word_count" in formatted
         assert formatted["citations"] == 1
+    
+    def test_format_large_output_in_process_pool(self):
+        """Test that large outputs formatted in worker processes match inline formatting"""
+        import asyncio
+        import app
+        
+        sample_result = {"output": "Findings from [a study](http://example.com). " * 1000}
+        assert len(sample_result["output"]) >= app.FORMAT_OFFLOAD_MIN_CHARS
+        
+        try:
+            formatted = asyncio.run(app.format_research_output_async(sample_result, "custom"))
+            assert app._cpu_pool is not None
+        finally:
+            app.shutdown_cpu_pool()
+        assert formatted == app.format_research_output(sample_result, "custom")
+        assert formatted["citations"] == 1000
+    
+    def test_score_output(self):
+        """Test that dashboard scores reflect signal phrases regardless of case"""
+        from app import score_output
+        
+        scores = score_output({"output": "A clear Market Opportunity exists."})
+        assert scores == {"market_opportunity": 80, "technical_feasibility": 70}
+        assert score_output(None) == {"market_opportunity": 75, "technical_feasibility": 70}
+    
+    def test_render_markdown_escapes_raw_html(self):
+        """Test that raw HTML and script URLs in model output are never rendered as markup"""
+        pytest.importorskip("markdown")
+        pytest.importorskip("bleach")
+        from app import render_markdown
+        
+        html = render_markdown("**bold** <script>alert(1)</script> <img src=x onerror=alert(1)>")
+        assert "<strong>bold</strong>" in html
+        assert "<script>" not in html
+        assert "<img" not in html
+        
+        html = render_markdown("[x](javascript:alert(1)) [y](https://example.com)")
+        assert "javascript:" not in html
+        assert '<a href="https://example.com">y</a>' in html
+    
+    def test_render_markdown_needs_sanitizer(self, monkeypatch):
+        """Test that nothing is rendered server-side when bleach is unavailable"""
+        from services import research_formatting
+        
+        monkeypatch.setattr(research_formatting, "bleach", None)
+        assert research_formatting.render_markdown("[x](javascript:alert(1))") is None
@@ -0,0 +1,47 @@
+"""
+Tests for the research document manager
+"""
+
+from services.document_manager import ResearchDocumentManager
+
+
+def test_document_index_follows_writes(tmp_path):
+    """Test that document lookups are served from the index and see other managers' documents"""
+    docs = ResearchDocumentManager(str(tmp_path))
+    path = docs.save_research_document(
+        task_id="doc-a", idea_name="Idea A", research_type="custom",
+        research_data={"result": "Findings"}, model_used="o3-deep-research"
+    )
+    assert docs.get_document_path("doc-a") == path
+    assert len(docs.list_documents()) == 1
+
+    # A second manager (e.g. another worker) writing to the same folder triggers a rescan
+    cached = docs._document_index()["doc-a"]
+    ResearchDocumentManager(str(tmp_path)).save_research_document(
+        task_id="doc-b", idea_name="Idea B", research_type="market",
+        research_data={}, model_used="o3-deep-research"
+    )
+    assert len(docs.list_documents()) == 2
+    # Unchanged files are not parsed again by the rescan
+    assert docs._document_index()["doc-a"] is cached
+    assert [doc["task_id"] for doc in docs.list_documents("market")] == ["doc-b"]
+
+    # Archiving rewrites an existing metadata file; the other manager must still notice
+    other = ResearchDocumentManager(str(tmp_path))
+    assert "archives" not in other.get_document_path("doc-a")
+    assert docs.archive_document("doc-a")
+    assert "archives" in docs.get_document_path("doc-a")
+    assert "archives" in other.get_document_path("doc-a")
+
+
+def test_archive_documents_in_bulk(tmp_path):
+    """Test that several documents are archived in one call and unknown IDs are skipped"""
+    docs = ResearchDocumentManager(str(tmp_path))
+    for task_id in ("bulk-a", "bulk-b"):
+        docs.save_research_document(
+            task_id=task_id, idea_name=task_id, research_type="custom",
+            research_data={}, model_used="o3-deep-research"
+        )
+    
+    assert docs.archive_documents(["bulk-a", "missing", "bulk-b"]) == ["bulk-a", "bulk-b"]
+    assert all(doc["archived"] for doc in docs.list_documents())
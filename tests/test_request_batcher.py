@@ -0,0 +1,56 @@
+"""
+Tests for micro-batching of upstream calls
+"""
+
+import asyncio
+
+from services.request_batcher import MicroBatcher
+
+
+def test_submissions_within_window_share_one_call():
+    """Test that concurrent submissions are handled in a single batch, in order"""
+    calls = []
+
+    async def handler(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch=3, max_wait=0.05)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+
+    assert asyncio.run(main()) == [0, 2, 4, 6]
+    assert calls == [[0, 1, 2], [3]]
+    assert batcher.batches == 1
+
+
+def test_handler_errors_reach_every_submitter():
+    """Test that a failed batch fails each waiting submission"""
+    async def handler(items):
+        raise RuntimeError("upstream down")
+
+    batcher = MicroBatcher(handler, max_wait=0.01)
+
+    async def main():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_short_handler_results_fail_the_rest():
+    """Test that submissions without a matching result fail instead of waiting forever"""
+    async def handler(items):
+        return [item * 2 for item in items[:1]]
+
+    batcher = MicroBatcher(handler, max_wait=0.01)
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True), 1
+        )
+
+    first, second = asyncio.run(main())
+    assert first == 2
+    assert isinstance(second, RuntimeError)
@@ -0,0 +1,94 @@
+"""
+Tests for the research response cache
+"""
+
+import asyncio
+
+from services.research_cache import ResearchCache, SingleFlight, is_time_sensitive
+
+
+def test_exact_hit_ignores_case_and_whitespace():
+    """Test that normalized queries share an exact cache key"""
+    cache = ResearchCache()
+    key = cache.make_key("o3-deep-research", "general", "Validate idea X")
+    cache.set(key, {"output": "cached"}, "o3-deep-research", "general")
+
+    same_key = cache.make_key("o3-deep-research", "general", "  validate   IDEA x ")
+    assert cache.get(same_key) == {"output": "cached"}
+    assert cache.get(cache.make_key("o4-mini-deep-research", "general", "Validate idea X")) is None
+
+
+def test_semantic_hit_respects_threshold():
+    """Test that only sufficiently similar embeddings are served"""
+    cache = ResearchCache()
+    key = cache.make_key("o3-deep-research", "general", "AI fitness app")
+    cache.set(key, {"output": "cached"}, "o3-deep-research", "general", [1.0, 0.0])
+
+    assert cache.find_similar([0.99, 0.05], "o3-deep-research", "general") == {"output": "cached"}
+    assert cache.find_similar([0.5, 0.5], "o3-deep-research", "general") is None
+    assert cache.find_similar([1.0, 0.0], "o3-deep-research", "market") is None
+
+
+def test_semantic_tier_is_capped():
+    """Test that only the most recent entries keep embeddings while older ones still hit exactly"""
+    cache = ResearchCache(max_semantic_entries=1)
+    first = cache.make_key("m", "general", "AI fitness app")
+    second = cache.make_key("m", "general", "AI cooking app")
+    cache.set(first, {"output": "fitness"}, "m", "general", [1.0, 0.0])
+    cache.set(second, {"output": "cooking"}, "m", "general", [0.0, 1.0])
+
+    assert cache.find_similar([1.0, 0.0], "m", "general") is None
+    assert cache.find_similar([0.0, 1.0], "m", "general") == {"output": "cooking"}
+    assert cache.get(first) == {"output": "fitness"}
+
+
+def test_async_wrappers_match_sync_results():
+    """Test that the thread-offloaded lookups return the same responses"""
+    cache = ResearchCache()
+    key = cache.make_key("m", "general", "AI fitness app")
+
+    async def main():
+        await cache.aset(key, {"output": "cached"}, "m", "general", [1.0, 0.0])
+        return await cache.aget(key), await cache.afind_similar([1.0, 0.0], "m", "general")
+
+    assert asyncio.run(main()) == ({"output": "cached"}, {"output": "cached"})
+
+
+def test_lru_and_ttl_bounds():
+    """Test that the cache evicts least recently used and expired entries"""
+    cache = ResearchCache(max_entries=2)
+    keys = [cache.make_key("m", "general", f"query {i}") for i in range(3)]
+    for key in keys:
+        cache.set(key, {"output": key}, "m", "general")
+    assert len(cache) == 2
+    assert cache.get(keys[0]) is None
+
+    expired = ResearchCache(ttl_seconds=-1)
+    expired.set(keys[0], {"output": "stale"}, "m", "general")
+    assert expired.get(keys[0]) is None
+
+
+def test_time_sensitive_queries_bypass_cache():
+    """Test detection of queries about the present"""
+    assert is_time_sensitive("What are the latest AI trends?")
+    assert is_time_sensitive("Current state of the EV market")
+    assert not is_time_sensitive("Validate an AI-powered fitness app")
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent calls for one key share a single execution"""
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"output": "shared"}
+
+    async def main():
+        return await asyncio.gather(*(flight.run("key", compute) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert results == [{"output": "shared"}] * 3
+    assert len(calls) == 1
+    assert flight.hits == 2
@@ -0,0 +1,29 @@
+"""
+Tests for the completion-ordered result index
+"""
+
+from services.result_index import ResultIndex
+
+
+def test_pages_follow_completion_order():
+    """Test that cursors walk results in completion order without repeats"""
+    index = ResultIndex()
+    for task_id in ["a", "b", "c"]:
+        index.add(task_id)
+
+    first, cursor = index.page(0, 2)
+    assert first == ["a", "b"]
+    rest, end = index.page(cursor, 2)
+    assert rest == ["c"]
+    assert end is None
+
+
+def test_removed_and_re_added_results():
+    """Test that discarded ids disappear and re-added ids move to the end"""
+    index = ResultIndex()
+    for task_id in ["a", "b", "c"]:
+        index.add(task_id)
+    index.discard("b")
+    index.add("a")
+
+    assert index.page(0, 10) == (["c", "a"], None)
@@ -0,0 +1,84 @@
+"""
+Tests for the bounded in-memory task store
+"""
+
+import threading
+
+from services.task_store import TaskStore
+
+
+def test_evicts_least_recently_used():
+    """Test that the store stays within maxsize, evicting the LRU entry"""
+    store = TaskStore(maxsize=2)
+    store["a"] = 1
+    store["b"] = 2
+    assert store["a"] == 1  # touch "a" so "b" is least recently used
+    store["c"] = 3
+
+    assert "b" not in store
+    assert sorted(store) == ["a", "c"]
+
+
+def test_expires_entries_after_ttl():
+    """Test that entries older than the TTL are dropped"""
+    now = [0.0]
+    store = TaskStore(ttl=10, timer=lambda: now[0])
+    store["task"] = {"status": "running"}
+    assert store.get("task") == {"status": "running"}
+
+    now[0] = 11.0
+    assert store.get("task") is None
+    assert len(store) == 0
+    assert store.values() == []
+
+
+def test_on_evict_receives_dropped_entries():
+    """Test that evicted entries are counted and passed to on_evict"""
+    evicted = []
+    store = TaskStore(maxsize=1, on_evict=lambda key, value: evicted.append((key, value)))
+    store["a"] = 1
+    store["b"] = 2
+
+    assert evicted == [("a", 1)]
+    assert store.evictions == 1
+
+
+def test_concurrent_access_from_threads():
+    """Test that lookups, writes and pops from several threads neither raise nor exceed maxsize"""
+    store = TaskStore(maxsize=8)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(2000):
+                key = (i + offset) % 16
+                store[key] = i
+                store.get(key)
+                store.pop((key + 1) % 16, None)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(store) <= 8
+
+
+def test_ttl_sweeps_are_throttled():
+    """Test that len() sweeps expired entries at most once per expire_interval while lookups stay exact"""
+    now = [0.0]
+    store = TaskStore(ttl=0.5, timer=lambda: now[0])
+    store["task"] = 1
+    assert len(store) == 1
+
+    now[0] = 0.6
+    assert len(store) == 1  # swept at 0.0, next sweep not due yet
+    assert store.get("task") is None
+
+    store["other"] = 2
+    now[0] = 1.2
+    assert len(store) == 0